@@ -0,0 +1,275 @@
+"""
+프롬프트에 넣을 데이터 컨텍스트를 토큰 예산에 맞춰 구성하는 모듈입니다.
+시장 데이터는 자산별 요약(최근 봉, 일봉 OHLC, 수익률, 변동성)으로 압축하고,
+뉴스는 중복 제거 후 관련도/최신순으로 정렬하여 예산 안에서 우선순위대로 채웁니다.
+"""
+import os
+import re
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+# 프롬프트 데이터 영역 전체의 토큰 예산 (템플릿 자체는 제외)
+DEFAULT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "4000"))
+
+# 섹션별 기본 예산 비율 (사용하지 않은 예산은 다른 섹션으로 재분배)
+SECTION_WEIGHTS = {"market_data": 0.5, "news_data": 0.35, "youtube_data": 0.15}
+
+# 시장 요약에 포함할 수익률 구간
+RETURN_HORIZONS = {"1h": pd.Timedelta(hours=1), "24h": pd.Timedelta(days=1), "7d": pd.Timedelta(days=7)}
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수를 대략적으로 추정합니다. (영문/숫자 기준 약 4자당 1토큰)
+    """
+    return (len(text) + 3) // 4
+
+def asset_frame(asset_data) -> pd.DataFrame:
+    """
+    레코드 리스트 또는 컬럼형({"t", "o", ...}) 자산 데이터를 UTC 시간 인덱스 DataFrame으로 변환합니다.
+    """
+    if not asset_data:
+        return pd.DataFrame()
+    if isinstance(asset_data, dict):
+        if not asset_data.get("t"):
+            return pd.DataFrame()
+        df = pd.DataFrame({
+            "Open": asset_data.get("o"), "High": asset_data.get("h"), "Low": asset_data.get("l"),
+            "Close": asset_data.get("c"), "Volume": asset_data.get("v"),
+        })
+        df.index = pd.to_datetime(asset_data["t"], unit="s", utc=True)
+    else:
+        df = pd.DataFrame(asset_data)
+        date_col = "Datetime" if "Datetime" in df.columns else "Date"
+        if date_col not in df.columns:
+            return pd.DataFrame()
+        df.index = pd.to_datetime(df.pop(date_col), utc=True, format="mixed")
+    df = df.apply(pd.to_numeric, errors="coerce")
+    return df.dropna(subset=["Close"]).sort_index()
+
+def _daily_ohlc(df: pd.DataFrame) -> pd.DataFrame:
+    return df.resample("1D").agg(
+        {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    ).dropna(subset=["Close"])
+
+def _fmt_price(value) -> str:
+    if value is None or pd.isna(value):
+        return "-"
+    return f"{value:,.2f}" if abs(value) >= 1 else f"{value:.4f}"
+
+def _fmt_pct(value) -> str:
+    return "-" if value is None or pd.isna(value) else f"{value * 100:+.2f}%"
+
+def _asset_summary(name: str, df: pd.DataFrame, daily: pd.DataFrame) -> str:
+    close = df["Close"]
+    last_ts = close.index[-1]
+    returns = []
+    for label, horizon in RETURN_HORIZONS.items():
+        base = close.asof(last_ts - horizon)
+        ret = close.iloc[-1] / base - 1 if base and not pd.isna(base) else None
+        returns.append(f"{label} {_fmt_pct(ret)}")
+
+    daily_returns = np.log(daily["Close"]).diff().dropna()
+    vol = daily_returns.std() if len(daily_returns) >= 3 else None
+    return (
+        f"[{name}] last {_fmt_price(close.iloc[-1])} ({last_ts:%Y-%m-%d %H:%M}Z) | "
+        + " | ".join(returns)
+        + f" | range {_fmt_price(df['Low'].min())}~{_fmt_price(df['High'].max())}"
+        + f" | daily vol {_fmt_pct(vol).lstrip('+')}"
+        + f" | bars {len(df)}"
+    )
+
+def _bar_lines(df: pd.DataFrame, time_format: str) -> list:
+    return [
+        f"{ts:{time_format}} O {_fmt_price(row.Open)} H {_fmt_price(row.High)} "
+        f"L {_fmt_price(row.Low)} C {_fmt_price(row.Close)}"
+        for ts, row in zip(df.index, df.itertuples(index=False))
+    ]
+
+def market_blocks(market_data: dict, latest_bars: int = 12, daily_bars: int = 10) -> list:
+    """
+    시장 데이터를 우선순위 순서의 텍스트 블록 목록으로 만듭니다.
+    1) 전 자산 요약 2) 자산별 일봉 OHLC 3) 자산별 최근 봉 (예산이 모자라면 뒤쪽부터 제외)
+    """
+    frames = {name: asset_frame(data) for name, data in (market_data or {}).items()}
+    frames = {name: df for name, df in frames.items() if not df.empty}
+    if not frames:
+        return ["Market data: unavailable"]
+
+    dailies = {name: _daily_ohlc(df) for name, df in frames.items()}
+    blocks = ["Market summary (UTC):\n" + "\n".join(
+        _asset_summary(name, df, dailies[name]) for name, df in frames.items()
+    )]
+    for name, daily in dailies.items():
+        if len(daily) > 1:
+            blocks.append(f"{name} daily OHLC:\n" + "\n".join(_bar_lines(daily.tail(daily_bars), "%Y-%m-%d")))
+    for name, df in frames.items():
+        blocks.append(f"{name} latest bars:\n" + "\n".join(_bar_lines(df.tail(latest_bars), "%m-%d %H:%M")))
+    return blocks
+
+def indicator_block(indicators: dict) -> str:
+    """
+    기술적 지표(indicators_to_json 결과)의 자산별 최신 값과 자산 간 상관계수를 한 블록으로 요약합니다.
+    """
+    if not indicators or not indicators.get("assets"):
+        return ""
+    params = indicators.get("params", {})
+    sma_fast, sma_slow = (params.get("sma_windows") or [20, 50])[:2]
+    ema_fast, ema_slow = (params.get("ema_spans") or [12, 26])[:2]
+    lines = ["Technical indicators (latest):"]
+    for name, v in indicators["assets"].items():
+        width = (v.get("bb_upper") or 0) - (v.get("bb_lower") or 0)
+        percent_b = (v["close"] - v["bb_lower"]) / width if width and v.get("close") is not None else None
+        ema_gap = v[f"ema_{ema_fast}"] - v[f"ema_{ema_slow}"] if v.get(f"ema_{ema_fast}") is not None and v.get(f"ema_{ema_slow}") is not None else None
+        lines.append(
+            f"[{name}] RSI{params.get('rsi_period', 14)} {_fmt_price(v.get('rsi'))}"
+            f" | SMA{sma_fast} {_fmt_price(v.get(f'sma_{sma_fast}'))} / SMA{sma_slow} {_fmt_price(v.get(f'sma_{sma_slow}'))}"
+            f" | EMA{ema_fast}-{ema_slow} {_fmt_price(ema_gap)}"
+            f" | BB {_fmt_price(v.get('bb_lower'))}~{_fmt_price(v.get('bb_upper'))} (%B {_fmt_price(percent_b)})"
+            f" | ATR{params.get('atr_period', 14)} {_fmt_price(v.get('atr'))}"
+        )
+    correlations = {pair: value for pair, value in (indicators.get("correlations") or {}).items() if value is not None}
+    if correlations:
+        lines.append(
+            f"Return correlation ({params.get('corr_window', 24)} bars): "
+            + ", ".join(f"{pair} {value:+.2f}" for pair, value in correlations.items())
+        )
+    return "\n".join(lines)
+
+def _domain(url: str) -> str:
+    netloc = urlparse(url or "").netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+def _normalize_url(url: str) -> str:
+    return f"{_domain(url)}{urlparse(url or '').path.rstrip('/')}"
+
+def _normalize_title(title: str) -> str:
+    return re.sub(r"[^0-9a-z가-힣]+", " ", (title or "").lower()).strip()
+
+def rank_news(news_data: list, max_items: int = 15) -> list:
+    """
+    뉴스 기사를 URL/제목 기준으로 중복 제거하고 관련도 점수, 최신순으로 정렬합니다.
+    """
+    seen = set()
+    unique = []
+    for article in news_data or []:
+        if not isinstance(article, dict):
+            continue
+        keys = {k for k in (_normalize_url(article.get("url", "")), _normalize_title(article.get("title", ""))) if k}
+        if not keys or keys & seen:
+            continue
+        seen |= keys
+        unique.append(article)
+
+    def sort_key(article):
+        published = pd.to_datetime(article.get("published_date"), utc=True, errors="coerce")
+        return (article.get("score") or 0, published.timestamp() if not pd.isna(published) else 0)
+
+    return sorted(unique, key=sort_key, reverse=True)[:max_items]
+
+def news_blocks(news_data: list, snippet_chars: int = 300) -> list:
+    """
+    뉴스 기사를 기사당 한 블록(제목, 출처, 날짜, 요약)으로 만듭니다.
+    """
+    blocks = []
+    for article in rank_news(news_data):
+        source = _domain(article.get("url", ""))
+        snippet = " ".join((article.get("content") or "").split())[:snippet_chars]
+        line = f"- {article.get('title', '')} ({source}, {article.get('published_date', '')})"
+        blocks.append(f"{line}\n  {snippet}" if snippet else line)
+    if blocks:
+        blocks[0] = "News:\n" + blocks[0]
+    return blocks or ["News: unavailable"]
+
+def youtube_blocks(youtube_data, chunk_chars: int = 800) -> list:
+    """
+    유튜브 스크립트(문자열, 문자열 리스트 또는 {"video_id", "url", "text"} 리스트)를 일정 길이의 블록으로 나눕니다.
+    영상마다 앞부분 블록부터 번갈아 배치하여, 예산이 모자라도 여러 영상의 내용이 고르게 포함되도록 합니다.
+    """
+    items = youtube_data if isinstance(youtube_data, (list, tuple)) else [youtube_data]
+    per_video = []
+    for item in items:
+        if isinstance(item, dict):
+            text = " ".join(str(item.get("text") or "").split())
+            label = f"[{item['video_id']}] " if item.get("video_id") and text else ""
+        else:
+            text, label = " ".join(str(item or "").split()), ""
+        chunks = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)]
+        if chunks:
+            chunks[0] = label + chunks[0]
+            per_video.append(chunks)
+    blocks = [chunks[i] for i in range(max(map(len, per_video), default=0)) for chunks in per_video if i < len(chunks)]
+    if blocks:
+        blocks[0] = "YouTube:\n" + blocks[0]
+    return blocks
+
+def fit_blocks(blocks: list, budget: int) -> str:
+    """
+    우선순위 순서대로 예산 안에 들어가는 블록만 이어 붙입니다.
+    """
+    selected = []
+    used = 0
+    for block in blocks:
+        cost = estimate_tokens(block) + 1
+        if used + cost > budget:
+            continue
+        selected.append(block)
+        used += cost
+    return "\n".join(selected)
+
+def _allocate(needs: dict, budget: int) -> dict:
+    """
+    섹션별 필요 토큰과 기본 비율로 예산을 배분합니다.
+    필요량이 비율보다 적은 섹션의 남는 예산은 나머지 섹션에 비율대로 재분배합니다.
+    """
+    allocation = {}
+    remaining = dict(needs)
+    left = budget
+    while remaining:
+        weight_sum = sum(SECTION_WEIGHTS[name] for name in remaining)
+        satisfied = {
+            name: need for name, need in remaining.items()
+            if need <= left * SECTION_WEIGHTS[name] / weight_sum
+        }
+        if not satisfied:
+            for name in remaining:
+                allocation[name] = int(left * SECTION_WEIGHTS[name] / weight_sum)
+            break
+        for name, need in satisfied.items():
+            allocation[name] = need
+            left -= need
+            del remaining[name]
+    return allocation
+
+def select_assets(market_data: dict, indicators: dict, names: list):
+    """
+    시장 데이터와 지표에서 names에 있는 자산만 남깁니다. (names 순서 유지, None이면 그대로 반환)
+    """
+    if names is None:
+        return market_data, indicators
+    market_data = {name: market_data[name] for name in names if name in (market_data or {})}
+    if indicators and indicators.get("assets"):
+        indicators = {**indicators, "assets": {name: indicators["assets"][name] for name in names if name in indicators["assets"]}}
+    return market_data, indicators
+
+def build_prompt_context(market_data, news_data, youtube_data, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                         indicators: dict = None, assets: list = None) -> dict:
+    """
+    프롬프트 템플릿의 {market_data}, {news_data}, {youtube_data} 자리에 들어갈 문자열을 토큰 예산에 맞춰 생성합니다.
+    indicators가 주어지면 시장 요약 바로 다음 우선순위로 기술적 지표 요약을 포함합니다.
+    assets가 주어지면 해당 자산(핵심 자산)만 프롬프트에 포함합니다.
+    """
+    market_data, indicators = select_assets(market_data, indicators, assets)
+    blocks = market_blocks(market_data)
+    indicator_text = indicator_block(indicators)
+    if indicator_text:
+        blocks.insert(1, indicator_text)
+    sections = {
+        "market_data": blocks,
+        "news_data": news_blocks(news_data),
+        "youtube_data": youtube_blocks(youtube_data),
+    }
+    needs = {name: sum(estimate_tokens(b) + 1 for b in blocks) for name, blocks in sections.items()}
+    allocation = _allocate(needs, token_budget)
+    return {name: fit_blocks(blocks, allocation[name]) for name, blocks in sections.items()}
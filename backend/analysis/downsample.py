@@ -0,0 +1,145 @@
+"""
+차트용 OHLCV 데이터를 시간 단위로 집계하고 최대 포인트 수에 맞춰 줄이는 모듈입니다.
+- 시간 단위 집계: pandas resample로 1h/4h/1d/1w 봉을 한 번에 계산 (시가 first, 고가 max, 저가 min, 종가 last, 거래량 sum)
+- 포인트 수 축소 (NumPy 벡터 연산):
+  - ohlc: 인접한 봉을 구간별로 하나의 봉으로 합침 (모든 고가/저가와 거래량이 보존되어 캔들 차트에 적합, 기본값)
+  - minmax: 구간마다 고가가 가장 높은 봉과 저가가 가장 낮은 봉을 그대로 남김
+  - lttb: 종가 기준 Largest-Triangle-Three-Buckets (선 차트 모양 보존)
+기간이 길어져도 응답 크기가 max_points로 고정됩니다.
+"""
+import numpy as np
+import pandas as pd
+
+# timeframe -> pandas resample 규칙 (주봉은 월요일 시작)
+TIMEFRAMES = {"1h": "1h", "4h": "4h", "1d": "1D", "1w": "W-MON"}
+DOWNSAMPLE_METHODS = ("ohlc", "minmax", "lttb")
+
+# 축소 결과의 최소 포인트 수 (lttb는 처음/끝 점을 포함해 3개 이상 필요)
+MIN_POINTS = 3
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    OHLCV 프레임을 timeframe 단위 봉으로 집계합니다. 거래가 없는 구간(종가 없음)은 제외합니다.
+    """
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Invalid timeframe: {timeframe} (expected one of {', '.join(TIMEFRAMES)})")
+    if df.empty:
+        return df
+    aggregations = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    resampled = df.resample(TIMEFRAMES[timeframe], closed="left", label="left").agg(
+        {col: how for col, how in aggregations.items() if col in df.columns}
+    )
+    return resampled.dropna(subset=["Close"])
+
+def _bucket_starts(length: int, buckets: int) -> np.ndarray:
+    return np.unique(np.linspace(0, length, buckets + 1).astype(np.int64)[:-1])
+
+def _column(df: pd.DataFrame, col: str, fallback: str = "Close") -> np.ndarray:
+    return df[col if col in df.columns else fallback].to_numpy(dtype="float64", na_value=np.nan)
+
+def ohlc_buckets(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """
+    봉을 max_points개 구간으로 나누고 구간마다 하나의 봉으로 합칩니다. (구간 첫 봉의 시각 사용)
+    """
+    starts = _bucket_starts(len(df), max_points)
+    ends = np.append(starts[1:], len(df)) - 1
+    data = {
+        "Open": _column(df, "Open")[starts],
+        "High": np.fmax.reduceat(_column(df, "High"), starts),
+        "Low": np.fmin.reduceat(_column(df, "Low"), starts),
+        "Close": _column(df, "Close")[ends],
+    }
+    if "Volume" in df.columns:
+        data["Volume"] = np.add.reduceat(np.nan_to_num(_column(df, "Volume")), starts)
+    return pd.DataFrame(data, index=df.index[starts])
+
+def minmax_indices(high: np.ndarray, low: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    구간마다 고가 최댓값과 저가 최솟값의 위치를 골라 정렬된 인덱스로 반환합니다. (처음/마지막 봉 포함)
+    max_points가 4보다 작으면 구간 하나에 두 점을 넣을 수 없으므로 고가 최댓값만 남겨 max_points를 넘지 않게 합니다.
+    """
+    length = len(high)
+    buckets = max(1, (max_points - 2) // 2)
+    size = -(-length // buckets)
+    padded = buckets * size - length
+    highs = np.append(np.nan_to_num(high, nan=-np.inf), np.full(padded, -np.inf)).reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    parts = [[0, length - 1], offsets + highs.argmax(axis=1)]
+    if 2 + 2 * buckets <= max_points:
+        lows = np.append(np.nan_to_num(low, nan=np.inf), np.full(padded, np.inf)).reshape(buckets, size)
+        parts.append(offsets + lows.argmin(axis=1))
+    indices = np.concatenate(parts)
+    return np.unique(indices[indices < length])
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets로 고를 점의 인덱스를 반환합니다.
+    구간마다 직전에 고른 점과 다음 구간의 평균점이 이루는 삼각형 넓이가 가장 큰 점을 고릅니다.
+    """
+    length = len(x)
+    if max_points >= length:
+        return np.arange(length)
+    # 처음/마지막 점을 제외한 나머지를 max_points - 2개 구간으로 나눔
+    edges = np.linspace(1, length - 1, max_points - 1).astype(np.int64)
+    # 다음 구간의 평균점 (마지막 구간은 마지막 점)
+    sums_x = np.add.reduceat(x[1:length - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:length - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])[1:]
+    avg_y = np.append(sums_y / counts, y[-1])[1:]
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, length - 1
+    prev = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[prev] - avg_x[i]) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y[i] - y[prev])
+        )
+        prev = start + int(np.nanargmax(area)) if not np.isnan(area).all() else start
+        selected[i + 1] = prev
+    return selected
+
+def downsample_ohlcv(df: pd.DataFrame, max_points: int, method: str = "ohlc") -> pd.DataFrame:
+    """
+    봉 수가 max_points를 넘으면 method 방식으로 줄입니다. 넘지 않으면 그대로 반환합니다.
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Invalid downsample method: {method} (expected one of {', '.join(DOWNSAMPLE_METHODS)})")
+    max_points = max(MIN_POINTS, int(max_points))
+    if len(df) <= max_points:
+        return df
+    if method == "ohlc":
+        return ohlc_buckets(df, max_points)
+    if method == "minmax":
+        indices = minmax_indices(_column(df, "High"), _column(df, "Low"), max_points)
+    else:
+        x = df.index.asi8.astype("float64")
+        y = pd.Series(_column(df, "Close")).ffill().bfill().to_numpy()
+        indices = lttb_indices(x, y, max_points)
+    return df.iloc[indices]
+
+def aggregate_ohlcv(df: pd.DataFrame, timeframe: str = None, max_points: int = None, method: str = "ohlc") -> pd.DataFrame:
+    """
+    timeframe 집계 후 max_points 축소를 차례로 적용합니다. (둘 다 생략 가능)
+    """
+    if timeframe:
+        df = resample_ohlcv(df, timeframe)
+    if max_points:
+        df = downsample_ohlcv(df, max_points, method)
+    return df
+
+def parse_tiers(spec: str) -> list:
+    """
+    "4h:500,1d:500" 형식의 집계 단계 설정을 [(timeframe, max_points), ...]로 변환합니다.
+    """
+    tiers = []
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        timeframe, _, points = item.strip().partition(":")
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Invalid timeframe in tier '{item}': expected one of {', '.join(TIMEFRAMES)}")
+        tiers.append((timeframe, int(points) if points else None))
+    return tiers
@@ -0,0 +1,191 @@
+"""
+기술적 지표(SMA/EMA, RSI, 볼린저 밴드, ATR)와 자산 간 이동 상관계수를 계산하는 모듈입니다.
+collect_market_frames가 만든 자산별 OHLCV DataFrame을 입력으로 받아 pandas/NumPy로 벡터화 계산하며,
+IndicatorEngine은 이전 계산 결과를 보관하여 새 봉(또는 수정된 마지막 봉)부터만 다시 계산합니다.
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_PARAMS = {
+    "sma_windows": (20, 50),
+    "ema_spans": (12, 26),
+    "rsi_period": 14,
+    "bb_window": 20,
+    "bb_std": 2.0,
+    "atr_period": 14,
+    "corr_window": 24,
+}
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+def _ewm(values: pd.Series, alpha: float, seed=None) -> pd.Series:
+    """
+    지수 이동 평균 (y_t = (1 - alpha) * y_{t-1} + alpha * x_t)
+    seed가 주어지면 직전 값으로 사용하여 이어서 계산합니다. (전체 재계산과 동일한 결과)
+    """
+    if seed is None or pd.isna(seed):
+        return values.ewm(alpha=alpha, adjust=False).mean()
+    seeded = pd.concat([pd.Series([seed]), values.reset_index(drop=True)], ignore_index=True)
+    result = seeded.ewm(alpha=alpha, adjust=False).mean().iloc[1:]
+    result.index = values.index
+    return result
+
+def _utc_index(df: pd.DataFrame) -> pd.DataFrame:
+    index = pd.DatetimeIndex(df.index)
+    index = index.tz_convert("UTC") if index.tz is not None else index.tz_localize("UTC")
+    return df.set_axis(index).sort_index()
+
+class IndicatorEngine:
+    def __init__(self, params: dict = None, max_history: int = 5000, corr_assets: list = None):
+        """
+        corr_assets: 상관계수를 계산할 자산 이름 목록 (None이면 전체 - 자산 수의 제곱에 비례하므로 큰 목록에서는 핵심 자산만 지정)
+        """
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        self.max_history = max_history
+        self.corr_assets = corr_assets
+        # 자산별 (입력 OHLC, 지표 결과) - 증분 계산용
+        self._state = {}
+
+    def _lookback(self) -> int:
+        return max(max(self.params["sma_windows"]), self.params["bb_window"])
+
+    def _compute(self, inp: pd.DataFrame, prev: pd.DataFrame = None, start: int = 0) -> pd.DataFrame:
+        """
+        inp의 start번째 봉부터 지표를 계산합니다.
+        이동 평균 계열은 직전 lookback개 봉을 함께 사용하고, 재귀 지표(EMA/RSI/ATR)는 prev의 직전 값에서 이어서 계산합니다.
+        """
+        p = self.params
+        window = inp.iloc[max(0, start - self._lookback()):]
+        close, high, low = window["Close"], window["High"], window["Low"]
+        prev_close = close.shift(1)
+
+        out = pd.DataFrame(index=window.index)
+        out["close"] = close
+        for w in p["sma_windows"]:
+            out[f"sma_{w}"] = close.rolling(w, min_periods=w).mean()
+        mid = close.rolling(p["bb_window"], min_periods=p["bb_window"]).mean()
+        std = close.rolling(p["bb_window"], min_periods=p["bb_window"]).std(ddof=0)
+        out["bb_mid"] = mid
+        out["bb_upper"] = mid + p["bb_std"] * std
+        out["bb_lower"] = mid - p["bb_std"] * std
+        delta = close.diff()
+        gain = delta.clip(lower=0)
+        loss = -delta.clip(upper=0)
+        true_range = pd.concat(
+            [high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1
+        ).max(axis=1, skipna=False).fillna(high - low)
+
+        # start 이전 봉은 계산 보조용이므로 제외
+        tail = slice(inp.index[start], None)
+        out, close, gain, loss, true_range = out.loc[tail], close.loc[tail], gain.loc[tail], loss.loc[tail], true_range.loc[tail]
+
+        seed = (lambda col: prev[col].iloc[-1]) if prev is not None and not prev.empty else (lambda col: None)
+        for span in p["ema_spans"]:
+            out[f"ema_{span}"] = _ewm(close, 2 / (span + 1), seed(f"ema_{span}"))
+        out["_avg_gain"] = _ewm(gain, 1 / p["rsi_period"], seed("_avg_gain"))
+        out["_avg_loss"] = _ewm(loss, 1 / p["rsi_period"], seed("_avg_loss"))
+        rs = out["_avg_gain"] / out["_avg_loss"]
+        out["rsi"] = np.where(out["_avg_loss"] == 0, 100.0, 100 - 100 / (1 + rs))
+        out.loc[out["_avg_gain"].isna(), "rsi"] = np.nan
+        out["atr"] = _ewm(true_range, 1 / p["atr_period"], seed("atr"))
+        return out
+
+    def _update_asset(self, name: str, df: pd.DataFrame) -> pd.DataFrame:
+        df = _utc_index(df[PRICE_COLUMNS].astype("float64")).dropna(subset=["Close"])
+        state = self._state.get(name)
+        if state is None:
+            inp, out = df, self._compute(df)
+        else:
+            cached_in, cached_out = state
+            # 처음 보는 봉 또는 값이 바뀐 봉(미완성 봉 갱신) 중 가장 이른 시점부터 다시 계산
+            overlap = df.index.intersection(cached_in.index)
+            changed = (df.loc[overlap] != cached_in.loc[overlap]) & ~(df.loc[overlap].isna() & cached_in.loc[overlap].isna())
+            dirty = overlap[changed.any(axis=1).to_numpy()].union(df.index.difference(cached_in.index))
+            if dirty.empty:
+                return cached_out.reindex(df.index)
+            start_ts = dirty.min()
+            if start_ts <= cached_in.index[0]:
+                inp = df.combine_first(cached_in)
+                out = self._compute(inp)
+            else:
+                inp = pd.concat([cached_in[cached_in.index < start_ts], df[df.index >= start_ts]])
+                start = inp.index.get_loc(start_ts)
+                prev = cached_out[cached_out.index < start_ts]
+                out = pd.concat([prev, self._compute(inp, prev, start)])
+
+        self._state[name] = (inp.iloc[-self.max_history:], out.iloc[-self.max_history:])
+        return out.reindex(df.index)
+
+    def update(self, frames: dict) -> dict:
+        """
+        자산별 OHLCV DataFrame으로 지표를 계산(또는 증분 갱신)합니다.
+        반환값: {"assets": {자산: 지표 DataFrame}, "correlations": 자산쌍별 이동 상관계수 DataFrame}
+        """
+        assets = {
+            name: self._update_asset(name, df)
+            for name, df in frames.items()
+            if df is not None and not df.empty and "Close" in df.columns
+        }
+        corr_inputs = assets if self.corr_assets is None else {name: assets[name] for name in self.corr_assets if name in assets}
+        return {"assets": assets, "correlations": rolling_correlations(corr_inputs, self.params["corr_window"])}
+
+def rolling_correlations(assets: dict, window: int) -> pd.DataFrame:
+    """
+    자산 간 로그 수익률의 이동 상관계수를 계산합니다. (공통 타임스탬프 기준, 컬럼 이름: "A/B")
+    """
+    closes = pd.DataFrame({name: out["close"] for name, out in assets.items()}).dropna()
+    if closes.shape[1] < 2:
+        return pd.DataFrame()
+    returns = np.log(closes).diff()
+    names = list(closes.columns)
+    pairs = {
+        f"{a}/{b}": returns[a].rolling(window, min_periods=window).corr(returns[b])
+        for i, a in enumerate(names) for b in names[i + 1:]
+    }
+    return pd.DataFrame(pairs, index=closes.index)
+
+def _json_values(series: pd.Series) -> list:
+    values = series.to_numpy(dtype="float64", na_value=np.nan).round(6)
+    mask = np.isnan(values)
+    if mask.any():
+        values = values.astype(object)
+        values[mask] = None
+    return values.tolist()
+
+def _json_scalar(value):
+    return None if value is None or pd.isna(value) else round(float(value), 6)
+
+def indicators_to_json(result: dict, params: dict = None, include_series: bool = False) -> dict:
+    """
+    지표 계산 결과를 JSON 직렬화 가능한 구조로 변환합니다.
+    assets/correlations에는 최신 값만, include_series=True이면 series에 컬럼형 시계열(t: UTC epoch 초)을 포함합니다.
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    data = {"params": {k: list(v) if isinstance(v, tuple) else v for k, v in params.items()}, "assets": {}, "correlations": {}}
+    series = {}
+    for name, out in result.get("assets", {}).items():
+        public = out[[col for col in out.columns if not col.startswith("_")]].dropna(how="all")
+        if public.empty:
+            continue
+        latest = public.iloc[-1]
+        data["assets"][name] = {"t": int(public.index[-1].timestamp()), **{col: _json_scalar(v) for col, v in latest.items()}}
+        if include_series:
+            series[name] = {"t": (public.index.as_unit("s").asi8).tolist(), **{col: _json_values(public[col]) for col in public.columns}}
+
+    correlations = result.get("correlations")
+    if correlations is not None and not correlations.empty:
+        valid = correlations.dropna(how="all")
+        if not valid.empty:
+            data["correlations"] = {col: _json_scalar(v) for col, v in valid.iloc[-1].items()}
+            if include_series:
+                series["correlations"] = {"t": valid.index.as_unit("s").asi8.tolist(), **{col: _json_values(valid[col]) for col in valid.columns}}
+    if include_series:
+        data["series"] = series
+    return data
+
+def compute_indicators(frames: dict, params: dict = None, include_series: bool = False, corr_assets: list = None) -> dict:
+    """
+    증분 상태 없이 한 번 계산하여 JSON 구조로 반환합니다. (generate_static.py 등 일회성 실행용)
+    """
+    engine = IndicatorEngine(params, corr_assets=corr_assets)
+    return indicators_to_json(engine.update(frames), engine.params, include_series=include_series)
@@ -70,3 +70,31 @@ Output Format:
 (결론 작성...)
 """
 # AI 모델에 전달할 비관적 리포트 생성 프롬프트 템플릿입니다.
+
+TRANSCRIPT_MAP_PROMPT_TEMPLATE = """
+System Instruction:
+You are summarizing part {part} of {parts} of a YouTube video transcript for an investment analyst covering Silver, Gold, Bitcoin and macro markets.
+
+Instructions:
+1. Keep only market-relevant content: price levels, forecasts, catalysts, macro views (Fed, dollar, inflation), and the speaker's overall stance.
+2. Drop greetings, sponsor reads, and off-topic chatter.
+3. Write plain English sentences, at most {max_words} words. Do not add information that is not in the transcript.
+
+Transcript:
+{text}
+"""
+# 긴 유튜브 자막의 각 구간을 요약하는 프롬프트 템플릿입니다. (map 단계)
+
+TRANSCRIPT_REDUCE_PROMPT_TEMPLATE = """
+System Instruction:
+You are combining partial summaries of one YouTube video into a single summary for an investment analyst covering Silver, Gold, Bitcoin and macro markets.
+
+Instructions:
+1. Merge the partial summaries in order, removing repetition.
+2. Keep concrete numbers, forecasts, catalysts, and the speaker's overall stance (bullish/bearish/neutral).
+3. Write plain English sentences, at most {max_words} words. Do not add information that is not in the summaries.
+
+Partial summaries:
+{text}
+"""
+# 구간별 요약을 영상 하나의 요약으로 합치는 프롬프트 템플릿입니다. (reduce 단계)
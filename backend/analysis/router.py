@@ -0,0 +1,143 @@
+"""
+Gemini 모델 폴백 체인을 위한 상태 기반 라우터 모듈입니다.
+모델 인스턴스를 캐시하고, 모델별 최근 실패/지연 시간을 추적하여
+실패가 누적된 모델은 일정 시간 차단(circuit open)하고 가장 빠른 정상 모델을 먼저 시도합니다.
+"""
+import threading
+import time
+
+class ModelHealth:
+    """
+    단일 모델의 상태 (성공/실패 횟수, 지연 시간 이동 평균, 차단 해제 시각)
+    """
+    def __init__(self, name: str, order: int):
+        self.name = name
+        self.order = order
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.latency_ewma = None
+        self.open_until = 0.0
+        self.last_error = None
+        self.last_used = None
+
+    def is_open(self, now: float) -> bool:
+        return now < self.open_until
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "model": self.name,
+            "state": "open" if self.is_open(now) else ("half_open" if self.consecutive_failures else "closed"),
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_ewma_sec": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "retry_in_sec": round(max(0.0, self.open_until - now), 1),
+            "last_error": self.last_error,
+            "last_used": self.last_used,
+        }
+
+class ModelRouter:
+    def __init__(self, model_names, failure_threshold: int = 1, cooldown_sec: float = 300.0,
+                 max_cooldown_sec: float = 3600.0, latency_alpha: float = 0.3, api_key: str = None):
+        """
+        api_key: 첫 모델 생성 시 genai.configure에 전달할 API 키
+        failure_threshold: 연속 실패가 이 횟수에 도달하면 차단
+        cooldown_sec: 첫 차단 시간 (차단 후 재시도에 다시 실패하면 max_cooldown_sec까지 두 배씩 증가)
+        latency_alpha: 지연 시간 지수 이동 평균 가중치
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown_sec = cooldown_sec
+        self.max_cooldown_sec = max_cooldown_sec
+        self.latency_alpha = latency_alpha
+        self._health = {name: ModelHealth(name, i) for i, name in enumerate(model_names)}
+        self._models = {}
+        self._lock = threading.Lock()
+        self._api_key = api_key
+        self._genai = None
+        self._genai_lock = threading.Lock()
+
+    def get_model(self, name: str):
+        """
+        모델 인스턴스를 캐시에서 반환합니다. (없으면 생성)
+        첫 호출에서 SDK를 불러오므로(약 1초) 이벤트 루프가 아닌 실행 스레드에서 호출합니다.
+        """
+        with self._lock:
+            model = self._models.get(name)
+        if model is not None:
+            return model
+        # SDK 임포트 동안 self._lock을 잡지 않아 candidates()/record_* 호출이 막히지 않도록 함
+        model = self._load_genai().GenerativeModel(name)
+        with self._lock:
+            return self._models.setdefault(name, model)
+
+    def _load_genai(self):
+        """
+        google.generativeai를 첫 모델 생성 시점에 불러와 설정합니다. (임포트 비용이 커서 서버 시작 시 불러오지 않음)
+        """
+        with self._genai_lock:
+            if self._genai is None:
+                import google.generativeai as genai
+
+                if self._api_key:
+                    genai.configure(api_key=self._api_key)
+                self._genai = genai
+            return self._genai
+
+    def candidates(self) -> list:
+        """
+        시도할 모델 이름을 우선순위대로 반환합니다.
+        정상(차단되지 않은) 모델은 지연 시간이 짧은 순으로, 차단된 모델은 차단 해제가 빠른 순으로 맨 뒤에 둡니다.
+        (모두 차단된 경우에도 요청을 시도하기 위함)
+        지연 시간을 아직 측정하지 않은 정상 모델은 현재 가장 빠른 모델과 같은 값으로 보고 그보다 먼저 시도하여,
+        한 번도 쓰이지 않은 모델도 측정 기회를 얻도록 합니다. (측정된 모델이 없으면 설정 순서)
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [h for h in self._health.values() if not h.is_open(now)]
+            blocked = [h for h in self._health.values() if h.is_open(now)]
+        measured = [h.latency_ewma for h in healthy if h.latency_ewma is not None]
+        best = min(measured, default=0.0)
+        healthy.sort(key=lambda h: (
+            h.latency_ewma if h.latency_ewma is not None else best, h.latency_ewma is not None, h.order,
+        ))
+        blocked.sort(key=lambda h: h.open_until)
+        return [h.name for h in healthy + blocked]
+
+    def record_success(self, name: str, latency: float):
+        with self._lock:
+            h = self._health[name]
+            h.successes += 1
+            h.consecutive_failures = 0
+            h.trips = 0
+            h.open_until = 0.0
+            h.last_used = time.time()
+            if h.latency_ewma is None:
+                h.latency_ewma = latency
+            else:
+                h.latency_ewma = self.latency_alpha * latency + (1 - self.latency_alpha) * h.latency_ewma
+
+    def record_failure(self, name: str, error: Exception):
+        with self._lock:
+            h = self._health[name]
+            h.failures += 1
+            h.consecutive_failures += 1
+            h.last_error = str(error)[:300]
+            h.last_used = time.time()
+            now = time.monotonic()
+            # 동시에 진행 중이던 요청의 실패로 이미 차단된 경우에는 차단 시간을 다시 늘리지 않음
+            if h.consecutive_failures >= self.failure_threshold and not h.is_open(now):
+                # 차단 해제 후 재시도에서도 실패하면 차단 시간을 두 배로 늘림
+                cooldown = min(self.cooldown_sec * (2 ** h.trips), self.max_cooldown_sec)
+                h.trips += 1
+                h.open_until = now + cooldown
+
+    def snapshot(self) -> list:
+        """
+        모델별 상태를 현재 우선순위 순서로 반환합니다.
+        """
+        now = time.monotonic()
+        order = self.candidates()
+        with self._lock:
+            return [self._health[name].to_dict(now) for name in order]
@@ -1,18 +1,47 @@
-import google.generativeai as genai
 import os
+import asyncio
+import threading
+from contextlib import aclosing
+from concurrent.futures import ThreadPoolExecutor
+import time
 from .prompts import BULLISH_PROMPT_TEMPLATE, BEARISH_PROMPT_TEMPLATE
+from .router import ModelRouter
+from .context import DEFAULT_TOKEN_BUDGET, build_prompt_context, estimate_tokens
+from .summarize import summarize_transcripts, summary_budget
+from ..assets import core_asset_names
+from ..storage.response_cache import get_response_cache, make_cache_key
+from ..storage.transcript_store import get_transcript_store
+from ..ratelimit import get_provider_limiter
+from ..metrics import LLM_ATTEMPT_DURATION, LLM_ATTEMPTS, LLM_CACHE_LOOKUPS, LLM_TOKENS
+from ..tracing import record
 import logging
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 리포트 종류 (generate_reports 기본값)
+REPORT_TYPES = ("bullish", "bearish")
+
+def _response_tokens(response) -> int:
+    """
+    응답 토큰 수 (usage_metadata가 없으면 응답 텍스트 길이로 추정)
+    """
+    usage = getattr(response, "usage_metadata", None)
+    count = getattr(usage, "candidates_token_count", None)
+    if count:
+        return count
+    try:
+        return estimate_tokens(response.text)
+    except Exception:
+        return 0
+
 class AnalysisService:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_concurrency: int = 4, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 use_cache: bool = True):
         if not api_key:
             raise ValueError("Gemini API Key is required")
-        
-        genai.configure(api_key=api_key)
+
         # 사용 가능한 모델 목록 (더 많은 변형 포함)
         self.models = [
             'gemini-1.5-flash', 
@@ -21,14 +50,180 @@ class AnalysisService:
             'gemini-1.5-pro-latest',
             'gemini-2.0-flash-exp'
         ]
+        # 모델 인스턴스 캐시 + 모델별 상태 추적 (실패한 모델은 일정 시간 건너뜀)
+        # google.generativeai는 첫 모델 호출 시점에 실행 스레드에서 불러오고 API 키를 설정함
+        self.router = ModelRouter(self.models, api_key=api_key)
         self.current_model_name = self.models[0]
-        self.model = genai.GenerativeModel(self.current_model_name)
+        # 프롬프트 데이터 영역의 토큰 예산
+        self.token_budget = token_budget
+        # 프롬프트에 포함할 자산 (설정의 핵심 자산, 나머지 자산은 차트/지표용으로만 수집)
+        self.prompt_assets = core_asset_names()
+        # 동일한 입력에 대한 LLM 응답 캐시 (디스크에 저장되어 재시작/CI 실행 간에도 재사용)
+        self.cache = None
+        if use_cache:
+            try:
+                self.cache = get_response_cache()
+            except Exception as e:
+                logger.warning(f"Response cache unavailable: {e}")
+        # generate_content는 블로킹 호출이므로 제한된 스레드 풀에서 실행하여 이벤트 루프를 막지 않음
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini")
 
-    async def generate_report(self, market_data: dict, news_data: list, youtube_data: list, report_type: str = "bullish") -> str:
+    @property
+    def model(self):
         """
-        제공된 데이터와 타입을 기반으로 투자 리포트를 생성합니다.
-        여러 모델을 시도하여 성공할 때까지 반복합니다.
-        report_type: 'bullish' (낙관적) 또는 'bearish' (비관적)
+        기본 모델 인스턴스 (처음 접근할 때 생성)
+        """
+        return self.router.get_model(self.current_model_name)
+
+    async def _generate_content(self, model_name: str, context: str, timing: dict):
+        """
+        블로킹 SDK 호출을 스레드 풀에서 실행하고 결과를 기다립니다.
+        모델별 분당 요청/토큰 한도(RATE_LIMIT_GEMINI_*)가 차면 실패하지 않고 기다리며,
+        한도 초과/일시적 오류는 같은 모델로 백오프 후 재시도합니다. 재시도까지 실패하면 호출자가 다음 모델로 넘어갑니다.
+        timing["latency"]: 마지막 SDK 호출에 걸린 시간 (한도 대기/백오프 제외, 실패한 경우에도 기록)
+        """
+        limiter = get_provider_limiter("gemini", scope=model_name)
+
+        def generate(model):
+            started = time.perf_counter()
+            try:
+                return model.generate_content(context)
+            finally:
+                timing["latency"] = time.perf_counter() - started
+
+        def call():
+            # 첫 호출의 SDK 임포트가 이벤트 루프를 막지 않도록 모델도 실행 스레드에서 가져옴
+            model = self.router.get_model(model_name)
+            response = limiter.call(generate, model, tokens=estimate_tokens(context))
+            # 응답 토큰도 분당 토큰 한도에 포함되므로 받은 뒤 반영 (공유 상태 갱신이 블로킹이므로 실행 스레드에서 처리)
+            limiter.record_usage(_response_tokens(response))
+            return response
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, call)
+
+    async def _stream_content(self, model_name: str, context: str, timing: dict):
+        """
+        블로킹 스트리밍 SDK 호출(generate_content(stream=True))을 스레드 풀에서 실행하고,
+        생성되는 텍스트 조각을 비동기 이터레이터로 전달합니다.
+        모델별 한도가 허용할 때까지 기다린 뒤 시작합니다. (스트리밍은 재시도하지 않고 실패하면 다음 모델로 넘어감)
+        소비자가 중간에 멈추면(클라이언트 연결 종료로 제너레이터가 닫히거나 취소됨) 생성도 다음 조각에서 중단합니다.
+        timing["latency"]: 스트리밍 SDK 호출 시작부터 마지막 조각까지 걸린 시간 (한도 대기 제외)
+        """
+        limiter = get_provider_limiter("gemini", scope=model_name)
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        finished = object()
+        stop = threading.Event()
+
+        def put(item):
+            if not stop.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        def produce():
+            streamed_tokens = 0
+            started = None
+            try:
+                model = self.router.get_model(model_name)
+                limiter.acquire(tokens=estimate_tokens(context))
+                if stop.is_set():
+                    return
+                started = time.perf_counter()
+                for chunk in model.generate_content(context, stream=True):
+                    if stop.is_set():
+                        break
+                    text = chunk.text
+                    if text:
+                        streamed_tokens += estimate_tokens(text)
+                        put(text)
+            except Exception as e:
+                put(e)
+            finally:
+                if started is not None:
+                    timing["latency"] = time.perf_counter() - started
+                # 스트리밍한 응답 토큰을 분당 토큰 한도에 반영 (실행 스레드에서 처리)
+                limiter.record_usage(streamed_tokens)
+                put(finished)
+
+        producer = loop.run_in_executor(self._executor, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+            await producer
+        finally:
+            stop.set()
+
+    def _observe_attempt(self, model_name: str, mode: str, timing: dict, prompt: str, response=None,
+                         text: str = None, error: Exception = None, **attributes):
+        """
+        Gemini 호출 시도 하나를 메트릭(시도 횟수, 지연 시간, 프롬프트/응답 토큰 수)과 트레이스 구간으로 기록합니다.
+        지연 시간은 SDK 호출 시간만 기록합니다. (한도 대기는 silver_rate_limit_wait_seconds_total로 따로 집계됨)
+        토큰 수는 응답의 usage_metadata가 있으면 사용하고, 없으면 문자 수로 추정합니다.
+        """
+        elapsed = timing.get("latency")
+        outcome = "error" if error is not None else "success"
+        LLM_ATTEMPTS.inc(model=model_name, mode=mode, outcome=outcome)
+        # SDK 호출 전에 실패한 경우(모델 생성 실패 등)에는 지연 시간을 기록하지 않음
+        if elapsed is not None:
+            LLM_ATTEMPT_DURATION.observe(elapsed, model=model_name, mode=mode)
+        if error is None:
+            usage = getattr(response, "usage_metadata", None)
+            prompt_tokens = getattr(usage, "prompt_token_count", None) or estimate_tokens(prompt)
+            response_tokens = getattr(usage, "candidates_token_count", None) or estimate_tokens(text or "")
+            LLM_TOKENS.observe(prompt_tokens, model=model_name, direction="prompt")
+            LLM_TOKENS.observe(response_tokens, model=model_name, direction="response")
+            attributes.update(prompt_tokens=prompt_tokens, response_tokens=response_tokens)
+        record(
+            "llm.attempt", elapsed or 0.0, status="ok" if error is None else "error",
+            error=None if error is None else str(error), model=model_name, mode=mode, **attributes,
+        )
+
+    async def complete(self, prompt: str) -> str:
+        """
+        라우터 순서대로 모델을 시도하여 프롬프트의 응답 텍스트를 반환합니다. (자막 요약 등 보조 작업용)
+        모든 모델이 실패하면 RuntimeError를 발생시킵니다.
+        """
+        errors = []
+        for model_name in self.router.candidates():
+            timing = {}
+            try:
+                response = await self._generate_content(model_name, prompt, timing)
+                text = response.text
+            except Exception as e:
+                logger.warning(f"Failed with {model_name}: {e}")
+                self.router.record_failure(model_name, e)
+                self._observe_attempt(model_name, "complete", timing, prompt, error=e)
+                errors.append(f"{model_name}: {str(e)}")
+                continue
+            self._observe_attempt(model_name, "complete", timing, prompt, response=response, text=text)
+            self.router.record_success(model_name, timing["latency"])
+            return text
+        raise RuntimeError(f"All models failed: {' | '.join(errors)}")
+
+    async def summarize_youtube(self, youtube_data):
+        """
+        유튜브 자막 목록 중 긴 자막을 map-reduce로 요약하여, 영상 수와 관계없이 프롬프트의 유튜브 예산에 맞춥니다.
+        요약은 영상 ID별로 디스크에 저장되어 재사용됩니다. 이미 짧은 항목과 문자열(안내 문구)은 그대로 둡니다.
+        """
+        if not isinstance(youtube_data, (list, tuple)) or not youtube_data:
+            return youtube_data
+        store = None
+        try:
+            store = get_transcript_store()
+        except Exception as e:
+            logger.warning(f"Transcript store unavailable: {e}")
+        max_chars = summary_budget(self.token_budget, len(youtube_data))
+        return await summarize_transcripts(youtube_data, self.complete, max_chars, store=store)
+
+    def _prepare_prompt(self, market_data, news_data, youtube_data, report_type: str, indicators: dict = None):
+        """
+        리포트 타입에 맞는 템플릿과 토큰 예산 내 컨텍스트로 프롬프트를 구성하고,
+        시도할 모델 순서와 모델별 캐시 키를 함께 반환합니다. 잘못된 타입이면 None을 반환합니다.
         """
         prompt_template = ""
         if report_type.lower() == "bullish":
@@ -36,30 +231,143 @@ class AnalysisService:
         elif report_type.lower() == "bearish":
             prompt_template = BEARISH_PROMPT_TEMPLATE
         else:
-            return "Error: Invalid report type."
+            return None
 
-        context = prompt_template.format(
-            market_data=str(market_data)[:10000], 
-            news_data=str(news_data)[:5000],
-            youtube_data=str(youtube_data)[:3000]
+        # 원시 데이터를 문자열로 잘라 넣는 대신 자산별 요약/정렬된 뉴스를 토큰 예산에 맞춰 구성
+        prompt_context = build_prompt_context(
+            market_data, news_data, youtube_data, token_budget=self.token_budget, indicators=indicators,
+            assets=self.prompt_assets,
         )
+        context = prompt_template.format(**prompt_context)
+
+        candidates = self.router.candidates()
+        cache_keys = {
+            model_name: make_cache_key(prompt_template, report_type, model_name, prompt_context)
+            for model_name in candidates
+        }
+        return context, candidates, cache_keys
+
+    def _lookup_cache(self, report_type: str, cache_keys: dict):
+        if self.cache is None:
+            return None
+        cached = self.cache.lookup(cache_keys.values())
+        LLM_CACHE_LOOKUPS.inc(result="miss" if cached is None else "hit")
+        if cached is None:
+            return None
+        logger.info(f"Using cached {report_type} report ({cached[1]}).")
+        return cached[2]
+
+    def _record_success(self, model_name: str, latency: float, cache_key: str, text: str):
+        self.router.record_success(model_name, latency)
+        self.current_model_name = model_name
+        if self.cache is not None:
+            self.cache.set(cache_key, text, model=model_name, latency=latency)
+
+    async def generate_report(self, market_data: dict, news_data: list, youtube_data: list, report_type: str = "bullish",
+                              indicators: dict = None) -> str:
+        """
+        제공된 데이터와 타입을 기반으로 투자 리포트를 생성합니다.
+        라우터가 정한 순서(빠르고 정상인 모델 우선)로 모델을 시도하여 성공할 때까지 반복합니다.
+        report_type: 'bullish' (낙관적) 또는 'bearish' (비관적)
+        indicators: 기술적 지표 요약 (indicators_to_json 결과, 선택)
+        """
+        youtube_data = await self.summarize_youtube(youtube_data)
+        prepared = self._prepare_prompt(market_data, news_data, youtube_data, report_type, indicators)
+        if prepared is None:
+            return "Error: Invalid report type."
+        context, candidates, cache_keys = prepared
+
+        cached = self._lookup_cache(report_type, cache_keys)
+        if cached is not None:
+            return cached
 
         errors = []
-        for model_name in self.models:
+        for model_name in candidates:
+            timing = {}
             try:
                 logger.info(f"Generating {report_type} report using {model_name}...")
-                model = genai.GenerativeModel(model_name)
-                response = model.generate_content(context)
-                return response.text
+                response = await self._generate_content(model_name, context, timing)
+                text = response.text
             except Exception as e:
                 logger.warning(f"Failed with {model_name}: {e}")
+                self.router.record_failure(model_name, e)
+                self._observe_attempt(model_name, "generate", timing, context, error=e, report_type=report_type)
                 errors.append(f"{model_name}: {str(e)}")
                 continue
+            self._observe_attempt(model_name, "generate", timing, context, response=response, text=text,
+                                  report_type=report_type)
+            self._record_success(model_name, timing["latency"], cache_keys[model_name], text)
+            return text
         
         error_msg = " | ".join(errors)
         logger.error(f"All models failed. Errors: {error_msg}")
         return f"Error generating report (All models failed): {error_msg}"
 
+    async def stream_report(self, market_data: dict, news_data: list, youtube_data: list, report_type: str = "bullish",
+                            indicators: dict = None):
+        """
+        리포트를 생성하면서 텍스트 조각을 순서대로 내보내는 비동기 제너레이터입니다.
+        첫 조각을 받기 전에 실패한 모델은 다음 모델로 넘어가며, 캐시에 있으면 전체 텍스트를 한 번에 내보냅니다.
+        모든 모델이 실패하거나 스트리밍 도중 실패하면 RuntimeError를 발생시킵니다.
+        """
+        youtube_data = await self.summarize_youtube(youtube_data)
+        prepared = self._prepare_prompt(market_data, news_data, youtube_data, report_type, indicators)
+        if prepared is None:
+            raise ValueError(f"Invalid report type: {report_type}")
+        context, candidates, cache_keys = prepared
+
+        cached = self._lookup_cache(report_type, cache_keys)
+        if cached is not None:
+            yield cached
+            return
+
+        errors = []
+        for model_name in candidates:
+            timing = {}
+            parts = []
+            try:
+                logger.info(f"Streaming {report_type} report using {model_name}...")
+                # 바깥 제너레이터가 닫히면 _stream_content도 바로 닫아 생성 스레드를 멈춤
+                async with aclosing(self._stream_content(model_name, context, timing)) as stream:
+                    async for text in stream:
+                        parts.append(text)
+                        yield text
+            except Exception as e:
+                logger.warning(f"Failed with {model_name}: {e}")
+                self.router.record_failure(model_name, e)
+                self._observe_attempt(model_name, "stream", timing, context, error=e,
+                                      report_type=report_type, streamed_chunks=len(parts))
+                if parts:
+                    # 이미 일부를 내보낸 경우 다른 모델로 이어 쓸 수 없으므로 중단
+                    raise RuntimeError(f"{model_name} failed mid-stream: {e}") from e
+                errors.append(f"{model_name}: {str(e)}")
+                continue
+            text = "".join(parts)
+            self._observe_attempt(model_name, "stream", timing, context, text=text,
+                                  report_type=report_type, streamed_chunks=len(parts))
+            self._record_success(model_name, timing["latency"], cache_keys[model_name], text)
+            return
+
+        error_msg = " | ".join(errors)
+        logger.error(f"All models failed. Errors: {error_msg}")
+        raise RuntimeError(f"All models failed: {error_msg}")
+
+    async def generate_reports(self, market_data: dict, news_data: list, youtube_data: list, report_types=REPORT_TYPES,
+                               indicators: dict = None) -> dict:
+        """
+        요청된 모든 리포트 타입을 동시에 생성합니다.
+        전체 소요 시간은 가장 느린 단일 리포트의 생성 시간과 비슷합니다.
+        반환값: {report_type: 리포트 텍스트}
+        """
+        report_types = list(report_types)
+        # 자막 요약은 리포트 타입과 무관하므로 한 번만 수행
+        youtube_data = await self.summarize_youtube(youtube_data)
+        results = await asyncio.gather(*(
+            self.generate_report(market_data, news_data, youtube_data, report_type, indicators=indicators)
+            for report_type in report_types
+        ))
+        return dict(zip(report_types, results))
+
 # 싱글톤 인스턴스 플레이스홀더
 analysis_service = None
 
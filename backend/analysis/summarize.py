@@ -0,0 +1,111 @@
+"""
+긴 유튜브 자막을 map-reduce 방식으로 요약하는 모듈입니다.
+자막을 일정 길이 구간으로 나눠 각각 요약(map)한 뒤 하나로 합치며(reduce),
+영상 수에 맞춰 영상당 요약 길이를 정하여 여러 영상이 프롬프트 예산 안에 들어가도록 합니다.
+LLM 호출은 complete(prompt) 코루틴으로 주입받습니다. (AnalysisService.complete)
+"""
+import asyncio
+import logging
+import os
+import re
+
+from .context import SECTION_WEIGHTS
+from .prompts import TRANSCRIPT_MAP_PROMPT_TEMPLATE, TRANSCRIPT_REDUCE_PROMPT_TEMPLATE
+
+logger = logging.getLogger(__name__)
+
+# map 단계에서 한 번에 요약할 자막 구간 길이 (문자)
+DEFAULT_CHUNK_CHARS = int(os.getenv("TRANSCRIPT_CHUNK_CHARS", "12000"))
+
+# 영상당 요약 길이의 하한 (영상이 많아도 이보다 짧게 줄이지 않음)
+MIN_SUMMARY_CHARS = 400
+
+def summary_budget(token_budget: int, video_count: int) -> int:
+    """
+    프롬프트의 유튜브 섹션 예산(약 4자/토큰)을 영상 수로 나눈 영상당 요약 길이(문자)를 반환합니다.
+    """
+    section_chars = int(token_budget * SECTION_WEIGHTS["youtube_data"] * 4)
+    return max(MIN_SUMMARY_CHARS, section_chars // max(1, video_count))
+
+def chunk_text(text: str, chunk_chars: int = DEFAULT_CHUNK_CHARS) -> list:
+    """
+    텍스트를 chunk_chars 이하의 구간으로 나눕니다. 가능하면 문장 끝, 아니면 공백에서 자릅니다.
+    """
+    text = " ".join((text or "").split())
+    chunks = []
+    while len(text) > chunk_chars:
+        window = text[:chunk_chars]
+        cut = max(window.rfind(". "), window.rfind("? "), window.rfind("! "))
+        cut = cut + 1 if cut >= chunk_chars // 2 else window.rfind(" ")
+        if cut <= 0:
+            cut = chunk_chars
+        chunks.append(text[:cut].strip())
+        text = text[cut:].strip()
+    if text:
+        chunks.append(text)
+    return chunks
+
+def _truncate(text: str, max_chars: int) -> str:
+    text = " ".join((text or "").split())
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rfind(". ")
+    return text[:cut + 1] if cut >= max_chars // 2 else text[:max_chars]
+
+def _max_words(max_chars: int) -> int:
+    # 영문 기준 단어당 약 6자 (공백 포함)
+    return max(50, max_chars // 6)
+
+async def map_reduce_summary(text: str, complete, max_chars: int, chunk_chars: int = DEFAULT_CHUNK_CHARS) -> str:
+    """
+    자막 하나를 max_chars 이하로 요약합니다.
+    구간별 요약을 동시에 생성한 뒤, 합친 길이가 chunk_chars를 넘으면 묶음 단위로 다시 합치는 과정을 반복합니다.
+    """
+    chunks = chunk_text(text, chunk_chars)
+    summaries = await asyncio.gather(*(
+        complete(TRANSCRIPT_MAP_PROMPT_TEMPLATE.format(
+            part=i + 1, parts=len(chunks), max_words=_max_words(max_chars), text=chunk
+        ))
+        for i, chunk in enumerate(chunks)
+    ))
+
+    while len(summaries) > 1:
+        groups = chunk_text("\n".join(summaries), chunk_chars) if sum(map(len, summaries)) > chunk_chars else []
+        if not groups or len(groups) >= len(summaries):
+            # 더 줄어들지 않으면 한 번에 합쳐 반복을 끝냄
+            groups = ["\n".join(summaries)]
+        summaries = await asyncio.gather(*(
+            complete(TRANSCRIPT_REDUCE_PROMPT_TEMPLATE.format(max_words=_max_words(max_chars), text=group))
+            for group in groups
+        ))
+    return _truncate(summaries[0], max_chars)
+
+async def summarize_transcripts(youtube_data, complete, max_chars: int, store=None,
+                                chunk_chars: int = DEFAULT_CHUNK_CHARS):
+    """
+    수집된 자막 목록([{"video_id", "url", "text"}, ...] 또는 문자열 리스트)의 긴 항목을 요약합니다.
+    max_chars 이하인 자막은 그대로 두고, store가 있으면 (영상 ID, max_chars)별 요약을 재사용/저장합니다.
+    요약에 실패한 자막은 max_chars로 잘라 사용합니다. 리스트가 아니면(안내 문구 등) 그대로 반환합니다.
+    """
+    if not isinstance(youtube_data, (list, tuple)):
+        return youtube_data
+
+    async def summarize(item):
+        video = item if isinstance(item, dict) else {"text": str(item or "")}
+        text = video.get("text") or ""
+        if len(text) <= max_chars:
+            return item
+        video_id = video.get("video_id")
+        summary = store.get_summary(video_id, max_chars) if store is not None and video_id else None
+        if summary is None:
+            try:
+                summary = await map_reduce_summary(text, complete, max_chars, chunk_chars)
+            except Exception as e:
+                logger.warning(f"자막 요약 실패 ({video_id or 'text'}), 앞부분만 사용: {e}")
+                summary = _truncate(text, max_chars)
+            else:
+                if store is not None and video_id:
+                    store.put_summary(video_id, max_chars, summary)
+        return {**video, "text": summary, "summarized": True} if isinstance(item, dict) else summary
+
+    return list(await asyncio.gather(*(summarize(item) for item in youtube_data)))
@@ -0,0 +1,85 @@
+"""
+수집 대상 자산 목록(asset universe)을 설정 파일에서 읽는 모듈입니다.
+기본 설정은 backend/config/assets.json이며 ASSET_CONFIG_PATH로 다른 파일을 지정할 수 있습니다.
+
+설정 형식: {"assets": [{"name": "Silver", "ticker": "SLV", "group": "metals", "core": true}, "NEM", ...]}
+- name: 응답/차트에서 사용하는 자산 이름 (생략하면 티커), ticker: 야후 파이낸스 티커
+- group: 분류 (metals, etf, miners, fx 등, 선택)
+- core: 리포트 프롬프트와 자산 간 상관계수에 포함할 핵심 자산 여부
+  (수백 개 자산의 전체 쌍 상관계수/프롬프트는 비용이 크므로 나머지 자산은 수집/저장/차트용으로만 사용)
+- 문자열 항목은 티커만 지정한 비핵심 자산으로 취급합니다.
+"""
+import json
+import os
+import threading
+
+DEFAULT_ASSET_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "assets.json")
+ASSET_CONFIG_PATH = os.getenv("ASSET_CONFIG_PATH") or DEFAULT_ASSET_CONFIG_PATH
+
+class Asset:
+    __slots__ = ("name", "ticker", "group", "core")
+
+    def __init__(self, name: str, ticker: str, group: str = None, core: bool = False):
+        self.name = name
+        self.ticker = ticker
+        self.group = group
+        self.core = core
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "ticker": self.ticker, "group": self.group, "core": self.core}
+
+def parse_assets(config: dict) -> list:
+    """
+    설정 객체를 Asset 목록으로 변환합니다. 이름 또는 티커가 중복되면 ValueError를 발생시킵니다.
+    """
+    assets = []
+    for item in config.get("assets", []):
+        if isinstance(item, str):
+            item = {"ticker": item}
+        ticker = str(item.get("ticker") or "").strip()
+        if not ticker:
+            raise ValueError(f"Asset entry without ticker: {item}")
+        assets.append(Asset(
+            name=str(item.get("name") or ticker).strip(),
+            ticker=ticker,
+            group=item.get("group"),
+            core=bool(item.get("core", False)),
+        ))
+    for field in ("name", "ticker"):
+        values = [getattr(asset, field) for asset in assets]
+        duplicates = sorted({value for value in values if values.count(value) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate asset {field}s: {', '.join(duplicates)}")
+    if not assets:
+        raise ValueError("Asset config has no assets")
+    return assets
+
+def load_assets(path: str = None) -> list:
+    with open(path or ASSET_CONFIG_PATH, "r", encoding="utf-8") as f:
+        return parse_assets(json.load(f))
+
+_assets = None
+_assets_lock = threading.Lock()
+
+def get_assets() -> list:
+    """
+    설정 파일의 자산 목록을 반환합니다. (프로세스당 한 번 읽음)
+    """
+    global _assets
+    with _assets_lock:
+        if _assets is None:
+            _assets = load_assets()
+        return _assets
+
+def asset_symbols(assets: list = None) -> dict:
+    """
+    {자산 이름: 티커} (설정 순서 유지)
+    """
+    return {asset.name: asset.ticker for asset in (assets or get_assets())}
+
+def core_asset_names(assets: list = None) -> list:
+    """
+    핵심 자산 이름 목록. core로 지정된 자산이 없으면 전체 자산을 반환합니다.
+    """
+    assets = assets or get_assets()
+    return [asset.name for asset in assets if asset.core] or [asset.name for asset in assets]
@@ -0,0 +1,94 @@
+"""
+차트용 시간 단위 집계/포인트 수 축소의 응답 크기와 소요 시간을 측정하는 벤치마크입니다.
+합성 1시간 봉 이력(기본 7일~5년)을 만들어 timeframe(1h/4h/1d/1w)과 method(ohlc/minmax/lttb)별로
+집계 → 축소 → 컬럼형 직렬화를 실행하고, 축소하지 않은 응답과 크기를 비교합니다.
+
+실행: python -m backend.benchmarks.downsample [--days 7,30,365,1825] [--max-points 500]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from backend.analysis.downsample import DOWNSAMPLE_METHODS, TIMEFRAMES, aggregate_ohlcv
+from backend.collectors.market_data import encode_market_frames
+from backend.serialized import dumps
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_DIR = os.path.join(os.getenv("DATA_DIR", os.path.join(_PROJECT_ROOT, "data")), "benchmarks")
+DEFAULT_DAYS = (7, 30, 365, 1825)
+SEED = 7
+
+def _synthetic_history(days: int, seed: int = SEED) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(end=pd.Timestamp("2026-01-01", tz="UTC"), periods=days * 24, freq="1h", name="Datetime")
+    close = 30 * np.exp(np.cumsum(rng.normal(0, 0.003, len(index))))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.002, len(index))) * close
+    return pd.DataFrame({
+        "Open": open_, "High": np.maximum(open_, close) + spread, "Low": np.minimum(open_, close) - spread,
+        "Close": close, "Volume": rng.integers(1_000, 100_000, len(index)).astype("float64"),
+    }, index=index)
+
+def _measure(df: pd.DataFrame, timeframe: str, max_points: int, method: str, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = dumps(encode_market_frames({"Silver": aggregate_ohlcv(df, timeframe, max_points, method)}, orient="columns"))
+        timings.append(time.perf_counter() - started)
+    return {"points": len(json.loads(body)["Silver"]["t"]), "bytes": len(body), "median_ms": float(np.median(timings)) * 1000}
+
+def run(args) -> dict:
+    methods = args.methods.split(",")
+    timeframes = args.timeframes.split(",")
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "max_points": args.max_points,
+            "repeat": args.repeat,
+        },
+        "histories": {},
+    }
+    for days in (int(value) for value in args.days.split(",")):
+        df = _synthetic_history(days)
+        entry = {"bars": len(df), "raw": _measure(df, None, None, "ohlc", args.repeat), "timeframes": {}}
+        print(f"{days:>5} days  {len(df):>6} bars  raw {entry['raw']['bytes'] / 1e3:9.1f}KB  {entry['raw']['median_ms']:7.1f}ms")
+        for timeframe in timeframes:
+            entry["timeframes"][timeframe] = {}
+            for method in methods:
+                result = _measure(df, timeframe, args.max_points, method, args.repeat)
+                entry["timeframes"][timeframe][method] = result
+                print(
+                    f"      {timeframe:>3} {method:<6}  points {result['points']:>5}"
+                    f"  {result['bytes'] / 1e3:8.1f}KB  {result['median_ms']:7.1f}ms"
+                )
+        results["histories"][days] = entry
+    return results
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="시간 단위 집계/포인트 수 축소 응답 크기 및 소요 시간 벤치마크")
+    parser.add_argument("--days", default=",".join(str(days) for days in DEFAULT_DAYS), help="쉼표 구분 이력 기간(일) 목록")
+    parser.add_argument("--timeframes", default=",".join(TIMEFRAMES))
+    parser.add_argument("--methods", default=",".join(DOWNSAMPLE_METHODS))
+    parser.add_argument("--max-points", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5, help="조합별 반복 횟수 (중앙값 기록)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본값: data/benchmarks/downsample-<시각>.json)")
+    args = parser.parse_args()
+
+    results = run(args)
+    output = args.output or os.path.join(RESULTS_DIR, f"downsample-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\nResults saved to {output}")
+
+if __name__ == "__main__":
+    main_cli()
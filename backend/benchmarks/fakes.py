@@ -0,0 +1,197 @@
+"""
+외부 API(yfinance, Tavily, Gemini)를 대신하는 로컬 대역 모듈입니다.
+고정 데이터(fixtures)를 응답으로 사용하며, 제공자별 지연 시간과 실패 확률을 설정할 수 있습니다.
+install_fakes()로 yf.download, TavilyClient, genai.GenerativeModel을 교체합니다.
+"""
+import contextlib
+import math
+import random
+import threading
+import time
+from unittest import mock
+
+import pandas as pd
+
+PROVIDERS = ("yf", "tavily", "genai")
+
+class FaultProfile:
+    """
+    제공자 하나의 지연/실패 설정
+    latency: 호출당 기본 지연 (초), per_item: 항목(티커/스트리밍 조각)당 추가 지연 (초)
+    jitter: 지연 시간의 무작위 변동 비율, failure_rate: 호출(또는 티커)당 실패 확률
+    """
+    def __init__(self, latency: float = 0.0, per_item: float = 0.0, jitter: float = 0.1, failure_rate: float = 0.0):
+        self.latency = latency
+        self.per_item = per_item
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+
+    def to_dict(self) -> dict:
+        return {"latency": self.latency, "per_item": self.per_item, "jitter": self.jitter, "failure_rate": self.failure_rate}
+
+# 실제 서비스와 비슷한 규모의 기본 지연 시간
+DEFAULT_PROFILES = {
+    "yf": FaultProfile(latency=0.25, per_item=0.05),
+    "tavily": FaultProfile(latency=0.4),
+    "genai": FaultProfile(latency=0.8, per_item=0.02),
+}
+
+class FakeBackend:
+    """
+    대역들이 공유하는 상태 (고정 데이터, 설정, 시드 고정 난수, 호출 통계)
+    """
+    def __init__(self, fixtures: dict, profiles: dict = None, seed: int = 0):
+        self.fixtures = fixtures
+        self.profiles = {**DEFAULT_PROFILES, **(profiles or {})}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {name: {"calls": 0, "failures": 0, "sleep_sec": 0.0} for name in PROVIDERS}
+        # 고정 데이터의 마지막 봉이 현재 시각(정시)이 되도록 시간 이동 (period/start 조회가 실제처럼 동작)
+        last = max(df.index[-1] for df in fixtures["market"].values() if not df.empty)
+        self.time_shift = pd.Timestamp.now(tz="UTC").floor("h") - last
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def delay(self, provider: str, items: int = 1):
+        profile = self.profiles[provider]
+        seconds = (profile.latency + profile.per_item * items) * (1 + profile.jitter * (2 * self._random() - 1))
+        with self._lock:
+            self.stats[provider]["calls"] += 1
+            self.stats[provider]["sleep_sec"] += max(0.0, seconds)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def fails(self, provider: str) -> bool:
+        failed = self._random() < self.profiles[provider].failure_rate
+        if failed:
+            with self._lock:
+                self.stats[provider]["failures"] += 1
+        return failed
+
+    # --- yfinance ---
+
+    def _bars(self, ticker: str, period=None, start=None) -> pd.DataFrame:
+        from backend.collectors.market_data import _period_start
+
+        df = self.fixtures["market"].get(ticker)
+        if df is None or self.fails("yf"):
+            return pd.DataFrame()
+        df = df.set_axis(df.index + self.time_shift)
+        if start is not None:
+            begin = pd.Timestamp(start)
+            begin = begin.tz_localize("UTC") if begin.tzinfo is None else begin
+        else:
+            begin = _period_start(period, pd.Timestamp.now(tz="UTC")) if period else None
+        return df[df.index >= begin] if begin is not None else df
+
+    def download(self, tickers, period=None, start=None, interval="1h", group_by="column", threads=True,
+                 progress=False, **kwargs):
+        """
+        yf.download 대역: 티커 하나는 단일 프레임, 여러 개는 (티커, 필드) MultiIndex 컬럼 프레임을 반환합니다.
+        실패한 티커는 값이 모두 NaN인 컬럼으로 포함됩니다. (yfinance와 동일)
+        """
+        single = isinstance(tickers, str)
+        tickers = [tickers] if single else list(tickers)
+        # 스레드 사용 시 티커들이 threads개씩 병렬로 내려받아짐 (True이면 전부 동시에)
+        parallel = len(tickers) if threads is True else max(1, int(threads or 1))
+        self.delay("yf", items=math.ceil(len(tickers) / parallel))
+        frames = {ticker: self._bars(ticker, period, start) for ticker in tickers}
+        if single:
+            return frames[tickers[0]]
+        index = pd.DatetimeIndex([], tz="UTC", name="Datetime")
+        for df in frames.values():
+            index = index.union(df.index)
+        columns = pd.MultiIndex.from_product([tickers, ["Open", "High", "Low", "Close", "Volume"]])
+        data = pd.DataFrame(index=index, columns=columns, dtype="float64")
+        for ticker, df in frames.items():
+            if not df.empty:
+                data[ticker] = df.reindex(index).to_numpy()
+        return data
+
+    # --- Tavily ---
+
+    def search(self, query: str, **kwargs) -> dict:
+        self.delay("tavily")
+        if self.fails("tavily"):
+            raise RuntimeError(f"injected Tavily failure for '{query}'")
+        news = self.fixtures["news"]
+        results = news.get(query) or next(iter(news.values()), [])
+        return {"query": query, "results": [dict(article) for article in results]}
+
+    # --- Gemini ---
+
+    def generate(self, model_name: str, prompt: str, stream: bool = False):
+        text = self.fixtures["report"]
+        chunks = [text[i:i + 200] for i in range(0, len(text), 200)]
+        if self.fails("genai"):
+            self.delay("genai", items=0)
+            raise RuntimeError(f"injected Gemini failure ({model_name})")
+        if not stream:
+            self.delay("genai", items=len(chunks))
+            return _FakeResponse(text)
+
+        def iterate():
+            self.delay("genai", items=0)
+            for chunk in chunks:
+                time.sleep(self.profiles["genai"].per_item)
+                yield _FakeResponse(chunk)
+        return iterate()
+
+class _FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeTavilyClient:
+    backend = None
+
+    def __init__(self, api_key: str = None, **kwargs):
+        self.api_key = api_key
+
+    def search(self, query: str, **kwargs) -> dict:
+        return self.backend.search(query, **kwargs)
+
+class FakeGenerativeModel:
+    backend = None
+
+    def __init__(self, model_name: str, **kwargs):
+        self.model_name = model_name
+
+    def generate_content(self, contents, stream: bool = False, **kwargs):
+        return self.backend.generate(self.model_name, str(contents), stream=stream)
+
+def reset_news_client():
+    """
+    news_data 모듈의 공유 Tavily 클라이언트와 검색 결과 캐시를 초기화합니다.
+    """
+    from backend.collectors import news_data
+
+    with news_data._client_lock:
+        news_data._client = None
+    with news_data._cache_lock:
+        news_data._cache.clear()
+
+@contextlib.contextmanager
+def install_fakes(backend: FakeBackend):
+    """
+    yf.download, TavilyClient, genai.GenerativeModel/configure를 대역으로 교체합니다.
+    """
+    import google.generativeai as genai
+    import tavily
+    import yfinance as yf
+    from backend.collectors import news_data
+
+    FakeTavilyClient.backend = backend
+    FakeGenerativeModel.backend = backend
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch.object(yf, "download", backend.download))
+        stack.enter_context(mock.patch.object(tavily, "TavilyClient", FakeTavilyClient))
+        stack.enter_context(mock.patch.object(news_data, "TAVILY_API_KEY", "benchmark"))
+        stack.enter_context(mock.patch.object(genai, "GenerativeModel", FakeGenerativeModel))
+        stack.enter_context(mock.patch.object(genai, "configure", lambda **kwargs: None))
+        reset_news_client()
+        try:
+            yield backend
+        finally:
+            reset_news_client()
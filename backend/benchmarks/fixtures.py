@@ -0,0 +1,176 @@
+"""
+벤치마크용 고정 입력 데이터(시장 봉, 뉴스 검색 결과, 리포트 본문)를 관리하는 모듈입니다.
+기본 데이터는 backend/benchmarks/recorded/ 에 저장되어 있으며, 실행 간 결과를 비교할 수 있도록 항상 같은 입력을 사용합니다.
+
+- 합성 데이터 재생성: python -m backend.benchmarks.fixtures --synthetic
+- 실제 API 응답 녹화: python -m backend.benchmarks.fixtures --record (TAVILY_API_KEY, 네트워크 필요)
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from backend.collectors.market_data import COLUMNAR_KEYS, SYMBOLS
+from backend.collectors.news_data import DEFAULT_NEWS_QUERIES
+from backend.storage.bar_store import to_epoch_seconds
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recorded")
+MARKET_FILE = "market.json"
+NEWS_FILE = "news.json"
+REPORT_FILE = "report.md"
+
+# 합성 데이터 기본값 (14일치 1시간 봉)
+SYNTHETIC_DAYS = 14
+SYNTHETIC_SEED = 20240101
+
+# 티커별 (시작 가격, 시간당 변동성, 24시간 거래 여부)
+_SYNTHETIC_ASSETS = {
+    "SLV": (27.0, 0.004, False),
+    "GC=F": (2350.0, 0.002, True),
+    "BTC-USD": (64000.0, 0.006, True),
+    "DX-Y.NYB": (104.5, 0.0008, False),
+}
+
+def _path(name, fixture_dir=None):
+    return os.path.join(fixture_dir or FIXTURE_DIR, name)
+
+def frame_to_fixture(df):
+    """
+    OHLCV DataFrame을 컬럼형 구조({"t", "o", "h", "l", "c", "v"})로 변환합니다.
+    """
+    data = {"t": to_epoch_seconds(pd.DatetimeIndex(df.index)).tolist()}
+    for key, col in COLUMNAR_KEYS.items():
+        data[key] = [None if pd.isna(v) else round(float(v), 6) for v in df[col]]
+    return data
+
+def fixture_to_frame(data):
+    """
+    컬럼형 구조를 yfinance 형식(UTC DatetimeIndex 'Datetime')의 OHLCV DataFrame으로 변환합니다.
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(data["t"], unit="s", utc=True), name="Datetime")
+    return pd.DataFrame(
+        {col: np.asarray(data[key], dtype="float64") for key, col in COLUMNAR_KEYS.items()}, index=index
+    )
+
+def synthetic_market(days=SYNTHETIC_DAYS, seed=SYNTHETIC_SEED):
+    """
+    기하 브라운 운동으로 티커별 1시간 봉을 생성합니다. 24시간 거래가 아닌 자산은 평일 14~21시(UTC)만 포함합니다.
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp("2024-01-15", tz="UTC")
+    hours = pd.date_range(end - pd.Timedelta(days=days), end, freq="1h", inclusive="left", name="Datetime")
+    frames = {}
+    for ticker, (price, vol, all_day) in _SYNTHETIC_ASSETS.items():
+        index = hours if all_day else hours[(hours.dayofweek < 5) & (hours.hour >= 14) & (hours.hour <= 21)]
+        close = price * np.exp(np.cumsum(rng.normal(0, vol, len(index))))
+        open_ = np.concatenate([[price], close[:-1]])
+        spread = np.abs(rng.normal(0, vol, len(index))) * close
+        frames[ticker] = pd.DataFrame({
+            "Open": open_,
+            "High": np.maximum(open_, close) + spread,
+            "Low": np.minimum(open_, close) - spread,
+            "Close": close,
+            "Volume": rng.integers(1_000, 100_000, len(index)).astype("float64"),
+        }, index=index)
+    return frames
+
+def synthetic_news(seed=SYNTHETIC_SEED, per_query=8):
+    """
+    검색어별 뉴스 검색 결과를 생성합니다. 일부 기사는 여러 검색어에 중복되거나 다른 매체에 재배포된 형태로 포함됩니다.
+    """
+    rng = np.random.default_rng(seed)
+    topics = ["silver demand", "gold reserves", "rate cut odds", "dollar strength", "ETF flows", "solar panel demand"]
+    results = {}
+    shared = []
+    for q_index, query in enumerate(DEFAULT_NEWS_QUERIES):
+        articles = []
+        for i in range(per_query):
+            topic = topics[(q_index + i) % len(topics)]
+            body = " ".join(
+                f"Analysts said {topic} remained in focus as markets weighed the outlook for metals and the dollar."
+                for _ in range(int(rng.integers(3, 8)))
+            )
+            articles.append({
+                "title": f"{query.split()[0]} update: {topic} ({q_index}-{i})",
+                "url": f"https://news{i % 5}.example.com/{q_index}/{i}",
+                "content": f"{body} Story {q_index}-{i}.",
+                "score": round(float(rng.random()), 4),
+                "published_date": f"Mon, 15 Jan 2024 {i:02d}:00:00 GMT",
+            })
+        # 재배포본 1건 + 이전 검색어 결과와 겹치는 기사
+        articles.append({**articles[0], "url": f"https://syndicate.example.net/{q_index}", "content": f"(Reuters) {articles[0]['content']}"})
+        articles.extend(shared[-2:])
+        shared.extend(articles[:2])
+        results[query] = articles
+    return results
+
+SYNTHETIC_REPORT = """# 📊 리포트: 벤치마크용 고정 응답
+## 1. 핵심 포인트
+- 은 가격은 산업 수요와 금리 전망 사이에서 등락을 반복하고 있습니다.
+- 달러 인덱스의 움직임이 귀금속 가격에 영향을 주고 있습니다.
+## 2. 상세 분석
+{body}
+## 3. 결론
+벤치마크 실행을 위한 고정된 응답입니다.
+""".format(body="\n".join(f"- 분석 항목 {i}: 가격, 거래량, 변동성 지표를 종합하면 추세는 제한적인 범위에 머물러 있습니다." for i in range(40)))
+
+def write_fixtures(frames, news, report, fixture_dir=None):
+    fixture_dir = fixture_dir or FIXTURE_DIR
+    os.makedirs(fixture_dir, exist_ok=True)
+    market = {"interval": "1h", "tickers": {ticker: frame_to_fixture(df) for ticker, df in frames.items()}}
+    with open(_path(MARKET_FILE, fixture_dir), "w", encoding="utf-8") as f:
+        json.dump(market, f, separators=(",", ":"))
+    with open(_path(NEWS_FILE, fixture_dir), "w", encoding="utf-8") as f:
+        json.dump(news, f, ensure_ascii=False, indent=1)
+    with open(_path(REPORT_FILE, fixture_dir), "w", encoding="utf-8") as f:
+        f.write(report)
+
+def record_fixtures(days=SYNTHETIC_DAYS, fixture_dir=None):
+    """
+    실제 yfinance/Tavily 응답을 녹화하여 고정 데이터로 저장합니다. (리포트 본문은 합성 데이터 사용)
+    """
+    import yfinance as yf
+    from backend.collectors.news_data import get_tavily_client
+    from backend.collectors.market_data import _normalize_frame
+
+    tickers = list(SYMBOLS.values())
+    raw = yf.download(tickers, period=f"{days}d", interval="1h", group_by="ticker", threads=True, progress=False)
+    frames = {ticker: _normalize_frame(raw[ticker]).dropna(subset=["Close"]) for ticker in tickers}
+    client = get_tavily_client()
+    news = {
+        query: client.search(query, search_depth="advanced", topic="news", days=1).get("results", [])
+        for query in DEFAULT_NEWS_QUERIES
+    }
+    write_fixtures(frames, news, SYNTHETIC_REPORT, fixture_dir)
+
+def load_fixtures(fixture_dir=None):
+    """
+    고정 데이터를 읽어 {"market": {티커: DataFrame}, "news": {검색어: [기사]}, "report": str}로 반환합니다.
+    """
+    with open(_path(MARKET_FILE, fixture_dir), "r", encoding="utf-8") as f:
+        market = json.load(f)
+    with open(_path(NEWS_FILE, fixture_dir), "r", encoding="utf-8") as f:
+        news = json.load(f)
+    with open(_path(REPORT_FILE, fixture_dir), "r", encoding="utf-8") as f:
+        report = f.read()
+    return {
+        "market": {ticker: fixture_to_frame(data) for ticker, data in market["tickers"].items()},
+        "news": news,
+        "report": report,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크 고정 데이터 생성/녹화")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--synthetic", action="store_true", help="시드 고정 합성 데이터로 재생성")
+    mode.add_argument("--record", action="store_true", help="실제 yfinance/Tavily 응답 녹화")
+    parser.add_argument("--days", type=int, default=SYNTHETIC_DAYS)
+    parser.add_argument("--dir", default=FIXTURE_DIR)
+    args = parser.parse_args()
+    if args.record:
+        record_fixtures(days=args.days, fixture_dir=args.dir)
+    else:
+        write_fixtures(synthetic_market(days=args.days), synthetic_news(), SYNTHETIC_REPORT, args.dir)
+    print(f"Fixtures written to {args.dir}")
@@ -0,0 +1,44 @@
+"""
+시장 데이터 수집 방식(순차 vs 일괄)의 소요 시간을 비교하는 벤치마크 스크립트입니다.
+실제 Yahoo Finance에 요청하므로 네트워크 연결이 필요합니다.
+
+실행: python -m backend.benchmarks.market_download --rounds 3
+"""
+import argparse
+import statistics
+import time
+
+from backend.collectors.market_data import collect_market_frames
+
+def _time_once(batched, period, interval):
+    start = time.perf_counter()
+    frames = collect_market_frames(period=period, interval=interval, batched=batched)
+    elapsed = time.perf_counter() - start
+    rows = sum(len(df) for df in frames.values())
+    return elapsed, rows
+
+def run(rounds=3, period="7d", interval="1h"):
+    """
+    두 방식을 번갈아 실행하여 (캐시/네트워크 편차를 줄이기 위해) 소요 시간을 측정합니다.
+    """
+    results = {"sequential": [], "batched": []}
+    for _ in range(rounds):
+        for mode in ("sequential", "batched"):
+            elapsed, rows = _time_once(mode == "batched", period, interval)
+            results[mode].append(elapsed)
+            print(f"{mode:>10}: {elapsed:.3f}s ({rows} rows)")
+
+    print("-" * 40)
+    for mode, timings in results.items():
+        print(f"{mode:>10}: median {statistics.median(timings):.3f}s, min {min(timings):.3f}s")
+    speedup = statistics.median(results["sequential"]) / statistics.median(results["batched"])
+    print(f"speedup (sequential / batched): {speedup:.2f}x")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="collect_market_data 순차/일괄 다운로드 비교")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--period", default="7d")
+    parser.add_argument("--interval", default="1h")
+    args = parser.parse_args()
+    run(rounds=args.rounds, period=args.period, interval=args.interval)
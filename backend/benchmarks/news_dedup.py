@@ -0,0 +1,86 @@
+"""
+뉴스 중복 제거(URL 중복 + simhash 기반 재배포 기사 제거)로 줄어드는 데이터 양을 측정하는 벤치마크 스크립트입니다.
+기본값은 재배포/검색어 간 중복을 포함한 합성 기사 세트를 사용하며, --live를 주면 Tavily에서 실제로 수집합니다.
+
+실행: python -m backend.benchmarks.news_dedup [--live]
+"""
+import argparse
+import json
+import random
+import time
+
+from backend.collectors import news_data
+from backend.collectors.news_data import DEFAULT_NEWS_QUERIES, dedupe_articles
+
+VOCAB = (
+    "silver gold price ounce fed rate inflation dollar demand supply solar industrial mine output "
+    "etf inflow outflow yield treasury central bank rally slump futures comex traders hedge risk "
+    "market week month record high low support resistance analyst forecast china india jewelry"
+).split()
+
+def synthetic_articles(stories=40, copies=3, queries=4, seed=7):
+    """
+    기사 세트를 생성합니다.
+    - 각 원본 기사는 다른 매체에 문구가 조금 바뀐 재배포본(copies개)을 가짐
+    - 여러 검색어 결과에 같은 기사(같은 URL)가 다시 등장함
+    """
+    rng = random.Random(seed)
+    originals = []
+    for i in range(stories):
+        words = [rng.choice(VOCAB) for _ in range(200)]
+        originals.append({
+            "title": " ".join(words[:8]).title(),
+            "url": f"https://news{i % 7}.example.com/story/{i}",
+            "content": " ".join(words),
+            "score": round(rng.random(), 3),
+            "published_date": "Mon, 01 Jan 2024 10:00:00 GMT",
+        })
+
+    articles = []
+    for i, article in enumerate(originals):
+        articles.append(article)
+        for c in range(copies):
+            words = article["content"].split()
+            # 재배포 시 앞부분에 출처 문구 추가 + 일부 단어 변경
+            words[rng.randrange(len(words))] = rng.choice(VOCAB)
+            articles.append({
+                **article,
+                "url": f"https://syndicate{c}.example.net/{i}-{c}",
+                "content": f"({['Reuters', 'AP', 'Bloomberg'][c % 3]}) " + " ".join(words),
+            })
+
+    # 검색어별 결과: 전체 기사 중 일부가 여러 검색어에 중복 등장
+    batches = [rng.sample(articles, k=len(articles) // 2) for _ in range(queries)]
+    return [article for batch in batches for article in batch]
+
+def _payload_size(articles):
+    return len(json.dumps(articles, ensure_ascii=False).encode("utf-8"))
+
+def run(articles):
+    started = time.perf_counter()
+    url_unique = dedupe_articles(articles, max_distance=-1)
+    url_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    unique = dedupe_articles(articles)
+    full_elapsed = time.perf_counter() - started
+
+    before = _payload_size(articles)
+    rows = [
+        ("raw", len(articles), before, 0.0),
+        ("url dedupe", len(url_unique), _payload_size(url_unique), url_elapsed),
+        ("url + simhash", len(unique), _payload_size(unique), full_elapsed),
+    ]
+    print(f"{'stage':>14} | {'articles':>8} | {'bytes':>9} | {'removed':>7} | {'time':>8}")
+    for stage, count, size, elapsed in rows:
+        print(f"{stage:>14} | {count:>8} | {size:>9} | {1 - size / before:>6.1%} | {elapsed * 1000:>6.1f}ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="뉴스 중복 제거 효과 측정")
+    parser.add_argument("--live", action="store_true", help="Tavily에서 실제 뉴스를 수집하여 측정")
+    args = parser.parse_args()
+    if args.live:
+        articles = news_data.collect_news_data(queries=DEFAULT_NEWS_QUERIES, dedupe=False)
+    else:
+        articles = synthetic_articles()
+    run(articles)
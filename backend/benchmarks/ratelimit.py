@@ -0,0 +1,113 @@
+"""
+공유 속도 제한기(RATE_LIMIT_BACKEND)가 여러 워커 프로세스의 호출을 한도 안으로 묶는지 측정하는 벤치마크입니다.
+- 워커 프로세스 N개가 같은 이름의 제한기에서 동시에 토큰을 받아가며, 전체 처리율을 설정한 분당 한도와 비교합니다.
+  (memory 백엔드는 프로세스마다 한도를 따로 계산하므로 처리율이 워커 수만큼 늘어남)
+- 한도 초과(429) 오류를 몇 번 낸 뒤 성공하는 호출로 재시도/백오프 동작과 소요 시간을 확인합니다.
+
+실행: python -m backend.benchmarks.ratelimit [--workers 4] [--requests 30] [--rpm 600] [--burst 5]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from backend import ratelimit
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_DIR = os.path.join(os.getenv("DATA_DIR", os.path.join(_PROJECT_ROOT, "data")), "benchmarks")
+
+class QuotaError(Exception):
+    status_code = 429
+
+def _worker(backend: str, path: str, rpm: float, burst: float, requests: int, start_at: float, results):
+    ratelimit.RATE_LIMIT_BACKEND = backend
+    ratelimit.RATE_LIMIT_STATE_PATH = path
+    limiter = ratelimit.get_rate_limiter("bench", rpm, burst)
+    time.sleep(max(0.0, start_at - time.time()))
+    waited = sum(limiter.acquire() for _ in range(requests))
+    results.put({"finished": time.time(), "waited_sec": waited})
+
+def bench_shared(backend: str, workers: int, requests: int, rpm: float, burst: float) -> dict:
+    path = os.path.join(tempfile.mkdtemp(prefix="silver-ratelimit-"), "ratelimit.sqlite3")
+    results = multiprocessing.Queue()
+    start_at = time.time() + 1.0
+    processes = [
+        multiprocessing.Process(target=_worker, args=(backend, path, rpm, burst, requests, start_at, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    finished = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = max(item["finished"] for item in finished) - start_at
+    total = workers * requests
+    return {
+        "requests": total,
+        "elapsed_sec": elapsed,
+        "achieved_rpm": total / elapsed * 60 if elapsed > 0 else None,
+        # 버스트 이후 남은 요청을 한도대로 처리할 때의 최소 소요 시간
+        "expected_min_sec": max(0.0, total - burst) / (rpm / 60.0),
+    }
+
+def bench_retry(failures: int, backoff_base: float) -> dict:
+    calls = {"count": 0}
+
+    def flaky():
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise QuotaError("429 Resource has been exhausted (e.g. check quota).")
+        return "ok"
+
+    limiter = ratelimit.ProviderLimiter(
+        "bench-retry", ratelimit.TokenBucket("bench-retry", 0), retries=failures, backoff_base=backoff_base,
+    )
+    started = time.perf_counter()
+    result = limiter.call(flaky)
+    return {"result": result, "calls": calls["count"], "elapsed_sec": time.perf_counter() - started}
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="공유 속도 제한기/재시도 벤치마크")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 요청하는 프로세스 수")
+    parser.add_argument("--requests", type=int, default=30, help="프로세스당 요청 수")
+    parser.add_argument("--rpm", type=float, default=600, help="제한기의 분당 요청 수")
+    parser.add_argument("--burst", type=float, default=5)
+    parser.add_argument("--failures", type=int, default=3, help="재시도 측정에서 성공 전 한도 초과 오류 횟수")
+    parser.add_argument("--backoff-base", type=float, default=0.2)
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본값: data/benchmarks/ratelimit-<시각>.json)")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "workers": args.workers,
+            "requests_per_worker": args.requests,
+            "rpm": args.rpm,
+            "burst": args.burst,
+        },
+        "backends": {},
+    }
+    for backend in ("memory", "sqlite"):
+        entry = results["backends"][backend] = bench_shared(backend, args.workers, args.requests, args.rpm, args.burst)
+        print(
+            f"{backend:<7} {entry['requests']:>4} requests  {entry['elapsed_sec']:6.2f}s"
+            f"  achieved {entry['achieved_rpm']:7.0f} rpm (limit {args.rpm:.0f}, min {entry['expected_min_sec']:.2f}s)"
+        )
+    results["retry"] = bench_retry(args.failures, args.backoff_base)
+    print(f"retry   {results['retry']['calls']} calls  {results['retry']['elapsed_sec']:.2f}s  -> {results['retry']['result']}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"ratelimit-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\nResults saved to {output}")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,198 @@
+"""
+서버 시작 비용을 측정하는 벤치마크입니다. 매 측정마다 새 파이썬 프로세스를 띄워 다음을 측정합니다.
+- import backend.main 소요 시간과 임포트 시점에 불러와진 무거운 의존성 목록
+- uvicorn 프로세스 실행부터 첫 요청(/, /report/latest) 응답까지의 시간 (lifespan의 스케줄러 시작 포함)
+저장소는 임시 디렉터리를 사용하며, 결과는 JSON으로 저장되고 --compare로 이전 결과와 비교할 수 있습니다.
+
+실행: python -m backend.benchmarks.startup [--runs 5] [--importtime] [--compare 이전결과.json]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_DIR = os.path.join(os.getenv("DATA_DIR", os.path.join(_PROJECT_ROOT, "data")), "benchmarks")
+
+# 임포트 시점에 불러와지면 안 되는(첫 사용 시점에 불러오는) 의존성
+HEAVY_MODULES = ("yfinance", "google.generativeai", "tavily", "youtube_transcript_api", "requests", "apscheduler", "uvicorn")
+
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import backend.main
+elapsed = time.perf_counter() - started
+print(json.dumps({"import_sec": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+def _env(data_dir: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "DATA_DIR": data_dir,
+        "BAR_STORE_PATH": os.path.join(data_dir, "bars.sqlite3"),
+        "REPORT_STORE_PATH": os.path.join(data_dir, "reports.sqlite3"),
+        "LLM_CACHE_PATH": os.path.join(data_dir, "llm_cache.sqlite3"),
+        "TRANSCRIPT_STORE_PATH": os.path.join(data_dir, "transcripts.sqlite3"),
+        "SCHEDULER_LOCK_PATH": os.path.join(data_dir, "scheduler.lock"),
+        "PYTHONPATH": os.pathsep.join(filter(None, [_PROJECT_ROOT, env.get("PYTHONPATH")])),
+    })
+    return env
+
+def _summary(values: list) -> dict:
+    return {"median": statistics.median(values), "min": min(values), "max": max(values)}
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_PROJECT_ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+def measure_import(env: dict) -> dict:
+    """
+    새 프로세스에서 backend.main 임포트 시간을 측정합니다.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE], cwd=_PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def measure_first_request(env: dict, timeout: float = 60.0) -> dict:
+    """
+    uvicorn 프로세스를 띄운 시점부터 /가 처음 응답할 때까지, 이어서 /report/latest 첫 응답까지의 시간을 측정합니다.
+    """
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=_PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited: {process.stderr.read().decode(errors='replace')[-2000:]}")
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError("server did not answer in time")
+            try:
+                with urllib.request.urlopen(f"{base_url}/", timeout=1) as response:
+                    response.read()
+                break
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        first = time.perf_counter() - started
+        with urllib.request.urlopen(f"{base_url}/report/latest", timeout=10) as response:
+            response.read()
+        latest = time.perf_counter() - started
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {"first_request_sec": first, "first_report_sec": latest}
+
+def import_profile(env: dict, top: int = 15) -> list:
+    """
+    python -X importtime 결과에서 누적 임포트 시간이 큰 모듈을 반환합니다.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        cwd=_PROJECT_ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if name != "backend.main":
+            rows.append({"module": name, "cumulative_ms": round(int(cumulative) / 1000, 1)})
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:top]
+
+def run(args) -> dict:
+    data_dir = tempfile.mkdtemp(prefix="silver-startup-")
+    try:
+        env = _env(data_dir)
+        # 첫 실행은 바이트코드 캐시 생성/디스크 캐시 적재가 섞이므로 버림
+        measure_import(env)
+        imports = [measure_import(env) for _ in range(args.runs)]
+        requests = [measure_first_request(env) for _ in range(args.runs)]
+        results = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(),
+                "git_revision": _git_revision(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "runs": args.runs,
+            },
+            "import_sec": _summary([item["import_sec"] for item in imports]),
+            "heavy_modules_at_import": imports[-1]["loaded"],
+            "first_request_sec": _summary([item["first_request_sec"] for item in requests]),
+            "first_report_sec": _summary([item["first_report_sec"] for item in requests]),
+        }
+        if args.importtime:
+            results["import_profile"] = import_profile(env, args.top)
+        return results
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+def _print_results(results: dict):
+    print()
+    for key, label in (("import_sec", "import backend.main"), ("first_request_sec", "spawn -> first GET /"),
+                       ("first_report_sec", "spawn -> first /report/latest")):
+        stats = results[key]
+        print(f"  {label:<32} median {stats['median'] * 1000:>8.1f}ms  min {stats['min'] * 1000:>8.1f}ms  max {stats['max'] * 1000:>8.1f}ms")
+    print(f"  heavy modules loaded at import: {', '.join(results['heavy_modules_at_import']) or '(none)'}")
+    for row in results.get("import_profile", []):
+        print(f"    {row['module']:<40} {row['cumulative_ms']:>8.1f}ms")
+
+def _print_comparison(current: dict, previous: dict):
+    print(f"\n[compare] {previous.get('meta', {}).get('git_revision')} -> {current['meta'].get('git_revision')}")
+    for key in ("import_sec", "first_request_sec", "first_report_sec"):
+        old = previous.get(key)
+        if old and old["median"]:
+            new = current[key]["median"]
+            print(f"  {key:<20} {old['median'] * 1000:>8.1f}ms -> {new * 1000:>8.1f}ms ({new / old['median'] - 1:+.1%})")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="서버 시작 시간(임포트, 첫 요청까지) 벤치마크")
+    parser.add_argument("--runs", type=int, default=5, help="측정 반복 횟수")
+    parser.add_argument("--importtime", action="store_true", help="누적 임포트 시간 상위 모듈 출력")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본값: data/benchmarks/startup-<시각>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    results = run(args)
+    _print_results(results)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            _print_comparison(results, json.load(f))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"startup-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\nResults saved to {output}")
+
+if __name__ == "__main__":
+    main_cli()
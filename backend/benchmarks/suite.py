@@ -0,0 +1,418 @@
+"""
+외부 API 없이 전체 파이프라인 성능을 측정하는 벤치마크 스위트입니다.
+yfinance/Tavily/Gemini를 고정 데이터 기반 대역(fakes.py)으로 교체하고, 다음을 측정합니다.
+- 정기 리포트 작업(job_generate_report)과 generate_static_data의 단계별 소요 시간
+  (수집, DataFrame 변환, 지표, 프롬프트 구성, 생성, 직렬화/저장) 및 실제 함수의 전체 소요 시간
+- /report/latest, /data/market 엔드포인트 처리량과 지연 시간 (로컬 uvicorn 서버)
+결과는 JSON으로 저장되며 --compare로 이전 결과와 비교할 수 있습니다.
+
+실행: python -m backend.benchmarks.suite [--rounds 3] [--latency genai=1.5] [--fail yf=0.2] [--compare 이전결과.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+# 저장소 경로와 API 키는 모듈 임포트 시점에 환경 변수에서 읽으므로, 백엔드 모듈보다 먼저 임시 경로/더미 키를 지정
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_DIR = os.path.join(os.getenv("DATA_DIR", os.path.join(_PROJECT_ROOT, "data")), "benchmarks")
+BENCH_DATA_DIR = tempfile.mkdtemp(prefix="silver-bench-")
+os.environ.update({
+    "DATA_DIR": BENCH_DATA_DIR,
+    "BAR_STORE_PATH": os.path.join(BENCH_DATA_DIR, "bars.sqlite3"),
+    "REPORT_STORE_PATH": os.path.join(BENCH_DATA_DIR, "reports.sqlite3"),
+    "LLM_CACHE_PATH": os.path.join(BENCH_DATA_DIR, "llm_cache.sqlite3"),
+    "TRANSCRIPT_STORE_PATH": os.path.join(BENCH_DATA_DIR, "transcripts.sqlite3"),
+    # 생성 단계를 매번 측정하도록 LLM 응답 캐시는 기본적으로 항상 만료 (BENCH_LLM_CACHE_TTL_SEC로 변경 가능)
+    "LLM_CACHE_TTL_SEC": os.getenv("BENCH_LLM_CACHE_TTL_SEC", "0"),
+    "GEMINI_API_KEY": "benchmark",
+    "TAVILY_API_KEY": "benchmark",
+    "NEWS_QUERIES": "",
+    "YOUTUBE_VIDEO_URLS": "",
+    "YOUTUBE_CHANNELS": "",
+    # 엔드포인트 측정용 서버가 정기 작업을 예약하지 않도록 함
+    "SCHEDULER_MODE": "off",
+    # 대역 제공자에는 실제 한도가 없으므로 Gemini/Tavily 속도 제한은 끔 (지연/실패는 FaultProfile로 주입)
+    "RATE_LIMIT_GEMINI_RPM": "0",
+    "RATE_LIMIT_GEMINI_TPM": "0",
+    "RATE_LIMIT_TAVILY_RPM": "0",
+})
+
+import requests
+import uvicorn
+
+from backend import main
+from backend import generate_static
+from backend.analysis import service as service_module
+from backend.analysis.indicators import IndicatorEngine, compute_indicators
+from backend.assets import core_asset_names
+from backend.benchmarks.fakes import DEFAULT_PROFILES, PROVIDERS, FakeBackend, FaultProfile, install_fakes, reset_news_client
+from backend.benchmarks.fixtures import load_fixtures
+from backend.collectors.market_data import encode_market_frames
+from backend.jobs import Job
+from backend.pipeline import collect_inputs
+from backend.static_output import write_static_output
+from backend.storage import bar_store, report_store, response_cache, transcript_store
+
+REPORT_TYPES = ("bullish", "bearish")
+
+class StageTimer:
+    """
+    단계별 소요 시간을 라운드마다 누적합니다.
+    """
+    def __init__(self):
+        self.samples = {}
+
+    @contextmanager
+    def __call__(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.setdefault(name, []).append(time.perf_counter() - started)
+
+    def summary(self) -> dict:
+        return {name: _summarize(values) for name, values in self.samples.items()}
+
+def _summarize(values: list) -> dict:
+    ordered = sorted(values)
+    return {
+        "n": len(ordered),
+        "median": round(statistics.median(ordered), 6),
+        "min": round(ordered[0], 6),
+        "max": round(ordered[-1], 6),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 6),
+    }
+
+def _reset_state(cold: bool):
+    """
+    라운드 간 상태를 초기화합니다.
+    cold=True이면 봉 저장소/리포트 저장소/지표 엔진까지 비워 첫 실행과 같은 조건을 만들고,
+    False이면 저장된 봉을 유지하여 정기 실행(증분 수집)과 같은 조건을 만듭니다.
+    """
+    reset_news_client()
+    service_module.analysis_service = None
+    response_cache.response_cache = None
+    if cold:
+        bar_store.bar_store = None
+        report_store.report_store = None
+        transcript_store.transcript_store = None
+        shutil.rmtree(BENCH_DATA_DIR, ignore_errors=True)
+        os.makedirs(BENCH_DATA_DIR, exist_ok=True)
+        main.indicator_engine = IndicatorEngine(corr_assets=core_asset_names())
+
+async def _job_stages(timer: StageTimer):
+    """
+    run_report_job과 같은 순서로 각 단계를 실행하며 단계별 시간을 측정합니다.
+    """
+    with timer("collect"):
+        inputs = await collect_inputs()
+    frames = inputs["market_frames"]
+    with timer("convert"):
+        market_data = encode_market_frames(frames, orient="records")
+        market_columns = encode_market_frames(frames, orient="columns")
+    with timer("indicators"):
+        indicators = main._compute_indicators(frames)
+    service = service_module.get_analysis_service()
+    with timer("prompt"):
+        for report_type in REPORT_TYPES:
+            service._prepare_prompt(market_data, inputs["news_data"], inputs["youtube_data"], report_type, indicators)
+    with timer("generate"):
+        reports = await service.generate_reports(
+            market_data, inputs["news_data"], inputs["youtube_data"], REPORT_TYPES, indicators=indicators
+        )
+    with timer("serialize"):
+        stored = report_store.get_report_store().add({
+            "timestamp": datetime.now().isoformat(),
+            "bullish_report": reports["bullish"],
+            "bearish_report": reports["bearish"],
+            "market_data": market_data,
+            "news_data": inputs["news_data"],
+            "market_columns": market_columns,
+            "indicators": indicators,
+        })
+        main.published.refresh(stored)
+
+async def _static_stages(timer: StageTimer, output_dir: str, orient: str):
+    """
+    generate_static_data와 같은 순서로 각 단계를 실행하며 단계별 시간을 측정합니다.
+    """
+    with timer("collect"):
+        inputs = await collect_inputs()
+    frames = inputs["market_frames"]
+    with timer("convert"):
+        market_data = encode_market_frames(frames, orient=orient)
+    with timer("indicators"):
+        indicators = compute_indicators(frames, corr_assets=core_asset_names())
+    service = service_module.AnalysisService(api_key="benchmark")
+    with timer("prompt"):
+        for report_type in REPORT_TYPES:
+            service._prepare_prompt(market_data, inputs["news_data"], inputs["youtube_data"], report_type, indicators)
+    with timer("generate"):
+        reports = await service.generate_reports(
+            market_data, inputs["news_data"], inputs["youtube_data"], REPORT_TYPES, indicators=indicators
+        )
+    with timer("serialize"):
+        write_static_output(output_dir, {
+            "timestamp": datetime.now().isoformat(),
+            "bullish_report": reports["bullish"],
+            "bearish_report": reports["bearish"],
+            "market_data": market_data,
+            "news_data": inputs["news_data"],
+            "indicators": indicators,
+        }, orient=orient)
+
+async def bench_pipelines(rounds: int, orient: str) -> dict:
+    """
+    리포트 작업과 정적 생성의 단계별 시간(cold/warm)과 실제 함수의 전체 시간을 측정합니다.
+    """
+    results = {}
+    for mode in ("cold", "warm"):
+        job_timer, static_timer, e2e = StageTimer(), StageTimer(), StageTimer()
+        _reset_state(cold=True)
+        if mode == "warm":
+            # 저장소를 한 번 채운 뒤 측정
+            await _job_stages(StageTimer())
+        for _ in range(rounds):
+            _reset_state(cold=mode == "cold")
+            await _job_stages(job_timer)
+
+            _reset_state(cold=mode == "cold")
+            with tempfile.TemporaryDirectory() as output_dir:
+                await _static_stages(static_timer, output_dir, orient)
+
+            _reset_state(cold=mode == "cold")
+            job = Job("benchmark")
+            with e2e("run_report_job"):
+                await main.run_report_job(job)
+            for stage in job.stages:
+                e2e.samples.setdefault(f"run_report_job.{stage['name']}", []).append(stage["duration_sec"])
+
+            _reset_state(cold=mode == "cold")
+            with tempfile.TemporaryDirectory() as output_dir, e2e("generate_static_data"):
+                await generate_static.generate_static_data(orient=orient, output_dir=output_dir)
+        results[mode] = {
+            "job_generate_report": job_timer.summary(),
+            "generate_static_data": static_timer.summary(),
+            "end_to_end": e2e.summary(),
+        }
+    return results
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@contextmanager
+def _serve(app):
+    """
+    로컬 uvicorn 서버를 백그라운드 스레드에서 실행합니다.
+    """
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 10
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("benchmark server did not start")
+        time.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+def _load(url: str, headers: dict, total: int, concurrency: int) -> dict:
+    """
+    total개의 요청을 concurrency개의 연결로 나눠 보내고 처리량과 지연 시간을 측정합니다.
+    """
+    per_worker = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+
+    def worker(count):
+        latencies, sizes, statuses = [], 0, {}
+        with requests.Session() as session:
+            for _ in range(count):
+                started = time.perf_counter()
+                response = session.get(url, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                # 압축 응답은 전송된 바이트 기준 (requests가 자동으로 압축 해제함)
+                sizes += int(response.headers.get("content-length", len(response.content)))
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        return latencies, sizes, statuses
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(worker, per_worker))
+    elapsed = time.perf_counter() - started
+
+    latencies = [value for result in results for value in result[0]]
+    statuses = {}
+    for result in results:
+        for status, count in result[2].items():
+            statuses[str(status)] = statuses.get(str(status), 0) + count
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "rps": round(total / elapsed, 1),
+        "latency_ms": {key: round(value * 1000, 3) if key != "n" else value for key, value in _summarize(latencies).items()},
+        "bytes_per_response": round(sum(result[1] for result in results) / max(1, total)),
+        "statuses": statuses,
+    }
+
+def bench_endpoints(total: int, concurrency: int) -> dict:
+    """
+    최신 리포트가 게시된 상태에서 /report/latest, /data/market 처리량을 측정합니다.
+    """
+    identity = {"Accept-Encoding": "identity"}
+    with _serve(main.app) as base_url:
+        etag = requests.get(f"{base_url}/report/latest", headers=identity).headers.get("etag", "")
+        scenarios = {
+            "report_latest": ("/report/latest", identity),
+            "report_latest_gzip": ("/report/latest", {"Accept-Encoding": "gzip"}),
+            "report_latest_304": ("/report/latest", {**identity, "If-None-Match": etag}),
+            "market_records": ("/data/market", identity),
+            "market_columns": ("/data/market?orient=columns", identity),
+            "market_columns_gzip": ("/data/market?orient=columns", {"Accept-Encoding": "gzip"}),
+            "market_silver_4h_500": ("/data/market?asset=Silver&timeframe=4h&max_points=500&orient=columns", identity),
+        }
+        results = {}
+        for name, (path, headers) in scenarios.items():
+            # 연결/캐시 준비
+            _load(f"{base_url}{path}", headers, total=concurrency, concurrency=concurrency)
+            results[name] = _load(f"{base_url}{path}", headers, total=total, concurrency=concurrency)
+    return results
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_PROJECT_ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+def _parse_overrides(values: list, option: str) -> dict:
+    overrides = {}
+    for value in values or []:
+        provider, _, number = value.partition("=")
+        if provider not in PROVIDERS or not number:
+            raise SystemExit(f"{option} must look like <{'|'.join(PROVIDERS)}>=<number>, got '{value}'")
+        overrides[provider] = float(number)
+    return overrides
+
+def _print_stages(results: dict):
+    for mode, groups in results.items():
+        for group, stages in groups.items():
+            print(f"\n[{mode}] {group}")
+            for name, stats in stages.items():
+                print(f"  {name:<32} median {stats['median'] * 1000:>9.1f}ms  min {stats['min'] * 1000:>9.1f}ms  max {stats['max'] * 1000:>9.1f}ms")
+
+def _print_endpoints(results: dict):
+    print("\n[endpoints]")
+    for name, stats in results.items():
+        latency = stats["latency_ms"]
+        print(f"  {name:<22} {stats['rps']:>8.1f} req/s  p50 {latency['median']:>7.2f}ms  p95 {latency['p95']:>7.2f}ms  {stats['bytes_per_response']:>8} B")
+
+def _print_comparison(current: dict, previous: dict):
+    """
+    이전 결과 대비 단계별 중앙값과 엔드포인트 처리량 변화를 출력합니다.
+    """
+    print(f"\n[compare] {previous.get('meta', {}).get('git_revision')} -> {current['meta'].get('git_revision')}")
+    for mode, groups in current.get("pipelines", {}).items():
+        for group, stages in groups.items():
+            for name, stats in stages.items():
+                old = previous.get("pipelines", {}).get(mode, {}).get(group, {}).get(name)
+                if old and old["median"]:
+                    change = stats["median"] / old["median"] - 1
+                    print(f"  {mode}/{group}/{name:<28} {old['median'] * 1000:>9.1f}ms -> {stats['median'] * 1000:>9.1f}ms ({change:+.1%})")
+    for name, stats in current.get("endpoints", {}).items():
+        old = previous.get("endpoints", {}).get(name)
+        if old and old["rps"]:
+            print(f"  endpoints/{name:<22} {old['rps']:>8.1f} -> {stats['rps']:>8.1f} req/s ({stats['rps'] / old['rps'] - 1:+.1%})")
+
+def run(args) -> dict:
+    latency = _parse_overrides(args.latency, "--latency")
+    failures = _parse_overrides(args.fail, "--fail")
+    profiles = {
+        provider: FaultProfile(
+            latency=latency.get(provider, profile.latency),
+            per_item=profile.per_item,
+            jitter=profile.jitter,
+            failure_rate=failures.get(provider, profile.failure_rate),
+        )
+        for provider, profile in DEFAULT_PROFILES.items()
+    }
+    backend = FakeBackend(load_fixtures(args.fixtures), profiles, seed=args.seed)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "rounds": args.rounds,
+            "seed": args.seed,
+            "orient": args.orient,
+            "profiles": {name: profile.to_dict() for name, profile in profiles.items()},
+        },
+    }
+    with install_fakes(backend):
+        results["pipelines"] = asyncio.run(bench_pipelines(args.rounds, args.orient))
+        if not args.skip_endpoints:
+            results["endpoints"] = bench_endpoints(args.requests, args.concurrency)
+    results["fake_calls"] = backend.stats
+    return results
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="오프라인 파이프라인/엔드포인트 벤치마크")
+    parser.add_argument("--rounds", type=int, default=3, help="모드(cold/warm)별 반복 횟수")
+    parser.add_argument("--orient", choices=["records", "columns"], default="records", help="정적 생성 시장 데이터 형식")
+    parser.add_argument("--latency", action="append", metavar="PROVIDER=SEC", help="제공자별 호출 지연 (yf/tavily/genai)")
+    parser.add_argument("--fail", action="append", metavar="PROVIDER=RATE", help="제공자별 실패 확률 (0~1)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=2000, help="엔드포인트 시나리오별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--skip-endpoints", action="store_true")
+    parser.add_argument("--fixtures", default=None, help="고정 데이터 디렉터리 (기본값: backend/benchmarks/recorded)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본값: data/benchmarks/suite-<시각>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--verbose", action="store_true", help="백엔드 로그 출력")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    try:
+        results = run(args)
+    finally:
+        main.scheduler.shutdown()
+        shutil.rmtree(BENCH_DATA_DIR, ignore_errors=True)
+
+    _print_stages(results["pipelines"])
+    if "endpoints" in results:
+        _print_endpoints(results["endpoints"])
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            _print_comparison(results, json.load(f))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"suite-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\nResults saved to {output}")
+
+if __name__ == "__main__":
+    main_cli()
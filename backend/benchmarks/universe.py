@@ -0,0 +1,170 @@
+"""
+수집 대상 자산 수에 따른 시장 데이터 단계의 확장성을 측정하는 벤치마크입니다.
+yf.download를 대역(fakes.py)으로 교체하고 자산 수를 4개에서 500개까지 늘려가며 다음을 측정합니다.
+- 수집(cold: 빈 봉 저장소에서 전체 구간, warm: 마지막 봉 이후만), 인코딩(records/columns), 지표 계산의 소요 시간
+- 단계 전체의 최대 메모리 사용량 (tracemalloc, 별도 실행) 및 응답 크기
+청크 크기/동시 요청 수/속도 제한은 옵션으로 바꿔가며 비교할 수 있습니다.
+
+실행: python -m backend.benchmarks.universe [--sizes 4,50,100,250,500] [--rpm 1200] [--chunk-size 50]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from backend import ratelimit
+from backend.analysis.indicators import IndicatorEngine
+from backend.benchmarks.fakes import FakeBackend, FaultProfile, install_fakes
+from backend.benchmarks.fixtures import load_fixtures
+from backend.collectors import market_data
+from backend.serialized import dumps
+from backend.storage.bar_store import BarStore
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_DIR = os.path.join(os.getenv("DATA_DIR", os.path.join(_PROJECT_ROOT, "data")), "benchmarks")
+DEFAULT_SIZES = (4, 50, 100, 250, 500)
+SEED = 7
+
+def _synthetic_frames(base: dict, count: int, seed: int = SEED) -> dict:
+    """
+    기본 고정 데이터(4개 자산)를 앞에 두고, 나머지는 기본 자산의 타임스탬프를 번갈아 사용하는 합성 티커(SYN0004...)로 채웁니다.
+    """
+    rng = np.random.default_rng(seed)
+    frames = dict(list(base.items())[:count])
+    templates = list(base.values())
+    for i in range(len(frames), count):
+        index = templates[i % len(templates)].index
+        close = rng.uniform(5, 500) * np.exp(np.cumsum(rng.normal(0, 0.004, len(index))))
+        open_ = np.concatenate([[close[0]], close[:-1]])
+        spread = np.abs(rng.normal(0, 0.003, len(index))) * close
+        frames[f"SYN{i:04d}"] = pd.DataFrame({
+            "Open": open_, "High": np.maximum(open_, close) + spread, "Low": np.minimum(open_, close) - spread,
+            "Close": close, "Volume": rng.integers(1_000, 100_000, len(index)).astype("float64"),
+        }, index=index)
+    return frames
+
+def _symbols(frames: dict) -> dict:
+    # 자산 이름 = 티커 (기본 4개 자산은 기존 이름 유지)
+    names = {ticker: name for name, ticker in market_data.SYMBOLS.items()}
+    return {names.get(ticker, ticker): ticker for ticker in frames}
+
+def _run_stages(symbols: dict, store_path: str, core: list, timings: dict = None) -> dict:
+    """
+    cold 수집 → warm 수집 → 인코딩 → 지표 계산을 실행합니다. timings가 주어지면 단계별 시간을 기록합니다.
+    """
+    def timed(name, func):
+        started = time.perf_counter()
+        result = func()
+        if timings is not None:
+            timings[name] = time.perf_counter() - started
+        return result
+
+    ratelimit._limiters.clear()
+    ratelimit._providers.clear()
+    store = BarStore(store_path)
+    timed("collect_cold", lambda: market_data.collect_market_frames(symbols=symbols, store=store))
+    frames = timed("collect_warm", lambda: market_data.collect_market_frames(symbols=symbols, store=store))
+    records = timed("encode_records", lambda: dumps(market_data.encode_market_frames(frames, orient="records")))
+    columns = timed("encode_columns", lambda: dumps(market_data.encode_market_frames(frames, orient="columns")))
+    timed("indicators", lambda: IndicatorEngine(corr_assets=core).update(frames))
+    return {
+        "assets_with_data": sum(1 for df in frames.values() if not df.empty),
+        "bars": sum(len(df) for df in frames.values()),
+        "records_bytes": len(records),
+        "columns_bytes": len(columns),
+    }
+
+def run(args) -> dict:
+    base = load_fixtures(args.fixtures)["market"]
+    sizes = [int(size) for size in args.sizes.split(",")]
+    all_frames = _synthetic_frames(base, max(sizes))
+    backend = FakeBackend(
+        {"market": all_frames, "news": {}, "report": ""},
+        {"yf": FaultProfile(latency=args.latency, per_item=args.per_item, failure_rate=args.fail)},
+    )
+    market_data.MARKET_CHUNK_SIZE = args.chunk_size
+    market_data.MARKET_MAX_CONCURRENCY = args.concurrency
+    market_data.MARKET_REQUESTS_PER_MIN = args.rpm
+    market_data.MARKET_RATE_BURST = args.burst
+    # 실행 간/크기 간에 버킷 상태가 이어지지 않도록 프로세스 내부 제한기 사용
+    ratelimit.RATE_LIMIT_BACKEND = "memory"
+    core = list(market_data.SYMBOLS)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "chunk_size": args.chunk_size,
+            "concurrency": args.concurrency,
+            "rpm": args.rpm,
+            "burst": args.burst,
+            "yf_profile": backend.profiles["yf"].to_dict(),
+        },
+        "sizes": {},
+    }
+    work_dir = tempfile.mkdtemp(prefix="silver-universe-")
+    try:
+        with install_fakes(backend):
+            for size in sizes:
+                symbols = _symbols(dict(list(all_frames.items())[:size]))
+                calls_before = backend.stats["yf"]["calls"]
+                timings = {}
+                started = time.perf_counter()
+                summary = _run_stages(symbols, os.path.join(work_dir, f"bars-{size}-time.sqlite3"), core, timings)
+                wall = time.perf_counter() - started
+                calls = backend.stats["yf"]["calls"] - calls_before
+                entry = {"wall_sec": wall, "stages_sec": timings, "download_calls": calls, **summary}
+                if not args.no_memory:
+                    tracemalloc.start()
+                    _run_stages(symbols, os.path.join(work_dir, f"bars-{size}-mem.sqlite3"), core)
+                    entry["peak_memory_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+                    tracemalloc.stop()
+                results["sizes"][size] = entry
+                _print_size(size, entry)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+def _print_size(size: int, entry: dict):
+    stages = "  ".join(f"{name} {seconds * 1000:7.0f}ms" for name, seconds in entry["stages_sec"].items())
+    memory = f"  peak {entry['peak_memory_mb']:7.1f}MB" if "peak_memory_mb" in entry else ""
+    print(
+        f"{size:>4} assets  wall {entry['wall_sec']:6.2f}s{memory}  calls {entry['download_calls']:>4}"
+        f"  bars {entry['bars']:>7}  columns {entry['columns_bytes'] / 1e6:6.2f}MB\n      {stages}"
+    )
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="자산 수(4→500)에 따른 시장 데이터 수집/인코딩/지표 벤치마크")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="쉼표 구분 자산 수 목록")
+    parser.add_argument("--chunk-size", type=int, default=market_data.MARKET_CHUNK_SIZE)
+    parser.add_argument("--concurrency", type=int, default=market_data.MARKET_MAX_CONCURRENCY, help="다운로드 동시 요청 수")
+    parser.add_argument("--rpm", type=float, default=market_data.MARKET_REQUESTS_PER_MIN, help="분당 요청 수 제한 (0이면 없음)")
+    parser.add_argument("--burst", type=float, default=market_data.MARKET_RATE_BURST)
+    parser.add_argument("--latency", type=float, default=0.25, help="다운로드 호출당 지연 (초)")
+    parser.add_argument("--per-item", type=float, default=0.05, help="동시 요청 한 묶음당 추가 지연 (초)")
+    parser.add_argument("--fail", type=float, default=0.0, help="호출(티커)당 실패 확률")
+    parser.add_argument("--no-memory", action="store_true", help="메모리 측정(tracemalloc) 생략")
+    parser.add_argument("--fixtures", default=None)
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본값: data/benchmarks/universe-<시각>.json)")
+    args = parser.parse_args()
+
+    results = run(args)
+    output = args.output or os.path.join(RESULTS_DIR, f"universe-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\nResults saved to {output}")
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,51 +1,298 @@
-import yfinance as yf
+import os
+import threading
+
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
-def collect_market_data(period="7d", interval="1h"):
+from ..assets import asset_symbols
+from ..ratelimit import get_provider_limiter
+from ..storage.bar_store import get_bar_store, to_epoch_seconds
+
+# 수집 대상 자산 (표시 이름 -> 야후 파이낸스 티커, backend/config/assets.json 또는 ASSET_CONFIG_PATH)
+SYMBOLS = asset_symbols()
+
+# 일괄 다운로드 한 번에 요청할 티커 수 / 다운로드 중 동시에 요청하는 티커 수
+MARKET_CHUNK_SIZE = int(os.getenv("MARKET_CHUNK_SIZE", "50"))
+MARKET_MAX_CONCURRENCY = int(os.getenv("MARKET_MAX_CONCURRENCY", "8"))
+# 증분 다운로드 묶음 하나에 넣을 티커들의 마지막 저장 시각 차이 상한 (시간, 넘으면 새 묶음으로 분리)
+MARKET_DELTA_MAX_GAP = pd.Timedelta(hours=float(os.getenv("MARKET_DELTA_MAX_GAP_HOURS", "24")))
+# 야후 파이낸스 요청 속도 제한 (티커당 1회로 계산, 0이면 제한 없음, 재시도는 RATE_LIMIT_YF_RETRIES)
+MARKET_REQUESTS_PER_MIN = float(os.getenv("MARKET_REQUESTS_PER_MIN", "1200"))
+MARKET_RATE_BURST = float(os.getenv("MARKET_RATE_BURST", "200"))
+
+# 오래된 yfinance는 download() 결과를 모듈 전역 상태에 모으므로 호출을 겹치지 않고,
+# 동시성은 각 호출의 threads 인자(티커별 스레드 수)로 제한함
+_download_lock = threading.Lock()
+
+# 컬럼형(columns) 인코딩에서 사용하는 축약 키 -> OHLCV 컬럼
+COLUMNAR_KEYS = {"o": "Open", "h": "High", "l": "Low", "c": "Close", "v": "Volume"}
+
+def _yf():
     """
-    은(Silver), 금(Gold), 비트코인(Bitcoin)의 시장 데이터를 수집합니다.
+    yfinance 모듈을 반환합니다. 임포트 비용이 커서(약 0.5초) 첫 다운로드 시점에 불러옵니다.
     """
-    symbols = {
-        "Silver": "SLV",
-        "Gold": "GC=F",
-        "Bitcoin": "BTC-USD",
-        "USD_Index": "DX-Y.NYB" # 거시 경제지표: 달러 인덱스
-    }
-    
-    data = {}
+    import yfinance
+
+    return yfinance
+
+def _locked_download(tickers, **kwargs):
+    with _download_lock:
+        return _yf().download(tickers, progress=False, **kwargs)
+
+def _yf_download(tickers, **kwargs):
+    """
+    속도 제한(티커 수만큼 토큰 사용)을 적용하여 yf.download를 호출합니다.
+    한도 초과(YFRateLimitError 등)/일시적 오류로 예외가 나면 지터가 있는 지수 백오프로 다시 시도합니다.
+    """
+    count = 1 if isinstance(tickers, str) else len(tickers)
+    limiter = get_provider_limiter("yf", rpm=MARKET_REQUESTS_PER_MIN, burst=MARKET_RATE_BURST)
+    return limiter.call(_locked_download, tickers, requests=count, **kwargs)
+
+def _chunks(items: list, size: int) -> list:
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _delta_groups(delta: list, size: int, max_gap=MARKET_DELTA_MAX_GAP) -> list:
+    """
+    (name, ticker, last_ts) 목록을 마지막 저장 시각 순으로 정렬해 증분 다운로드 묶음으로 나눕니다.
+    묶음은 최대 size개이며, 묶음의 가장 오래된 시각보다 max_gap 넘게 늦은 티커는 새 묶음에서 시작합니다.
+    (묶음마다 가장 오래된 시각부터 받으므로, 오래 멈춘 티커가 다른 티커의 다운로드 구간을 max_gap 넘게 넓히지 않음)
+    """
+    size = max(1, size)
+    groups = []
+    for item in sorted(delta, key=lambda item: item[2]):
+        if groups and len(groups[-1]) < size and item[2] - groups[-1][0][2] <= max_gap:
+            groups[-1].append(item)
+        else:
+            groups.append([item])
+    return groups
+
+def _normalize_frame(df):
+    """
+    yfinance 결과를 단일 티커용 OHLCV 프레임으로 정리합니다.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame()
+    # yfinance 최신 버전에서 MultiIndex 컬럼이 반환될 수 있음 -> 평탄화
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    # 일괄 다운로드 시 다른 자산의 거래 시간에 맞춰 전부 NaN인 행이 생김 -> 제거
+    return df.dropna(how="all")
+
+def _download_single(ticker, **kwargs):
+    """
+    티커 하나를 개별적으로 다운로드합니다.
+    """
+    df = _yf_download(ticker, **kwargs)
+    return _normalize_frame(df)
+
+def _download_sequential(symbols, **kwargs):
+    """
+    티커마다 yf.download를 순차 호출합니다. (일괄 다운로드 비교용 / 폴백용)
+    """
+    frames = {}
     for name, ticker in symbols.items():
         try:
-            # 최적화: 가능하다면 한 번에 가져오는 것이 좋지만, 에러 처리를 위해 개별적으로 가져오는 것이 안전함
-            df = yf.download(ticker, period=period, interval=interval, progress=False)
-            if not df.empty:
-                # yfinance 최신 버전에서 MultiIndex 컬럼이 반환될 수 있음 -> 평탄화
-                if isinstance(df.columns, pd.MultiIndex):
-                    df.columns = df.columns.get_level_values(0)
-
-                # 딕셔너리 리스트 또는 JSON 직렬화 가능한 형식으로 저장
-                # 인덱스를 리셋하여 'Date'를 컬럼으로 만듦
-                df.reset_index(inplace=True)
-                
-                # 타임스탬프를 문자열로 변환
-                # 컬럼 이름이 Date 또는 Datetime인지 확인
-                date_col = 'Datetime' if 'Datetime' in df.columns else 'Date'
-                if date_col in df.columns:
-                    df[date_col] = df[date_col].astype(str)
-                
-                # NaN 값을 None으로 변환 (JSON 표준 호환을 위해)
-                df = df.where(pd.notnull(df), None)
-
-                data[name] = df.to_dict(orient='records')
-            else:
-                print(f"Warning: No data found for {name}")
-                data[name] = []
+            frames[name] = _download_single(ticker, **kwargs)
         except Exception as e:
             print(f"Error fetching {name}: {e}")
-            data[name] = []
-            
+            frames[name] = pd.DataFrame()
+    return frames
+
+def _download_batched(symbols, **kwargs):
+    """
+    티커들을 한 번의 스레드 기반 yf.download 호출(최대 MARKET_MAX_CONCURRENCY개 동시 요청)로 가져온 뒤 자산별로 분리합니다.
+    비어 있거나 실패한 티커만 개별적으로 재시도합니다.
+    """
+    tickers = list(symbols.values())
+    try:
+        raw = _yf_download(tickers, group_by="ticker", threads=min(len(tickers), MARKET_MAX_CONCURRENCY), **kwargs)
+    except Exception as e:
+        print(f"Error in batched download, falling back to per-ticker: {e}")
+        raw = pd.DataFrame()
+
+    frames = {}
+    retry = {}
+    for name, ticker in symbols.items():
+        df = pd.DataFrame()
+        if not raw.empty:
+            if isinstance(raw.columns, pd.MultiIndex):
+                if ticker in raw.columns.get_level_values(0):
+                    df = _normalize_frame(raw[ticker])
+            elif len(tickers) == 1:
+                df = _normalize_frame(raw)
+        if df.empty:
+            retry[name] = ticker
+        else:
+            frames[name] = df
+
+    if retry:
+        print(f"Retrying individually: {', '.join(retry)}")
+        frames.update(_download_sequential(retry, **kwargs))
+
+    # 원래 자산 순서 유지
+    return {name: frames.get(name, pd.DataFrame()) for name in symbols}
+
+def _frame_to_records(df):
+    """
+    OHLCV 프레임을 JSON 직렬화 가능한 레코드(딕셔너리 리스트)로 변환합니다.
+    """
+    # 인덱스를 리셋하여 'Date'를 컬럼으로 만듦
+    df = df.reset_index()
+
+    # 타임스탬프를 문자열로 변환
+    # 컬럼 이름이 Date 또는 Datetime인지 확인
+    date_col = 'Datetime' if 'Datetime' in df.columns else 'Date'
+    if date_col in df.columns:
+        df[date_col] = df[date_col].astype(str)
+
+    # NaN 값을 None으로 변환 (JSON 표준 호환을 위해)
+    df = df.where(pd.notnull(df), None)
+
+    return df.to_dict(orient='records')
+
+def _frame_to_columns(df):
+    """
+    OHLCV 프레임을 컬럼형 구조 {"t": [...], "o": [...], ...}로 변환합니다.
+    t는 UTC epoch 초이며, NaN은 NumPy 마스크로 한 번에 None으로 치환합니다.
+    """
+    columns = {"t": to_epoch_seconds(pd.DatetimeIndex(df.index)).tolist()}
+    for key, col in COLUMNAR_KEYS.items():
+        if col not in df.columns:
+            continue
+        values = df[col].to_numpy(dtype="float64", na_value=np.nan)
+        mask = np.isnan(values)
+        if mask.any():
+            values = values.astype(object)
+            values[mask] = None
+        columns[key] = values.tolist()
+    return columns
+
+def encode_market_frames(frames, orient="records"):
+    """
+    자산별 DataFrame을 JSON 직렬화 가능한 구조로 인코딩합니다.
+    orient: 'records' (봉마다 딕셔너리, 기존 형식) 또는 'columns' (자산별 컬럼형 배열)
+    """
+    if orient not in ("records", "columns"):
+        raise ValueError(f"Invalid orient: {orient}")
+
+    data = {}
+    for name, df in frames.items():
+        if df.empty:
+            data[name] = [] if orient == "records" else {"t": []}
+        elif orient == "records":
+            data[name] = _frame_to_records(df)
+        else:
+            data[name] = _frame_to_columns(df)
     return data
 
+def _period_start(period, now):
+    """
+    yfinance의 period 문자열("7d", "1mo", "1y" 등)을 조회 시작 시점으로 변환합니다.
+    "max"처럼 시작 시점을 정할 수 없으면 None을 반환합니다.
+    """
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
+    units = {"mo": "months", "wk": "weeks", "d": "days", "y": "years", "h": "hours", "m": "minutes"}
+    for suffix, unit in units.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return now - pd.DateOffset(**{unit: int(period[:-len(suffix)])})
+    return None
+
+def _download(symbols, batched, **kwargs):
+    """
+    batched=True이면 MARKET_CHUNK_SIZE개씩 나눠 일괄 다운로드합니다. (수백 개 티커도 호출당 메모리/실패 범위를 제한)
+    """
+    if not symbols:
+        return {}
+    if not batched:
+        return _download_sequential(symbols, **kwargs)
+    frames = {}
+    for chunk in _chunks(list(symbols.items()), MARKET_CHUNK_SIZE):
+        frames.update(_download_batched(dict(chunk), **kwargs))
+    return frames
+
+def _collect_with_store(store, symbols, period, interval, batched):
+    """
+    로컬 봉 저장소를 기준으로 필요한 구간만 내려받아 병합한 뒤, 요청 구간을 저장소에서 읽어옵니다.
+    - 저장소가 요청 구간을 이미 커버하는 티커: 마지막 저장 봉 이후만 내려받음 (마지막 봉은 미완성일 수 있어 다시 받음)
+    - 그 외 티커: period 전체를 내려받아 저장소를 채움
+    """
+    now = pd.Timestamp.now(tz="UTC")
+    window_start = _period_start(period, now)
+    # "max"처럼 시작 시점이 없으면 epoch 0부터 커버한 것으로 기록
+    covered_from = window_start if window_start is not None else pd.Timestamp(0, unit="s", tz="UTC")
+
+    full, delta = {}, []
+    for name, ticker in symbols.items():
+        info = store.get_series_info(ticker, interval)
+        if info and info["covered_from"] is not None and info["covered_from"] <= covered_from:
+            delta.append((name, ticker, info["last_ts"]))
+        else:
+            full[name] = ticker
+
+    fetched = {}
+    fetched.update(_download(full, batched, period=period, interval=interval))
+    # 마지막 저장 시각이 비슷한 티커끼리 묶어, 오래 멈춘 티커 하나 때문에 전체 구간을 다시 받지 않도록 함
+    # (순차 다운로드는 어차피 티커마다 호출하므로 티커별 시작 시각 사용)
+    for chunk in _delta_groups(delta, MARKET_CHUNK_SIZE if batched else 1):
+        start = chunk[0][2].to_pydatetime()
+        fetched.update(_download({name: ticker for name, ticker, _ in chunk}, batched, start=start, interval=interval))
+
+    frames = {}
+    for name, ticker in symbols.items():
+        df = fetched.get(name, pd.DataFrame())
+        try:
+            store.upsert(ticker, interval, df, covered_from=covered_from if name in full and not df.empty else None)
+            stored = store.load(ticker, interval, start=window_start)
+        except Exception as e:
+            print(f"Error using bar store for {name}: {e}")
+            stored = df
+        frames[name] = stored if not stored.empty else df
+    return frames
+
+def collect_market_frames(period="7d", interval="1h", batched=True, symbols=None, store=None):
+    """
+    자산별 OHLCV DataFrame을 수집합니다.
+    batched=True이면 MARKET_CHUNK_SIZE개 단위로 일괄 다운로드한 뒤 실패한 티커만 개별 재시도합니다.
+    store가 주어지면 저장된 마지막 봉 이후의 데이터만 내려받아 병합합니다.
+    """
+    symbols = symbols or SYMBOLS
+    if store is not None:
+        return _collect_with_store(store, symbols, period, interval, batched)
+    return _download(symbols, batched, period=period, interval=interval)
+
+def load_history_frames(symbols=None, interval="1h", store=None):
+    """
+    봉 저장소에 쌓인 자산별 전체 기간 봉을 읽어옵니다. (긴 기간 차트 집계용, 내려받지 않음)
+    저장소에 없는 자산은 빈 DataFrame을 반환합니다.
+    """
+    symbols = symbols or SYMBOLS
+    store = store or get_bar_store()
+    return {name: store.load(ticker, interval) for name, ticker in symbols.items()}
+
+def collect_market_data(period="7d", interval="1h", batched=True, use_store=True, orient="records"):
+    """
+    설정된 자산(기본값: 은, 금, 비트코인, 달러 인덱스)의 시장 데이터를 수집합니다.
+    use_store=True이면 로컬 봉 저장소(SQLite)를 사용하여 증분 수집합니다.
+    orient='columns'이면 자산별 컬럼형 배열({"t", "o", "h", "l", "c", "v"})로 반환합니다.
+    """
+    store = None
+    if use_store:
+        try:
+            store = get_bar_store()
+        except Exception as e:
+            print(f"Bar store unavailable, downloading full period: {e}")
+
+    frames = collect_market_frames(period=period, interval=interval, batched=batched, store=store)
+    for name, df in frames.items():
+        if df.empty:
+            print(f"Warning: No data found for {name}")
+
+    return encode_market_frames(frames, orient=orient)
+
 if __name__ == "__main__":
     # Test execution
     result = collect_market_data()
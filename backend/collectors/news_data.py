@@ -1,36 +1,159 @@
-from tavily import TavilyClient
 import os
+import re
 import json
+import time
+import hashlib
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import numpy as np
+
+from ..ratelimit import get_provider_limiter
 
 # Tavily 클라이언트 초기화
 # .env 파일에 TAVILY_API_KEY를 설정해야 합니다.
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 
-def collect_news_data(query="Silver price news", days=1):
+# 기본 검색어 목록 (은/금 가격, 연준, 달러 인덱스)
+DEFAULT_NEWS_QUERIES = [
+    "Silver price generic news",
+    "Gold price news",
+    "Federal Reserve interest rate outlook",
+    "US dollar index DXY news",
+]
+
+# 같은 날 같은 검색어의 결과를 재사용하는 시간 (초)
+NEWS_CACHE_TTL_SEC = float(os.getenv("NEWS_CACHE_TTL_SEC", "1800"))
+
+# simhash 해밍 거리가 이 값 이하이면 같은 기사(재배포본)로 간주
+# (뉴스 요약 본문은 짧아 출처 문구 등 작은 차이에도 비트가 여럿 바뀌므로 웹 문서 기준값 3보다 넉넉하게 설정)
+NEAR_DUPLICATE_DISTANCE = 6
+
+# 프로세스 전체에서 공유하는 Tavily 클라이언트 (매 호출마다 새로 만들지 않음)
+_client = None
+_client_lock = threading.Lock()
+
+# (검색어, days, 날짜) -> (만료 시각, 결과)
+_cache = {}
+_cache_lock = threading.Lock()
+
+def get_tavily_client():
+    """
+    공유 Tavily 클라이언트를 반환합니다. tavily 패키지는 첫 호출 시점에 불러옵니다.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            if not TAVILY_API_KEY:
+                raise ValueError("TAVILY_API_KEY is not set")
+            from tavily import TavilyClient
+
+            _client = TavilyClient(api_key=TAVILY_API_KEY)
+        return _client
+
+def _search(query, days):
+    """
+    검색어 하나를 조회합니다. 같은 날 같은 검색어는 TTL 동안 캐시된 결과를 반환합니다.
+    """
+    key = (query, days, datetime.now().date().isoformat())
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+    # 분당 요청 한도 안에서 호출하며, 한도 초과/일시적 오류는 백오프 후 재시도 (RATE_LIMIT_TAVILY_*)
+    response = get_provider_limiter("tavily").call(
+        get_tavily_client().search, query, search_depth="advanced", topic="news", days=days
+    )
+    results = response.get("results", [])
+    with _cache_lock:
+        # 만료된 항목 정리
+        for expired in [k for k, (expires, _) in _cache.items() if expires <= now]:
+            del _cache[expired]
+        _cache[key] = (now + NEWS_CACHE_TTL_SEC, results)
+    return results
+
+def _normalize_url(url):
+    parsed = urlparse(url or "")
+    netloc = parsed.netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    return f"{netloc}{parsed.path.rstrip('/')}"
+
+def simhash(text, shingle_size=3):
+    """
+    단어 shingle 기반 64비트 simhash를 계산합니다. 비슷한 문서는 해밍 거리가 작은 값을 가집니다.
+    """
+    words = re.findall(r"\w+", (text or "").lower())
+    if not words:
+        return 0
+    shingles = {" ".join(words[i:i + shingle_size]) for i in range(max(1, len(words) - shingle_size + 1))}
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") for s in shingles],
+        dtype=np.uint64,
+    )
+    bits = (hashes[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)
+    weights = (bits.astype(np.int64) * 2 - 1).sum(axis=0)
+    return int(sum(1 << int(i) for i in np.nonzero(weights > 0)[0]))
+
+def dedupe_articles(articles, max_distance=NEAR_DUPLICATE_DISTANCE):
+    """
+    URL이 같은 기사와, 제목+본문의 simhash 해밍 거리가 max_distance 이하인 재배포 기사를 제거합니다.
+    먼저 나온 기사를 남깁니다.
+    """
+    seen_urls = set()
+    kept_hashes = []
+    unique = []
+    for article in articles:
+        url = _normalize_url(article.get("url"))
+        if url and url in seen_urls:
+            continue
+        fingerprint = simhash(f"{article.get('title', '')} {article.get('content', '')}")
+        if fingerprint and any(bin(fingerprint ^ other).count("1") <= max_distance for other in kept_hashes):
+            continue
+        if url:
+            seen_urls.add(url)
+        if fingerprint:
+            kept_hashes.append(fingerprint)
+        unique.append(article)
+    return unique
+
+def collect_news_data(query="Silver price news", days=1, queries=None, dedupe=True, max_workers=4):
     """
     Tavily API를 사용하여 뉴스 기사를 수집합니다.
+    queries가 주어지면 여러 검색어를 병렬로 조회한 뒤 결과를 합치고, 중복/재배포 기사를 제거합니다.
     """
     if not TAVILY_API_KEY:
         print("Error: TAVILY_API_KEY not found in environment variables.")
         return []
 
+    queries = list(queries) if queries else [query]
+
+    def search(q):
+        try:
+            return _search(q, days)
+        except Exception as e:
+            print(f"Error collecting news for '{q}': {e}")
+            return []
+
     try:
-        if not TAVILY_API_KEY:
-            raise ValueError("TAVILY_API_KEY is not set")
-            
-        tavily = TavilyClient(api_key=TAVILY_API_KEY)
-        response = tavily.search(query, search_depth="advanced", topic="news", days=days)
-        return response.get("results", [])
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+            results = list(executor.map(search, queries))
     except Exception as e:
         print(f"Error collecting news: {e}")
         # 앱이 중단되지 않도록 빈 리스트 반환
         return []
 
+    articles = [article for batch in results for article in batch]
+    return dedupe_articles(articles) if dedupe else articles
+
 if __name__ == "__main__":
     # Test execution
     if TAVILY_API_KEY:
-        news = collect_news_data()
+        news = collect_news_data(queries=DEFAULT_NEWS_QUERIES)
         print(f"Found {len(news)} articles.")
         for article in news[:3]:
             print(f"- {article['title']} ({article['url']})")
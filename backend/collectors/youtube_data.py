@@ -1,5 +1,13 @@
-from youtube_transcript_api import YouTubeTranscriptApi
 from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+import re
+import xml.etree.ElementTree as ET
+
+from ..storage.transcript_store import get_transcript_store
+
+# 채널의 최근 업로드 목록 (API 키 없이 사용 가능한 RSS 피드)
+CHANNEL_FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+FEED_NS = {"atom": "http://www.w3.org/2005/Atom", "yt": "http://www.youtube.com/xml/schemas/2015"}
 
 def get_video_id(url):
     """
@@ -8,35 +16,132 @@ def get_video_id(url):
     query = urlparse(url)
     if query.hostname == 'youtu.be':
         return query.path[1:]
-    if query.hostname in ('www.youtube.com', 'youtube.com'):
+    if query.hostname in ('www.youtube.com', 'youtube.com', 'm.youtube.com'):
         if query.path == '/watch':
             p = parse_qs(query.query)
-            return p['v'][0]
+            return p['v'][0] if 'v' in p else None
         if query.path[:7] == '/embed/':
             return query.path.split('/')[2]
         if query.path[:3] == '/v/':
             return query.path.split('/')[2]
+        if query.path[:8] == '/shorts/':
+            return query.path.split('/')[2]
     return None
 
-def collect_youtube_transcript(video_url):
+def _fetch_transcript(video_id):
     """
-    주어진 유튜브 비디오 URL에 대한 자막(스크립트)을 가져옵니다.
+    자막을 내려받아 하나의 문자열로 결합합니다.
+    youtube-transcript-api 1.x(fetch)와 이전 버전(get_transcript)을 모두 지원하며, 첫 호출 시점에 불러옵니다.
     """
-    video_id = get_video_id(video_url)
-    if not video_id:
-        print(f"Error: Invalid YouTube URL {video_url}")
-        return None
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    if hasattr(YouTubeTranscriptApi, "get_transcript"):
+        snippets = YouTubeTranscriptApi.get_transcript(video_id)
+        return " ".join(t['text'] for t in snippets)
+    fetched = YouTubeTranscriptApi().fetch(video_id)
+    return " ".join(snippet.text for snippet in fetched)
+
+def resolve_channel_id(channel):
+    """
+    채널 ID(UC...), /channel/ URL 또는 @핸들(URL)을 채널 ID로 변환합니다.
+    """
+    channel = channel.strip()
+    if re.fullmatch(r"UC[\w-]{22}", channel):
+        return channel
+    match = re.search(r"/channel/(UC[\w-]{22})", channel)
+    if match:
+        return match.group(1)
+    if channel.startswith("@"):
+        channel = f"https://www.youtube.com/{channel}"
+    import requests
+
+    # 핸들/사용자 URL은 채널 페이지의 canonical 링크에서 ID를 찾음
+    response = requests.get(channel, timeout=10)
+    response.raise_for_status()
+    match = re.search(r'<link rel="canonical" href="https://www\.youtube\.com/channel/(UC[\w-]{22})"', response.text)
+    return match.group(1) if match else None
+
+def get_channel_video_urls(channel, limit=3):
+    """
+    채널의 최근 업로드 영상 URL을 최신순으로 최대 limit개 반환합니다.
+    """
+    channel_id = resolve_channel_id(channel)
+    if not channel_id:
+        raise ValueError(f"Could not resolve channel: {channel}")
+    import requests
 
+    response = requests.get(CHANNEL_FEED_URL.format(channel_id=channel_id), timeout=10)
+    response.raise_for_status()
+    root = ET.fromstring(response.content)
+    video_ids = [entry.findtext("yt:videoId", namespaces=FEED_NS) for entry in root.findall("atom:entry", FEED_NS)]
+    return [f"https://www.youtube.com/watch?v={video_id}" for video_id in video_ids if video_id][:limit]
+
+def _get_store():
     try:
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-        # 자막을 하나의 문자열로 결합
-        full_text = " ".join([t['text'] for t in transcript_list])
-        return full_text
+        return get_transcript_store()
     except Exception as e:
-        print(f"Error fetching transcript for {video_url}: {e}")
-        # 필요한 경우 특정 에러 타입(예: 키 에러)을 여기서 조사
+        print(f"Transcript store unavailable, fetching without cache: {e}")
         return None
 
+def collect_youtube_transcripts(video_urls=None, channels=None, videos_per_channel=3, max_workers=4, store=None, use_store=True):
+    """
+    여러 영상(또는 채널의 최근 영상)의 자막을 제한된 병렬도로 수집합니다.
+    자막은 영상 ID 기준으로 디스크(SQLite)에 캐시되며, 캐시에 없는 영상만 내려받습니다.
+    반환값: [{"video_id", "url", "text"}, ...] (입력 순서 유지, 자막이 없는 영상은 제외)
+    """
+    urls = list(video_urls or [])
+    for channel in channels or []:
+        try:
+            urls.extend(get_channel_video_urls(channel, limit=videos_per_channel))
+        except Exception as e:
+            print(f"Error listing videos for channel {channel}: {e}")
+
+    videos = {}
+    for url in urls:
+        video_id = get_video_id(url)
+        if not video_id:
+            print(f"Error: Invalid YouTube URL {url}")
+            continue
+        videos.setdefault(video_id, url)
+    if not videos:
+        return []
+
+    if store is None and use_store:
+        store = _get_store()
+    transcripts = store.get_many(videos) if store is not None else {}
+    missing = [video_id for video_id in videos if video_id not in transcripts]
+
+    def fetch(video_id):
+        try:
+            return _fetch_transcript(video_id)
+        except Exception as e:
+            print(f"Error fetching transcript for {videos[video_id]}: {e}")
+            return None
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+            for video_id, text in zip(missing, executor.map(fetch, missing)):
+                if not text:
+                    continue
+                transcripts[video_id] = text
+                if store is not None:
+                    try:
+                        store.put(video_id, text)
+                    except Exception as e:
+                        print(f"Error caching transcript for {video_id}: {e}")
+
+    return [
+        {"video_id": video_id, "url": url, "text": transcripts[video_id]}
+        for video_id, url in videos.items() if video_id in transcripts
+    ]
+
+def collect_youtube_transcript(video_url):
+    """
+    주어진 유튜브 비디오 URL에 대한 자막(스크립트)을 가져옵니다.
+    """
+    results = collect_youtube_transcripts([video_url])
+    return results[0]["text"] if results else None
+
 if __name__ == "__main__":
     # Test execution
     test_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ" # Rick Roll for testing :)
@@ -1,17 +1,24 @@
 import os
-import json
 import asyncio
+import argparse
 import logging
 from datetime import datetime
 from dotenv import load_dotenv
 
 # 백엔드 모듈 임포트 (경로 설정 필요)
+# 패키지 간 상대 임포트(backend.storage 등)를 위해 프로젝트 루트를 경로에 추가하고 backend 패키지로 임포트
 import sys
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from collectors.market_data import collect_market_data
-from collectors.news_data import collect_news_data
-from analysis.service import AnalysisService
+import pandas as pd
+
+from backend.assets import core_asset_names, get_assets
+from backend.collectors.market_data import encode_market_frames, load_history_frames
+from backend.analysis.service import AnalysisService
+from backend.analysis.indicators import compute_indicators
+from backend.analysis.downsample import aggregate_ohlcv, parse_tiers
+from backend.pipeline import collect_inputs
+from backend.static_output import write_static_output
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -20,34 +27,89 @@ logger = logging.getLogger("StaticGenerator")
 # 환경 변수 로드
 load_dotenv()
 
-async def generate_static_data():
+# 미리 집계해 둘 차트 단계 (timeframe:자산당 최대 봉 수, 빈 값이면 생성하지 않음)
+STATIC_MARKET_TIERS = os.getenv("STATIC_MARKET_TIERS", "4h:500,1d:500,1w:500")
+
+def _sample_market_frames():
+    """
+    데이터 수집 실패 시 사용할 샘플 시장 데이터를 자산별 DataFrame으로 생성합니다.
+    """
+    current_time = datetime.now()
+    samples = {
+        "Silver": [
+            {"Datetime": current_time.strftime("%Y-%m-%dT10:00:00"), "Open": 30.5, "High": 30.8, "Low": 30.3, "Close": 30.6, "Volume": 1000},
+            {"Datetime": current_time.strftime("%Y-%m-%dT11:00:00"), "Open": 30.6, "High": 30.9, "Low": 30.5, "Close": 30.7, "Volume": 1100},
+            {"Datetime": current_time.strftime("%Y-%m-%dT12:00:00"), "Open": 30.7, "High": 31.0, "Low": 30.6, "Close": 30.9, "Volume": 1200}
+        ],
+        "Gold": [
+            {"Datetime": current_time.strftime("%Y-%m-%dT10:00:00"), "Open": 2050.0, "High": 2055.0, "Low": 2048.0, "Close": 2052.0, "Volume": 500}
+        ],
+        "Bitcoin": [
+            {"Datetime": current_time.strftime("%Y-%m-%dT10:00:00"), "Open": 45000.0, "High": 45500.0, "Low": 44800.0, "Close": 45200.0, "Volume": 100}
+        ],
+        "USD_Index": []
+    }
+    frames = {}
+    for name, records in samples.items():
+        df = pd.DataFrame(records)
+        if not df.empty:
+            df = df.set_index(pd.DatetimeIndex(pd.to_datetime(df.pop("Datetime")), name="Datetime"))
+        frames[name] = df
+    return frames
+
+def _market_tiers(market_frames: dict, orient: str, tiers: list) -> dict:
+    """
+    봉 저장소의 전체 기간(없으면 이번에 수집한 봉)을 단계별로 집계/축소해 {timeframe: {자산: 데이터}}로 인코딩합니다.
+    기간이 길어져도 단계별 샤드 크기는 max_points로 고정됩니다.
+    """
+    if not tiers:
+        return {}
+    try:
+        history = load_history_frames()
+    except Exception as e:
+        logger.warning(f"봉 저장소를 읽지 못해 수집한 기간만 집계합니다: {e}")
+        history = {}
+    frames = {
+        name: history[name] if name in history and len(history[name]) > len(df) else df
+        for name, df in market_frames.items()
+    }
+    return {
+        timeframe: encode_market_frames(
+            {name: aggregate_ohlcv(df, timeframe, max_points) for name, df in frames.items()}, orient=orient
+        )
+        for timeframe, max_points in tiers
+    }
+
+async def generate_static_data(orient="records", precompress=False, output_dir=None):
+    """
+    데이터를 수집/분석하여 frontend/public/data/ 아래에 매니페스트와 샤드 파일을 생성합니다.
+    orient: 시장 데이터 인코딩 형식 ('records' 또는 컬럼형 'columns')
+    precompress: True이면 샤드마다 .gz/.br 압축본을 함께 생성
+    output_dir: 출력 디렉터리 (기본값: frontend/public/data)
+    반환값: 생성된 매니페스트
+    """
     logger.info("정적 데이터 생성 시작...")
 
-    # 1. 데이터 수집
-    logger.info("시장 데이터 수집 중...")
-    market_data = collect_market_data()
+    # 1. 데이터 수집 (시장/뉴스/유튜브 수집기 동시 실행, 수집기별 제한 시간 적용)
+    logger.info("데이터 수집 중...")
+    inputs = await collect_inputs()
+    if inputs["errors"]:
+        logger.warning(f"일부 수집 실패: {inputs['errors']}")
+    market_frames = inputs["market_frames"]
     
     # 데이터 수집 실패 시 샘플 데이터 사용 (배포 환경에서 빈 데이터로 인한 크래시 방지)
-    if not market_data or not market_data.get("Silver") or len(market_data["Silver"]) == 0:
+    core_assets = core_asset_names()
+    primary = market_frames.get(core_assets[0])
+    if primary is None or primary.empty:
         logger.warning("시장 데이터 수집 실패. 샘플 데이터를 사용합니다.")
-        current_time = datetime.now()
-        market_data = {
-            "Silver": [
-                {"Datetime": current_time.strftime("%Y-%m-%dT10:00:00"), "Open": 30.5, "High": 30.8, "Low": 30.3, "Close": 30.6, "Volume": 1000},
-                {"Datetime": current_time.strftime("%Y-%m-%dT11:00:00"), "Open": 30.6, "High": 30.9, "Low": 30.5, "Close": 30.7, "Volume": 1100},
-                {"Datetime": current_time.strftime("%Y-%m-%dT12:00:00"), "Open": 30.7, "High": 31.0, "Low": 30.6, "Close": 30.9, "Volume": 1200}
-            ],
-            "Gold": [
-                {"Datetime": current_time.strftime("%Y-%m-%dT10:00:00"), "Open": 2050.0, "High": 2055.0, "Low": 2048.0, "Close": 2052.0, "Volume": 500}
-            ],
-            "Bitcoin": [
-                {"Datetime": current_time.strftime("%Y-%m-%dT10:00:00"), "Open": 45000.0, "High": 45500.0, "Low": 44800.0, "Close": 45200.0, "Volume": 100}
-            ],
-            "USD_Index": []
-        }
+        market_frames = _sample_market_frames()
+
+    market_data = encode_market_frames(market_frames, orient=orient)
+    market_tiers = _market_tiers(market_frames, orient, parse_tiers(STATIC_MARKET_TIERS))
+    # 기술적 지표 (정적 파일에는 최신 값만 포함)
+    indicators = compute_indicators(market_frames, corr_assets=core_assets)
     
-    logger.info("뉴스 데이터 수집 중...")
-    news_data = collect_news_data(query="Silver price generic news", days=1)
+    news_data = inputs["news_data"]
     
     if not news_data:
         logger.warning("뉴스 데이터 수집 실패. 샘플 데이터를 사용합니다.")
@@ -59,7 +121,7 @@ async def generate_static_data():
             }
         ]
     
-    youtube_data = "유튜브 스크립트 수집은 검색 기능 구현 후 연동 예정."
+    youtube_data = inputs["youtube_data"]
 
     # 2. AI 분석 (낙관적 & 비관적)
     bullish_report = "AI 분석 실패 (API Key 없음)"
@@ -70,8 +132,12 @@ async def generate_static_data():
         try:
             logger.info("AI 분석 시작...")
             service = AnalysisService(api_key=api_key)
-            bullish_report = await service.generate_report(market_data, news_data, youtube_data, "bullish")
-            bearish_report = await service.generate_report(market_data, news_data, youtube_data, "bearish")
+            # 낙관적/비관적 리포트를 동시에 생성
+            reports = await service.generate_reports(
+                market_data, news_data, youtube_data, ("bullish", "bearish"), indicators=indicators
+            )
+            bullish_report = reports["bullish"]
+            bearish_report = reports["bearish"]
         except Exception as e:
             logger.error(f"AI 분석 중 오류 발생: {e}")
             bullish_report = f"분석 오류: {e}"
@@ -80,24 +146,38 @@ async def generate_static_data():
         logger.warning("GEMINI_API_KEY가 설정되지 않았습니다.")
 
     # 3. 데이터 구조화
+    configured = {asset.name: asset.to_dict() for asset in get_assets()}
     report_data = {
         "timestamp": datetime.now().isoformat(),
         "bullish_report": bullish_report,
         "bearish_report": bearish_report,
         "market_data": market_data,
-        "news_data": news_data
+        "market_tiers": market_tiers,
+        "news_data": news_data,
+        "indicators": indicators,
+        # 프론트엔드가 고정된 자산 이름 대신 사용하는 자산 목록 (시장 데이터 순서 = 설정 순서)
+        "assets": [configured.get(name, {"name": name, "ticker": None, "group": None, "core": False}) for name in market_data],
     }
 
-    # 4. JSON 파일 저장
-    # frontend/public/data.json 에 저장
-    output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend", "public")
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, "data.json")
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(report_data, f, ensure_ascii=False, indent=2)
+    # 4. 샤드 파일 저장
+    # frontend/public/data/manifest.json + frontend/public/data/shards/<이름>.<해시>.json
+    output_dir = output_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend", "public", "data")
+    manifest = write_static_output(output_dir, report_data, orient=orient, precompress=precompress)
 
-    logger.info(f"데이터가 저장되었습니다: {output_path}")
+    shards = [manifest["shards"][name] for name in ("reports", "news", "indicators")] + list(manifest["shards"]["market"].values())
+    shards += [shard for tier in manifest["shards"]["market_tiers"].values() for shard in tier.values()]
+    written = sum(1 for shard in shards if shard["written"])
+    logger.info(
+        f"데이터가 저장되었습니다: {output_dir} "
+        f"(샤드 {len(shards)}개 중 {written}개 갱신, 총 {sum(shard['bytes'] for shard in shards):,} bytes)"
+    )
+    return manifest
 
 if __name__ == "__main__":
-    asyncio.run(generate_static_data())
+    parser = argparse.ArgumentParser(description="정적 리포트 데이터(매니페스트 + 샤드) 생성")
+    parser.add_argument("--orient", choices=["records", "columns"], default=os.getenv("MARKET_DATA_ORIENT", "records"),
+                        help="시장 데이터 인코딩 형식 (기본값: records)")
+    parser.add_argument("--precompress", action="store_true", default=os.getenv("STATIC_PRECOMPRESS", "") == "1",
+                        help="샤드별 .gz/.br 압축본 생성 (gzip_static 등을 지원하는 서버/CDN용)")
+    args = parser.parse_args()
+    asyncio.run(generate_static_data(orient=args.orient, precompress=args.precompress))
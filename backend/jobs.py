@@ -0,0 +1,138 @@
+"""
+리포트 생성 작업을 단일 실행(single-flight)으로 관리하는 모듈입니다.
+실행 중인 작업이 있을 때 들어온 트리거는 새 작업을 만들지 않고 기존 작업에 합류하며,
+작업마다 ID와 단계별 진행 상황/소요 시간을 기록하여 조회할 수 있게 합니다.
+(단일 실행 보장은 프로세스 단위입니다)
+"""
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+from backend.metrics import JOB_DURATION, JOB_OVERLAPS, JOB_RUNS, JOB_STAGE_DURATION, JOBS_RUNNING
+from backend.tracing import span
+
+logger = logging.getLogger(__name__)
+
+def _now_iso():
+    return datetime.now().isoformat()
+
+class Job:
+    def __init__(self, trigger: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.trigger = trigger
+        self.status = "running"
+        self.created_at = _now_iso()
+        self.finished_at = None
+        self.attached = 0
+        self.stages = []
+        self.error = None
+        self.result = None
+        self._started = time.perf_counter()
+        self.duration_sec = None
+        self.done = threading.Event()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        작업 단계를 기록하는 컨텍스트 매니저입니다.
+        """
+        entry = {"name": name, "status": "running", "started_at": _now_iso(), "duration_sec": None}
+        self.stages.append(entry)
+        started = time.perf_counter()
+        try:
+            with span(f"stage.{name}", job_id=self.id):
+                yield entry
+            entry["status"] = "succeeded"
+        except Exception:
+            entry["status"] = "failed"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            entry["duration_sec"] = round(elapsed, 3)
+            JOB_STAGE_DURATION.observe(elapsed, stage=name, status=entry["status"])
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "trigger": self.trigger,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "duration_sec": self.duration_sec,
+            "attached_triggers": self.attached,
+            "stages": [dict(stage) for stage in self.stages],
+            "error": self.error,
+            "result": self.result,
+        }
+
+class JobManager:
+    def __init__(self, runner, history_size: int = 50):
+        """
+        runner: Job을 인자로 받는 비동기 함수 (반환값은 job.result에 저장)
+        """
+        self._runner = runner
+        self._history_size = history_size
+        self._jobs = OrderedDict()
+        self._current = None
+        self._lock = threading.Lock()
+
+    def submit(self, trigger: str = "manual"):
+        """
+        작업을 시작합니다. 이미 실행 중인 작업이 있으면 그 작업에 합류합니다.
+        반환값: (job, created) - created가 False이면 기존 작업에 합류한 것
+        """
+        with self._lock:
+            if self._current is not None:
+                self._current.attached += 1
+                JOB_OVERLAPS.inc(trigger=trigger)
+                logger.info(f"실행 중인 작업 {self._current.id}에 합류 ({trigger})")
+                return self._current, False
+            job = Job(trigger)
+            self._current = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > self._history_size:
+                self._jobs.popitem(last=False)
+
+        threading.Thread(target=self._run, args=(job,), name=f"report-job-{job.id}", daemon=True).start()
+        return job, True
+
+    def _run(self, job: Job):
+        logger.info(f"작업 {job.id} 시작 ({job.trigger})")
+        JOBS_RUNNING.inc()
+        try:
+            # asyncio.run은 현재 컨텍스트를 복사하므로 작업 내부의 구간은 이 구간의 자식이 됨
+            with span("job", job_id=job.id, trigger=job.trigger):
+                job.result = asyncio.run(self._runner(job))
+            job.status = "succeeded"
+        except Exception as e:
+            logger.error(f"작업 {job.id} 실패: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = _now_iso()
+            job.duration_sec = round(time.perf_counter() - job._started, 3)
+            JOBS_RUNNING.dec()
+            JOB_RUNS.inc(trigger=job.trigger, status=job.status)
+            JOB_DURATION.observe(job.duration_sec, trigger=job.trigger, status=job.status)
+            with self._lock:
+                if self._current is job:
+                    self._current = None
+            job.done.set()
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def current(self):
+        with self._lock:
+            return self._current
+
+    def recent(self, limit: int = 20) -> list:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.to_dict() for job in reversed(jobs[-limit:])]
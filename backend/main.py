@@ -1,16 +1,28 @@
-from fastapi import FastAPI, BackgroundTasks
-from apscheduler.schedulers.background import BackgroundScheduler
-import uvicorn
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from contextlib import aclosing, asynccontextmanager
 import logging
 from datetime import datetime
 import asyncio
+import json
+import time
 from dotenv import load_dotenv
 import os
 
-from backend.collectors.market_data import collect_market_data
-from backend.collectors.news_data import collect_news_data
-from backend.collectors.youtube_data import collect_youtube_transcript
+from backend.collectors.market_data import encode_market_frames, load_history_frames
+from backend.storage.report_store import get_report_store
 from backend.analysis.service import AnalysisService, get_analysis_service
+from backend.analysis.indicators import IndicatorEngine, indicators_to_json
+from backend.analysis.context import asset_frame
+from backend.analysis.downsample import DOWNSAMPLE_METHODS, TIMEFRAMES, aggregate_ohlcv
+from backend.pipeline import YOUTUBE_PLACEHOLDER, collect_inputs
+from backend.jobs import Job, JobManager
+from backend.serialized import PublishedPayloads, serve_payload
+from backend.assets import asset_symbols, core_asset_names, get_assets
+from backend.scheduler import ReportScheduler
+from backend.metrics import LATEST_REPORT_AGE, REGISTRY, REPORT_PUBLISH_DURATION, REPORT_PUBLISHES
+from backend.tracing import recent_traces, span
 
 # 환경 변수 로드
 load_dotenv()
@@ -21,7 +33,19 @@ logger = logging.getLogger("SilverReport")
 
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="Silver Report AI")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    서버 시작 시 정기 리포트 스케줄러를 시작하고 종료 시 멈춥니다. (모듈 임포트만으로는 시작되지 않음)
+    """
+    logger.info("애플리케이션 시작 중...")
+    scheduler.start()
+    try:
+        yield
+    finally:
+        scheduler.shutdown()
+
+app = FastAPI(title="Silver Report AI", lifespan=lifespan)
 
 # CORS 미들웨어 설정
 app.add_middleware(
@@ -32,96 +56,393 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 전역 저장소 (프로토타입용 인메모리 저장소, 추후 SQLite로 교체 예정)
-LATEST_REPORT = {
+# 아직 생성된 리포트가 없을 때 반환하는 기본값
+# (리포트는 SQLite 저장소에 이력과 함께 보관되어 재시작/여러 워커 간에 공유됨)
+EMPTY_REPORT = {
     "timestamp": None,
     "bullish_report": "아직 생성되지 않음.",
     "bearish_report": "아직 생성되지 않음.",
     "market_data": {},
-    "news_data": []
+    "news_data": [],
+    "market_columns": {},
+    "indicators": {}
 }
 
-def job_generate_report():
+def _sse(event: str, data: dict) -> str:
     """
-    주기적으로 데이터를 수집하고 리포트를 생성하는 작업입니다.
+    Server-Sent Events 형식의 메시지를 만듭니다.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _latest_report() -> dict:
+    """
+    저장소의 최신 리포트(스냅샷 포함)를 반환합니다. 없으면 기본값을 반환합니다.
+    """
+    return get_report_store().latest() or EMPTY_REPORT
+
+def _public_report(report: dict) -> dict:
+    """
+    API 응답용 리포트 (별도 엔드포인트로 제공하는 컬럼형 시장 데이터/기술적 지표 제외)
+    """
+    return {key: value for key, value in report.items() if key not in ("market_columns", "indicators")}
+
+def _latest_indicators(indicators: dict) -> dict:
+    """
+    지표 데이터에서 시계열을 제외한 최신 값만 반환합니다.
+    """
+    return {key: value for key, value in indicators.items() if key != "series"}
+
+def _published_views(report: dict) -> dict:
+    """
+    최신 리포트 기준으로 미리 직렬화해 둘 응답 목록
+    """
+    return {
+        "report": _public_report(report),
+        "market:records": report.get("market_data", {}),
+        "market:columns": report.get("market_columns", {}),
+        "indicators": _latest_indicators(report.get("indicators", {})),
+        "indicators:series": report.get("indicators", {}),
+    }
+
+# /report/latest, /data/market 응답 바이트 캐시 (새 리포트 게시 시 한 번만 직렬화)
+# 집계/축소된 시장 데이터는 요청 파라미터별로 MARKET_VIEW_CACHE_SIZE개까지 보관
+published = PublishedPayloads(_latest_report, _published_views, int(os.getenv("MARKET_VIEW_CACHE_SIZE", "64")))
+
+# timeframe만 지정하고 max_points를 생략했을 때 적용하는 자산당 최대 봉 수
+MARKET_DEFAULT_MAX_POINTS = int(os.getenv("MARKET_DEFAULT_MAX_POINTS", "1000"))
+
+def _market_history(report: dict, names: list) -> dict:
+    """
+    차트 집계에 사용할 자산별 봉 데이터 (봉 저장소의 전체 기간, 저장소에 없으면 리포트의 시장 데이터)
+    """
+    symbols = asset_symbols()
+    try:
+        frames = load_history_frames({name: symbols[name] for name in names if name in symbols})
+    except Exception as e:
+        logger.warning(f"봉 저장소를 읽지 못해 리포트의 시장 데이터를 사용합니다: {e}")
+        frames = {}
+    snapshot = report.get("market_columns") or report.get("market_data") or {}
+    for name in names:
+        if frames.get(name) is None or frames[name].empty:
+            df = asset_frame(snapshot.get(name))
+            df.index.name = "Datetime"
+            frames[name] = df
+    return frames
+
+def _publish(report: dict, source: str) -> dict:
+    """
+    리포트를 저장소에 추가하고 미리 직렬화된 응답을 갱신합니다. (게시 구간/메트릭 기록)
+    """
+    started = time.perf_counter()
+    with span("report.publish", source=source) as current:
+        stored = get_report_store().add(report)
+        published.refresh(stored)
+        current.set(report_id=stored["id"])
+    REPORT_PUBLISHES.inc(source=source)
+    REPORT_PUBLISH_DURATION.observe(time.perf_counter() - started, source=source)
+    return stored
+
+def _latest_report_age():
+    timestamp = _latest_report().get("timestamp")
+    if not timestamp:
+        return None
+    return max(0.0, (datetime.now() - datetime.fromisoformat(timestamp)).total_seconds())
+
+LATEST_REPORT_AGE.set_function(_latest_report_age)
+
+async def run_report_job(job: Job):
+    """
+    데이터를 수집하고 리포트를 생성하여 저장하는 작업입니다.
+    단계(collect/indicators/analyze/publish)별 진행 상황은 job에 기록됩니다.
     """
     logger.info("정기 리포트 생성 시작...")
-    # 1. 데이터 수집
-    market_data = collect_market_data()
-    news_data = collect_news_data(query="Silver price generic news", days=1)
-    
-    # 유튜브 데이터 수집 (예시 URL, 실제 앱에서는 검색 또는 리스트 필요)
-    # youtube_data = collect_youtube_transcript("...") 
-    youtube_data = "유튜브 스크립트 수집은 검색 기능 구현 후 연동 예정."
+    # 1. 데이터 수집 (수집기 동시 실행, 수집기별 제한 시간 적용 - 실패한 수집기는 빈 결과)
+    with job.stage("collect") as stage:
+        inputs = await collect_inputs()
+        stage["collector_timings"] = inputs["timings"]
+        stage["collector_errors"] = inputs["errors"]
+        if inputs["errors"]:
+            logger.warning(f"일부 수집 실패: {inputs['errors']}")
+        market_frames = inputs["market_frames"]
+        market_data = encode_market_frames(market_frames, orient="records")
+        market_columns = encode_market_frames(market_frames, orient="columns")
+        news_data = inputs["news_data"]
+        youtube_data = inputs["youtube_data"]
+
+    with job.stage("indicators"):
+        indicators = _compute_indicators(market_frames)
 
     # 2. 분석 (낙관적 & 비관적)
-    try:
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            logger.warning("GEMINI_API_KEY가 없습니다. AI 분석을 건너뜁니다.")
-            return
+    # 모델 상태(라우터)를 실행 간에 유지하기 위해 싱글톤 서비스를 사용
+    service = get_analysis_service()
+    if service is None:
+        logger.warning("GEMINI_API_KEY가 없습니다. AI 분석을 건너뜁니다.")
+        return {"report_id": None, "skipped": "GEMINI_API_KEY not set"}
 
-        service = AnalysisService(api_key=api_key)
-        
-        # 동기 작업에서 비동기 메서드를 호출하기 위해 이벤트 루프 사용
-        # APScheduler의 AsyncIOScheduler를 사용하면 더 간단할 수 있음.
-        # 여기서는 백그라운드 스레드에서 실행하기 위해 run_until_complete 사용.
-        
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        bullish_report = loop.run_until_complete(
-            service.generate_report(market_data, news_data, youtube_data, "bullish")
+    # 낙관적/비관적 리포트를 동시에 생성
+    with job.stage("analyze"):
+        reports = await service.generate_reports(
+            market_data, news_data, youtube_data, ("bullish", "bearish"), indicators=indicators
         )
-        bearish_report = loop.run_until_complete(
-            service.generate_report(market_data, news_data, youtube_data, "bearish")
-        )
-        loop.close()
 
-        # 3. 상태 업데이트
-        global LATEST_REPORT
-        LATEST_REPORT = {
+    # 3. 리포트 저장 (이력에 추가되며 최신 리포트가 됨)
+    with job.stage("publish"):
+        stored = _publish({
             "timestamp": datetime.now().isoformat(),
-            "bullish_report": bullish_report,
-            "bearish_report": bearish_report,
+            "bullish_report": reports["bullish"],
+            "bearish_report": reports["bearish"],
             "market_data": market_data,
-            "news_data": news_data
-        }
-        logger.info("리포트 생성 완료.")
+            "news_data": news_data,
+            "market_columns": market_columns,
+            "indicators": indicators
+        }, source=job.trigger)
+    logger.info("리포트 생성 완료.")
+    return {"report_id": stored["id"]}
 
-    except Exception as e:
-        logger.error(f"작업 실패: {e}")
+# 기술적 지표 엔진 (이전 계산 결과를 보관하여 새 봉부터만 다시 계산, 상관계수는 핵심 자산끼리만)
+indicator_engine = IndicatorEngine(corr_assets=core_asset_names())
 
-# 스케줄러 설정
-scheduler = BackgroundScheduler()
-scheduler.add_job(job_generate_report, 'interval', minutes=60)
-scheduler.start()
+def _compute_indicators(market_frames: dict) -> dict:
+    return indicators_to_json(indicator_engine.update(market_frames), indicator_engine.params, include_series=True)
 
-@app.on_event("startup")
-async def startup_event():
-    logger.info("애플리케이션 시작 중...")
-    # 테스트를 위해 초기 작업 즉시 실행 (선택 사항)
-    # job_generate_report()
+# 리포트 생성 작업 관리자 (실행 중에 들어온 트리거는 같은 작업에 합류)
+job_manager = JobManager(run_report_job)
+
+def job_generate_report():
+    """
+    주기적으로 데이터를 수집하고 리포트를 생성하는 작업입니다.
+    이미 실행 중인 작업이 있으면 새로 실행하지 않고 합류합니다.
+    """
+    job_manager.submit(trigger="scheduled")
+
+# 스케줄러 설정 (lifespan에서 시작/종료, SCHEDULER_MODE=leader이면 워커 하나만 스케줄링)
+scheduler = ReportScheduler(job_generate_report)
 
 @app.get("/")
 def read_root():
     return {"message": "Silver Report AI Service Running"}
 
 @app.get("/report/latest")
-def get_latest_report():
-    return LATEST_REPORT
+def get_latest_report(request: Request):
+    """
+    최신 리포트를 반환합니다. 미리 직렬화된 응답을 사용하며 ETag/If-None-Match(304)를 지원합니다.
+    """
+    return serve_payload(request, published.get("report"))
+
+@app.get("/report/history")
+def get_report_history(
+    start: str = Query(None, alias="from", description="조회 시작 시각 (ISO 8601)"),
+    end: str = Query(None, alias="to", description="조회 종료 시각 (ISO 8601)"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: int = Query(None, description="이전 응답의 next_cursor"),
+):
+    """
+    리포트 이력을 최신순으로 반환합니다. (시장/뉴스 스냅샷 제외, 커서 기반 페이지네이션)
+    """
+    try:
+        items, next_cursor = get_report_store().history(start=start, end=end, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="from/to must be ISO 8601 timestamps")
+    return {"items": items, "next_cursor": next_cursor}
+
+@app.get("/report/{report_id:int}")
+def get_report(report_id: int):
+    """
+    특정 리포트를 당시의 시장/뉴스 스냅샷과 함께 반환합니다.
+    """
+    report = get_report_store().get(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return _public_report(report)
+
+@app.get("/report/stream")
+async def stream_report(type: str = "bullish"):
+    """
+    리포트를 생성하면서 Gemini 출력 조각을 Server-Sent Events로 전달합니다.
+    - event: chunk  data: {"text": "..."}
+    - event: done   data: {"timestamp": "..."}  (완성된 리포트는 최신 리포트에 반영됨)
+    - event: error  data: {"detail": "..."}
+    최신 리포트의 시장/뉴스 데이터를 사용하며, 아직 수집된 데이터가 없으면 먼저 수집합니다.
+    """
+    report_type = type.lower()
+    if report_type not in ("bullish", "bearish"):
+        raise HTTPException(status_code=400, detail="type must be 'bullish' or 'bearish'")
+    service = get_analysis_service()
+    if service is None:
+        raise HTTPException(status_code=503, detail="GEMINI_API_KEY가 설정되지 않았습니다.")
+
+    snapshot = _latest_report()
+    market_data = snapshot.get("market_data")
+    market_columns = snapshot.get("market_columns")
+    news_data = snapshot.get("news_data")
+    indicators = snapshot.get("indicators")
+    youtube_data = YOUTUBE_PLACEHOLDER
+    if snapshot.get("timestamp") is None:
+        inputs = await collect_inputs()
+        market_data = encode_market_frames(inputs["market_frames"], orient="records")
+        market_columns = encode_market_frames(inputs["market_frames"], orient="columns")
+        indicators = await run_in_threadpool(_compute_indicators, inputs["market_frames"])
+        news_data = inputs["news_data"]
+        youtube_data = inputs["youtube_data"]
+
+    async def event_stream():
+        parts = []
+        try:
+            # 클라이언트 연결이 끊겨 이 제너레이터가 닫히거나 취소되면 리포트 스트림도 닫아 Gemini 생성을 중단함
+            async with aclosing(
+                service.stream_report(market_data, news_data, youtube_data, report_type, indicators=indicators)
+            ) as stream:
+                async for text in stream:
+                    parts.append(text)
+                    yield _sse("chunk", {"text": text})
+        except Exception as e:
+            logger.error(f"스트리밍 리포트 생성 실패: {e}")
+            yield _sse("error", {"detail": str(e)})
+            return
+
+        # 완성된 리포트를 새 리포트로 저장 (다른 타입의 리포트는 직전 값 유지)
+        latest = _latest_report()
+        stored = await run_in_threadpool(_publish, {
+            "timestamp": datetime.now().isoformat(),
+            "bullish_report": latest.get("bullish_report"),
+            "bearish_report": latest.get("bearish_report"),
+            f"{report_type}_report": "".join(parts),
+            "market_data": market_data,
+            "news_data": news_data,
+            "market_columns": market_columns,
+            "indicators": indicators,
+        }, "stream")
+        yield _sse("done", {"id": stored["id"], "timestamp": stored["timestamp"]})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.get("/data/market")
-def get_market_data():
-    return LATEST_REPORT.get("market_data", {})
+def get_market_data(
+    request: Request,
+    orient: str = "records",
+    asset: str = None,
+    timeframe: str = None,
+    max_points: int = Query(None, ge=10, le=10000),
+    method: str = "ohlc",
+):
+    """
+    최신 시장 데이터를 반환합니다.
+    orient=columns이면 자산별 컬럼형 배열({"t", "o", "h", "l", "c", "v"})로 반환합니다.
+    asset/timeframe/max_points 중 하나라도 지정하면 봉 저장소의 전체 기간을 timeframe(1h/4h/1d/1w) 봉으로 집계하고
+    자산당 max_points개 이하로 줄여 반환합니다. (method: ohlc/minmax/lttb)
+    미리 직렬화된 응답을 사용하며 ETag/If-None-Match(304)를 지원합니다.
+    """
+    if orient not in ("records", "columns"):
+        raise HTTPException(status_code=400, detail="orient must be 'records' or 'columns'")
+    if asset is None and timeframe is None and max_points is None:
+        return serve_payload(request, published.get(f"market:{orient}"))
+
+    if timeframe is not None and timeframe not in TIMEFRAMES:
+        raise HTTPException(status_code=400, detail=f"timeframe must be one of: {', '.join(TIMEFRAMES)}")
+    if method not in DOWNSAMPLE_METHODS:
+        raise HTTPException(status_code=400, detail=f"method must be one of: {', '.join(DOWNSAMPLE_METHODS)}")
+    if asset is not None and asset not in asset_symbols():
+        raise HTTPException(status_code=404, detail=f"Unknown asset: {asset}")
+    names = [asset] if asset is not None else list(asset_symbols())
+    max_points = max_points or MARKET_DEFAULT_MAX_POINTS
+
+    def build(report: dict) -> dict:
+        frames = _market_history(report, names)
+        aggregated = {name: aggregate_ohlcv(df, timeframe, max_points, method) for name, df in frames.items()}
+        return encode_market_frames(aggregated, orient=orient)
+
+    key = ("market", orient, asset, timeframe, max_points, method)
+    return serve_payload(request, published.get_derived(key, build))
+
+@app.get("/assets")
+def list_assets():
+    """
+    설정된 자산 목록(이름, 티커, 분류, 핵심 자산 여부)과 최신 리포트에 데이터가 있는지 여부를 설정 순서대로 반환합니다.
+    """
+    available = _latest_report().get("market_data") or {}
+    return {"assets": [{**asset.to_dict(), "available": bool(available.get(asset.name))} for asset in get_assets()]}
+
+@app.get("/data/indicators")
+def get_indicators(request: Request, series: bool = False):
+    """
+    최신 리포트 기준 기술적 지표(SMA/EMA, RSI, 볼린저 밴드, ATR)와 자산 간 수익률 상관계수를 반환합니다.
+    series=true이면 컬럼형 시계열도 함께 반환합니다.
+    """
+    return serve_payload(request, published.get("indicators:series" if series else "indicators"))
+
+@app.get("/models/status")
+def get_model_status():
+    """
+    Gemini 모델 라우터 상태(차단 여부, 성공/실패 횟수, 평균 지연 시간)를 우선순위 순서로 반환합니다.
+    """
+    service = get_analysis_service()
+    if service is None:
+        return {"models": []}
+    return {"models": service.router.snapshot()}
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    """
+    LLM 응답 캐시의 적중/미스 횟수와 절약한 호출 시간을 반환합니다.
+    """
+    service = get_analysis_service()
+    if service is None or service.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **service.cache.stats()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Prometheus 텍스트 형식의 메트릭을 반환합니다. (수집기/Gemini 시도/게시/작업 소요 시간, 최신 리포트 경과 시간 등)
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/traces")
+def get_traces(limit: int = Query(20, ge=1, le=100)):
+    """
+    최근 트레이스(작업 → 단계 → 수집기/Gemini 시도/게시 구간 트리)를 최신순으로 반환합니다.
+    """
+    return {"traces": recent_traces(limit)}
 
 @app.post("/trigger-report")
-async def trigger_report(background_tasks: BackgroundTasks):
+async def trigger_report():
     """
     리포트 생성을 수동으로 트리거합니다.
+    이미 실행 중인 작업이 있으면 새 작업을 만들지 않고 해당 작업의 ID를 반환합니다.
+    """
+    job, created = job_manager.submit(trigger="manual")
+    message = "백그라운드에서 리포트 생성이 시작되었습니다." if created else "이미 진행 중인 리포트 생성 작업에 합류했습니다."
+    return {"message": message, "job_id": job.id, "status": job.status, "attached": not created}
+
+@app.get("/jobs")
+def list_jobs(limit: int = Query(20, ge=1, le=50)):
+    """
+    최근 리포트 생성 작업 목록을 최신순으로 반환합니다.
+    """
+    return {"jobs": job_manager.recent(limit)}
+
+@app.get("/scheduler")
+def get_scheduler_status():
+    """
+    이 워커의 스케줄러 상태(모드, 리더 여부, 다음 실행 시각)를 반환합니다.
+    """
+    return scheduler.status()
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    리포트 생성 작업의 상태와 단계별 진행 상황/소요 시간을 반환합니다.
     """
-    background_tasks.add_task(job_generate_report)
-    return {"message": "백그라운드에서 리포트 생성이 시작되었습니다."}
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,217 @@
+"""
+Prometheus 텍스트 형식(/metrics)으로 노출하는 경량 메트릭 모듈입니다.
+Counter, Gauge(값 또는 조회 시 계산하는 함수), Histogram을 레이블별로 집계하며 외부 의존성이 없습니다.
+메트릭은 프로세스 단위로 집계됩니다. (여러 워커를 띄우면 워커별로 수집해야 함)
+"""
+import math
+import threading
+
+# 지연 시간 히스토그램 기본 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# 토큰 수 히스토그램 버킷
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or (isinstance(value, float) and value.is_integer()):
+        return str(int(value))
+    return repr(float(value))
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._function = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function):
+        """
+        조회(/metrics) 시점에 값을 계산하는 함수를 지정합니다. (레이블 없는 게이지 전용, None 반환 시 생략)
+        """
+        self._function = function
+
+    def _samples(self):
+        if self._function is not None:
+            value = self._function()
+            return [] if value is None else [f"{self.name} {_format_value(value)}"]
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self):
+        with self._lock:
+            items = [(key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items()]
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        등록된 모든 메트릭을 Prometheus 텍스트 형식(0.0.4)으로 반환합니다.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+# 프로세스 전역 레지스트리
+REGISTRY = Registry()
+
+# --- 공통 메트릭 정의 ---
+
+SPAN_DURATION = REGISTRY.histogram(
+    "silver_span_duration_seconds", "Duration of traced spans", ["span", "status"]
+)
+COLLECTOR_RUNS = REGISTRY.counter(
+    "silver_collector_runs_total", "Collector executions by outcome", ["collector", "outcome"]
+)
+COLLECTOR_DURATION = REGISTRY.histogram(
+    "silver_collector_duration_seconds", "Collector execution time", ["collector"]
+)
+LLM_ATTEMPTS = REGISTRY.counter(
+    "silver_llm_attempts_total", "Gemini call attempts by model, mode and outcome", ["model", "mode", "outcome"]
+)
+LLM_ATTEMPT_DURATION = REGISTRY.histogram(
+    "silver_llm_attempt_duration_seconds", "Gemini SDK call latency per attempt (excludes rate limit waits)", ["model", "mode"]
+)
+LLM_TOKENS = REGISTRY.histogram(
+    "silver_llm_tokens", "Prompt/response size per successful Gemini call (usage metadata or estimate)",
+    ["model", "direction"], buckets=TOKEN_BUCKETS,
+)
+LLM_CACHE_LOOKUPS = REGISTRY.counter(
+    "silver_llm_cache_lookups_total", "LLM response cache lookups", ["result"]
+)
+REPORT_PUBLISHES = REGISTRY.counter(
+    "silver_report_publishes_total", "Reports stored and published", ["source"]
+)
+REPORT_PUBLISH_DURATION = REGISTRY.histogram(
+    "silver_report_publish_duration_seconds", "Time to store a report and rebuild serialized views", ["source"]
+)
+LATEST_REPORT_AGE = REGISTRY.gauge(
+    "silver_latest_report_age_seconds", "Seconds since the latest stored report was generated"
+)
+JOB_RUNS = REGISTRY.counter(
+    "silver_jobs_total", "Report jobs by trigger and final status", ["trigger", "status"]
+)
+JOB_DURATION = REGISTRY.histogram(
+    "silver_job_duration_seconds", "Report job duration", ["trigger", "status"]
+)
+JOB_STAGE_DURATION = REGISTRY.histogram(
+    "silver_job_stage_duration_seconds", "Report job stage duration", ["stage", "status"]
+)
+JOB_OVERLAPS = REGISTRY.counter(
+    "silver_job_overlaps_total", "Triggers that arrived while a job was already running", ["trigger"]
+)
+JOBS_RUNNING = REGISTRY.gauge(
+    "silver_jobs_running", "Report jobs currently running"
+)
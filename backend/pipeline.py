@@ -0,0 +1,107 @@
+"""
+리포트 생성 파이프라인의 데이터 수집 단계를 담당하는 모듈입니다.
+시장/뉴스/유튜브 수집기를 스레드 풀에서 동시에 실행하고, 수집기별 제한 시간을 적용합니다.
+실패하거나 제한 시간을 넘긴 수집기는 빈 결과로 대체되어 나머지 결과(부분 결과)로 진행합니다.
+main.py의 정기 작업과 generate_static.py가 함께 사용합니다.
+"""
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from backend.collectors.market_data import collect_market_frames
+from backend.collectors.news_data import DEFAULT_NEWS_QUERIES, collect_news_data
+from backend.collectors.youtube_data import collect_youtube_transcripts
+from backend.storage.bar_store import get_bar_store
+from backend.metrics import COLLECTOR_DURATION, COLLECTOR_RUNS
+from backend.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# 뉴스 검색어 목록 (NEWS_QUERIES 환경 변수에 쉼표로 구분하여 지정 가능)
+NEWS_QUERIES = [q.strip() for q in os.getenv("NEWS_QUERIES", "").split(",") if q.strip()] or DEFAULT_NEWS_QUERIES
+YOUTUBE_PLACEHOLDER = "유튜브 스크립트 수집은 검색 기능 구현 후 연동 예정."
+
+# 수집기별 제한 시간 (초)
+COLLECTOR_TIMEOUTS = {
+    "market": float(os.getenv("MARKET_TIMEOUT_SEC", "60")),
+    "news": float(os.getenv("NEWS_TIMEOUT_SEC", "30")),
+    "youtube": float(os.getenv("YOUTUBE_TIMEOUT_SEC", "60")),
+}
+
+# 수집기 전용 스레드 풀
+# (제한 시간을 넘긴 호출은 취소할 수 없어 백그라운드에서 끝날 때까지 스레드를 점유하므로 여유 있게 둠)
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="collector")
+
+def _collect_market():
+    return collect_market_frames(store=get_bar_store())
+
+def _collect_news():
+    return collect_news_data(queries=NEWS_QUERIES, days=1)
+
+def _collect_youtube():
+    """
+    YOUTUBE_VIDEO_URLS에 지정된 영상과 YOUTUBE_CHANNELS에 지정된 채널의 최근 영상 자막을 수집합니다. (쉼표 구분)
+    둘 다 지정되지 않으면 안내 문구를 반환합니다.
+    """
+    urls = [url.strip() for url in os.getenv("YOUTUBE_VIDEO_URLS", "").split(",") if url.strip()]
+    channels = [c.strip() for c in os.getenv("YOUTUBE_CHANNELS", "").split(",") if c.strip()]
+    if not urls and not channels:
+        return YOUTUBE_PLACEHOLDER
+    return collect_youtube_transcripts(
+        urls, channels, videos_per_channel=int(os.getenv("YOUTUBE_VIDEOS_PER_CHANNEL", "3"))
+    )
+
+# 수집기 이름 -> (수집 함수, 실패 시 기본값 생성 함수)
+COLLECTORS = {
+    "market": (_collect_market, dict),
+    "news": (_collect_news, list),
+    "youtube": (_collect_youtube, lambda: YOUTUBE_PLACEHOLDER),
+}
+
+async def _run_collector(name: str, timeout: float):
+    func, default = COLLECTORS[name]
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    with span(f"collector.{name}", timeout_sec=timeout) as current:
+        try:
+            result = await asyncio.wait_for(loop.run_in_executor(_executor, func), timeout=timeout)
+            error, outcome = None, "success"
+        except asyncio.TimeoutError:
+            result, error, outcome = default(), f"timed out after {timeout:.0f}s", "timeout"
+        except Exception as e:
+            result, error, outcome = default(), str(e), "error"
+        current.set(outcome=outcome)
+        if error:
+            current.status, current.error = "error", error
+    elapsed = time.perf_counter() - started
+    COLLECTOR_RUNS.inc(collector=name, outcome=outcome)
+    COLLECTOR_DURATION.observe(elapsed, collector=name)
+    if error:
+        logger.warning(f"{name} 수집 실패 ({elapsed:.2f}s): {error}")
+    else:
+        logger.info(f"{name} 수집 완료 ({elapsed:.2f}s)")
+    return result, error, elapsed
+
+async def collect_inputs(timeouts: dict = None) -> dict:
+    """
+    모든 수집기를 동시에 실행하고 결과를 반환합니다.
+    반환값: market_frames(자산별 DataFrame), news_data, youtube_data,
+           errors(수집기별 오류 메시지), timings(수집기별 소요 시간, 초)
+    """
+    timeouts = {**COLLECTOR_TIMEOUTS, **(timeouts or {})}
+    names = list(COLLECTORS)
+    results = await asyncio.gather(*(_run_collector(name, timeouts[name]) for name in names))
+    outputs = dict(zip(names, results))
+
+    market_frames = outputs["market"][0] or {}
+    return {
+        "market_frames": {name: df for name, df in market_frames.items() if isinstance(df, pd.DataFrame)},
+        "news_data": outputs["news"][0],
+        "youtube_data": outputs["youtube"][0],
+        "errors": {name: out[1] for name, out in outputs.items() if out[1]},
+        "timings": {name: round(out[2], 3) for name, out in outputs.items()},
+    }
@@ -0,0 +1,339 @@
+"""
+외부 API 호출 속도를 제한하는 토큰 버킷과 재시도(지수 백오프) 모듈입니다.
+acquire()는 토큰이 모자라면 실패하지 않고 채워질 때까지 기다립니다. (요청이 버스트를 넘으면 대기열처럼 순서대로 진행)
+제한기는 이름별로 프로세스 전역에서 공유됩니다.
+
+RATE_LIMIT_BACKEND
+- sqlite(기본값): 버킷 상태를 SQLite 파일(RATE_LIMIT_STATE_PATH)에 두어 같은 호스트의 워커 프로세스들이 한도를 나눠 씁니다.
+- memory: 프로세스마다 따로 계산합니다. (이전 동작)
+
+제공자(gemini, tavily, yf)별 한도와 재시도 설정은 RATE_LIMIT_<제공자>_<항목> 환경 변수로 바꿀 수 있습니다.
+(RPM: 분당 요청 수, TPM: 분당 토큰 수, BURST: 버킷 크기, RETRIES: 재시도 횟수, 0이면 제한/재시도 없음)
+ProviderLimiter.call()은 한도 초과(429, quota)와 일시적 오류(5xx, 시간 초과, 연결 오류)를
+지터가 있는 지수 백오프로 재시도하며, 한도 초과 응답을 받으면 버킷을 비워 다른 요청/워커도 함께 기다리게 합니다.
+"""
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+
+from backend.metrics import REGISTRY
+from backend.storage.bar_store import DEFAULT_DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "sqlite").lower()
+RATE_LIMIT_STATE_PATH = os.getenv("RATE_LIMIT_STATE_PATH", os.path.join(DEFAULT_DATA_DIR, "ratelimit.sqlite3"))
+
+# 제공자별 기본 한도 (환경 변수가 없을 때 사용, burst를 생략하면 분당 허용량의 1/6)
+PROVIDER_DEFAULTS = {
+    # Gemini 한도는 모델별로 적용되므로 제한기도 모델별로 만듦 (무료 등급 flash 기준)
+    "gemini": {"rpm": 15, "tpm": 1_000_000, "burst": 4, "retries": 3},
+    "tavily": {"rpm": 100, "retries": 3},
+    # 야후 파이낸스는 market_data의 MARKET_REQUESTS_PER_MIN/MARKET_RATE_BURST를 사용
+    "yf": {"rpm": 1200, "burst": 200, "retries": 2},
+}
+# 재시도 대기 시간: 0 ~ min(BACKOFF_MAX, BACKOFF_BASE * 2^시도) 사이의 무작위 값 (full jitter)
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_MAX = 60.0
+
+RATE_LIMIT_WAIT = REGISTRY.counter(
+    "silver_rate_limit_wait_seconds_total", "Time spent waiting for rate limiter tokens", ["limiter"]
+)
+RATE_LIMIT_RETRIES = REGISTRY.counter(
+    "silver_rate_limit_retries_total", "External API calls retried after a rate limit or transient error",
+    ["limiter", "reason"],
+)
+
+class RateLimitExceeded(Exception):
+    """
+    제공자가 한도 초과를 예외 대신 다른 방식으로 알린 경우 재시도를 위해 발생시키는 예외
+    """
+
+_RATE_LIMIT_PATTERN = re.compile(
+    r"\b429\b|rate.?limit|too many requests|quota|resource.?exhausted", re.IGNORECASE
+)
+_TRANSIENT_PATTERN = re.compile(
+    r"\b50[0234]\b|timed? ?out|temporarily unavailable|service unavailable|connection (reset|aborted|refused)",
+    re.IGNORECASE,
+)
+
+def _status_code(error: Exception):
+    for attr in ("status_code", "code", "status"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+def classify_error(error: Exception):
+    """
+    재시도할 오류인지 분류합니다. 반환값: "rate_limit", "transient" 또는 None (재시도하지 않음)
+    SDK를 임포트하지 않도록 상태 코드, 예외 클래스 이름, 메시지로 판단합니다.
+    """
+    if isinstance(error, RateLimitExceeded):
+        return "rate_limit"
+    status = _status_code(error)
+    text = f"{type(error).__name__} {error}"
+    if status == 429 or _RATE_LIMIT_PATTERN.search(text):
+        return "rate_limit"
+    if (status is not None and 500 <= status < 600) or isinstance(error, (ConnectionError, TimeoutError)):
+        return "transient"
+    if _TRANSIENT_PATTERN.search(text) or "DeadlineExceeded" in text or "ServiceUnavailable" in text:
+        return "transient"
+    return None
+
+def _retry_after(error: Exception):
+    """
+    응답의 Retry-After(초)가 있으면 반환합니다.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    def __init__(self, name: str, per_minute: float, burst: float = None):
+        """
+        per_minute: 분당 허용 요청 수 (0 이하이면 제한 없음)
+        burst: 버킷 크기 (한 번에 기다리지 않고 보낼 수 있는 요청 수, 기본값: 분당 허용량의 1/6)
+        """
+        self.name = name
+        self.rate = per_minute / 60.0 if per_minute and per_minute > 0 else 0.0
+        self.capacity = float(burst) if burst else max(1.0, self.rate * 10)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _update(self, change):
+        """
+        버킷을 채운 뒤 change(현재 토큰 수) -> (새 토큰 수, 반환값)를 원자적으로 적용합니다.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens, result = change(self._tokens)
+            return result
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        토큰을 사용합니다. 버킷 크기보다 큰 요청은 버킷이 가득 찰 때까지 기다린 뒤 모자란 만큼을 다음 요청에 넘깁니다.
+        반환값: 기다린 시간 (초)
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        def reserve(available):
+            # 앞선 요청이 남긴 부족분(음수 토큰)까지 포함해 필요한 토큰이 찰 때까지의 시간
+            wait = max(0.0, (min(tokens, self.capacity) - available) / self.rate)
+            return available - tokens, wait
+
+        wait = self._update(reserve)
+        if wait > 0:
+            RATE_LIMIT_WAIT.inc(wait, limiter=self.name)
+            time.sleep(wait)
+        return wait
+
+    def consume(self, tokens: float):
+        """
+        기다리지 않고 토큰을 사용합니다. (응답을 받은 뒤 실제 사용량을 반영할 때, 부족분은 다음 요청이 기다림)
+        """
+        if self.rate > 0 and tokens > 0:
+            self._update(lambda available: (available - tokens, None))
+
+    def drain(self):
+        """
+        남은 토큰을 비웁니다. 제공자가 한도 초과를 알렸을 때 이후 요청이 버킷이 다시 찰 때까지 기다리게 합니다.
+        """
+        if self.rate > 0:
+            self._update(lambda available: (min(available, 0.0), None))
+
+class SharedTokenBucket(TokenBucket):
+    """
+    상태(남은 토큰, 갱신 시각)를 SQLite 파일에 저장하여 여러 프로세스가 함께 쓰는 토큰 버킷입니다.
+    BEGIN IMMEDIATE 트랜잭션으로 읽기-계산-쓰기를 원자적으로 처리하며, 대기(sleep)는 트랜잭션 밖에서 합니다.
+    연결은 버킷마다 하나를 열어 두고 재사용합니다. (스키마 설정은 처음 연결할 때 한 번만, 사용은 버킷 잠금으로 직렬화)
+    파일을 쓸 수 없으면 경고를 남기고 프로세스 내부 상태로 계속 동작합니다.
+    """
+    def __init__(self, name: str, per_minute: float, burst: float = None, path: str = None):
+        super().__init__(name, per_minute, burst)
+        self.path = path or RATE_LIMIT_STATE_PATH
+        self._local = False
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+                )
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    def _close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def _update(self, change):
+        if self._local:
+            return super()._update(change)
+        try:
+            # 같은 프로세스의 스레드끼리는 먼저 직렬화하여 파일 잠금 경합을 줄임 (연결도 이 잠금 안에서만 사용)
+            with self._lock:
+                conn = self._connection()
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    row = conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)).fetchone()
+                    now = time.time()
+                    available = self.capacity if row is None else min(
+                        self.capacity, row[0] + max(0.0, now - row[1]) * self.rate
+                    )
+                    available, result = change(available)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                        (self.name, available, now),
+                    )
+                    conn.execute("COMMIT")
+                    return result
+                except BaseException:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    raise
+        except sqlite3.Error as e:
+            logger.warning(f"Shared rate limiter state unavailable ({self.path}), using per-process limits: {e}")
+            with self._lock:
+                self._close()
+            self._local = True
+            return super()._update(change)
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(name: str, per_minute: float, burst: float = None) -> TokenBucket:
+    """
+    이름별 공유 제한기를 반환합니다. (처음 호출할 때의 설정으로 생성)
+    RATE_LIMIT_BACKEND=sqlite이면 다른 프로세스와 상태를 공유하는 제한기를 만듭니다.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            if RATE_LIMIT_BACKEND == "sqlite":
+                limiter = SharedTokenBucket(name, per_minute, burst)
+            else:
+                limiter = TokenBucket(name, per_minute, burst)
+            _limiters[name] = limiter
+        return limiter
+
+class ProviderLimiter:
+    """
+    외부 API 제공자 하나의 한도(분당 요청 수, 분당 토큰 수)와 재시도 정책입니다.
+    """
+    def __init__(self, name: str, requests: TokenBucket, tokens: TokenBucket = None, retries: int = 3,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE, backoff_max: float = DEFAULT_BACKOFF_MAX):
+        self.name = name
+        self.requests = requests
+        self.tokens = tokens
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def acquire(self, requests: float = 1, tokens: float = 0) -> float:
+        """
+        요청 수와 토큰 수 한도가 모두 허용할 때까지 기다립니다. 반환값: 기다린 시간 (초)
+        """
+        wait = self.requests.acquire(requests)
+        if tokens and self.tokens is not None:
+            wait += self.tokens.acquire(tokens)
+        return wait
+
+    def record_usage(self, tokens: float):
+        """
+        응답을 받은 뒤 추가로 사용한 토큰(예: 응답 토큰)을 분당 토큰 한도에 반영합니다.
+        """
+        if self.tokens is not None:
+            self.tokens.consume(tokens)
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def call(self, func, *args, requests: float = 1, tokens: float = 0, **kwargs):
+        """
+        한도 안에서 func(*args, **kwargs)를 호출합니다.
+        한도 초과/일시적 오류는 최대 retries번까지 백오프 후 다시 시도하고, 그 밖의 오류나 마지막 실패는 그대로 발생시킵니다.
+        """
+        attempt = 0
+        while True:
+            self.acquire(requests, tokens)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                reason = classify_error(e)
+                if reason is None or attempt >= self.retries:
+                    raise
+                if reason == "rate_limit":
+                    self.requests.drain()
+                # Retry-After가 길어도 backoff_max를 넘겨 기다리지 않음 (실행 스레드를 오래 붙잡지 않도록)
+                delay = min(self.backoff_max, max(self.backoff(attempt), _retry_after(e) or 0.0))
+                RATE_LIMIT_RETRIES.inc(limiter=self.name, reason=reason)
+                logger.warning(
+                    f"{self.name}: {reason} error, retrying in {delay:.1f}s "
+                    f"(attempt {attempt + 1}/{self.retries}): {e}"
+                )
+                time.sleep(delay)
+                attempt += 1
+
+def provider_config(provider: str, **overrides) -> dict:
+    """
+    제공자 설정을 반환합니다. 우선순위: 인자 > RATE_LIMIT_<제공자>_<항목> 환경 변수 > PROVIDER_DEFAULTS
+    """
+    config = {"rpm": 0, "tpm": 0, "burst": None, "retries": 3,
+              "backoff_base": DEFAULT_BACKOFF_BASE, "backoff_max": DEFAULT_BACKOFF_MAX}
+    config.update(PROVIDER_DEFAULTS.get(provider, {}))
+    for key in config:
+        value = os.getenv(f"RATE_LIMIT_{provider.upper()}_{key.upper()}")
+        if value:
+            config[key] = float(value)
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    config["retries"] = int(config["retries"])
+    return config
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+def get_provider_limiter(provider: str, scope: str = None, **overrides) -> ProviderLimiter:
+    """
+    제공자(및 scope, 예: Gemini 모델 이름)별 공유 제한기를 반환합니다. (처음 호출할 때의 설정으로 생성)
+    overrides: rpm, tpm, burst, retries, backoff_base, backoff_max
+    """
+    name = f"{provider}:{scope}" if scope else provider
+    with _providers_lock:
+        limiter = _providers.get(name)
+        if limiter is None:
+            config = provider_config(provider, **overrides)
+            limiter = _providers[name] = ProviderLimiter(
+                name,
+                get_rate_limiter(name, config["rpm"], config["burst"]),
+                get_rate_limiter(f"{name}:tokens", config["tpm"]) if config["tpm"] else None,
+                retries=config["retries"],
+                backoff_base=config["backoff_base"],
+                backoff_max=config["backoff_max"],
+            )
+        return limiter
@@ -0,0 +1,156 @@
+"""
+정기 리포트 스케줄러의 수명 주기를 관리하는 모듈입니다.
+FastAPI lifespan에서 start()/shutdown()을 호출하며, 모듈 임포트만으로는 스케줄러가 시작되지 않습니다.
+
+SCHEDULER_MODE
+- leader(기본값): 데이터 디렉터리의 잠금 파일을 먼저 잡은 워커 하나만 스케줄링합니다.
+  나머지 워커는 주기적으로 잠금을 다시 시도하여 리더 프로세스가 종료되면 이어받습니다. (같은 호스트의 워커 간)
+- all: 모든 프로세스가 각자 스케줄링합니다. (이전 동작)
+- off: 스케줄링하지 않습니다. (수동 트리거/외부 cron만 사용)
+"""
+import logging
+import os
+import threading
+
+from backend.metrics import REGISTRY
+from backend.storage.bar_store import DEFAULT_DATA_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_MODES = ("leader", "all", "off")
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "leader").lower()
+# 정기 리포트 생성 주기 (분)
+SCHEDULER_INTERVAL_MIN = float(os.getenv("SCHEDULER_INTERVAL_MIN", "60"))
+# 리더 잠금 파일 경로 및 리더가 아닌 워커의 재시도 주기 (초)
+SCHEDULER_LOCK_PATH = os.getenv("SCHEDULER_LOCK_PATH", os.path.join(DEFAULT_DATA_DIR, "scheduler.lock"))
+SCHEDULER_RETRY_SEC = float(os.getenv("SCHEDULER_RETRY_SEC", "30"))
+
+SCHEDULER_LEADER = REGISTRY.gauge(
+    "silver_scheduler_leader", "1 if this process runs the report scheduler"
+)
+
+class LeaderLock:
+    """
+    파일 잠금(flock) 기반 리더 선출. 잠금은 프로세스가 종료되면 운영체제가 자동으로 해제합니다.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        """
+        잠금을 기다리지 않고 시도합니다. 이미 다른 프로세스가 잡고 있으면 False를 반환합니다.
+        """
+        if self._file is not None:
+            return True
+        if fcntl is None:
+            logger.warning("fcntl unavailable; scheduler leader election disabled (acting as leader)")
+            self._file = False
+            return True
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        f = open(self.path, "a+")
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        self._file = f
+        return True
+
+    def release(self):
+        if self._file:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+        self._file = None
+
+class ReportScheduler:
+    def __init__(self, job_func, interval_min: float = SCHEDULER_INTERVAL_MIN, mode: str = SCHEDULER_MODE,
+                 lock_path: str = SCHEDULER_LOCK_PATH, retry_sec: float = SCHEDULER_RETRY_SEC):
+        if mode not in SCHEDULER_MODES:
+            raise ValueError(f"SCHEDULER_MODE must be one of {SCHEDULER_MODES}, got '{mode}'")
+        self.job_func = job_func
+        self.interval_min = interval_min
+        self.mode = mode
+        self.retry_sec = retry_sec
+        self._lock = LeaderLock(lock_path)
+        self._scheduler = None
+        self._stop = threading.Event()
+        self._follower = None
+        self._state_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._scheduler is not None
+
+    def _start_scheduler(self):
+        # apscheduler는 스케줄링하는 프로세스에서만 필요하므로 이 시점에 불러옴
+        from apscheduler.schedulers.background import BackgroundScheduler
+
+        with self._state_lock:
+            if self._scheduler is not None or self._stop.is_set():
+                return
+            scheduler = BackgroundScheduler()
+            scheduler.add_job(self.job_func, "interval", minutes=self.interval_min, id="generate_report")
+            scheduler.start()
+            self._scheduler = scheduler
+        SCHEDULER_LEADER.set(1)
+        logger.info(f"Report scheduler started (mode={self.mode}, every {self.interval_min:g} min, pid={os.getpid()})")
+
+    def _follow(self):
+        """
+        리더가 아닌 워커: 잠금을 얻을 때까지 주기적으로 재시도합니다.
+        """
+        while not self._stop.wait(self.retry_sec):
+            if self._lock.try_acquire():
+                logger.info("Scheduler leader lock acquired; taking over scheduling")
+                self._start_scheduler()
+                return
+
+    def start(self):
+        self._stop.clear()
+        SCHEDULER_LEADER.set(0)
+        if self.mode == "off":
+            logger.info("Report scheduler disabled (SCHEDULER_MODE=off)")
+            return
+        if self.mode == "all" or self._lock.try_acquire():
+            self._start_scheduler()
+            return
+        logger.info(f"Another worker holds the scheduler lock; standing by (pid={os.getpid()})")
+        self._follower = threading.Thread(target=self._follow, name="scheduler-follower", daemon=True)
+        self._follower.start()
+
+    def shutdown(self):
+        self._stop.set()
+        if self._follower is not None:
+            self._follower.join(timeout=5)
+            self._follower = None
+        with self._state_lock:
+            scheduler, self._scheduler = self._scheduler, None
+        if scheduler is not None:
+            scheduler.shutdown(wait=False)
+        self._lock.release()
+        SCHEDULER_LEADER.set(0)
+
+    def status(self) -> dict:
+        role = "disabled" if self.mode == "off" else ("leader" if self.running else "standby")
+        next_run = None
+        scheduler = self._scheduler
+        if scheduler is not None:
+            job = scheduler.get_job("generate_report")
+            if job is not None and job.next_run_time is not None:
+                next_run = job.next_run_time.isoformat()
+        return {"mode": self.mode, "role": role, "interval_min": self.interval_min, "pid": os.getpid(),
+                "next_run": next_run}
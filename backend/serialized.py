@@ -0,0 +1,150 @@
+"""
+자주 조회되는 API 응답을 미리 직렬화해 두는 모듈입니다.
+새 리포트가 게시될 때 한 번만 JSON 바이트(및 gzip/brotli 압축본)와 ETag를 만들고,
+요청마다 재인코딩 없이 그대로 반환합니다. If-None-Match가 일치하면 304를 반환합니다.
+"""
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 사용
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip만 제공
+    brotli = None
+
+# 이 크기보다 작은 응답은 압축하지 않음 (바이트)
+MIN_COMPRESS_SIZE = 1024
+
+def dumps(obj) -> bytes:
+    """
+    객체를 압축된(공백 없는) JSON 바이트로 직렬화합니다. orjson이 있으면 사용합니다.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+class Payload:
+    """
+    미리 직렬화된 응답 (원본/압축 바이트와 ETag)
+    """
+    __slots__ = ("body", "etag", "gzip", "br")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        # 압축본과 같은 ETag를 공유하므로 약한(weak) ETag 사용
+        self.etag = f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+        compress = len(body) >= MIN_COMPRESS_SIZE
+        self.gzip = gzip.compress(body, compresslevel=6) if compress else None
+        self.br = brotli.compress(body, quality=5) if compress and brotli is not None else None
+
+def build_payload(obj) -> Payload:
+    return Payload(dumps(obj))
+
+def _accepted_encodings(header: str) -> set:
+    encodings = set()
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        if token and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            encodings.add(token.strip().lower())
+    return encodings
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # 약한 비교: W/ 접두사를 무시하고 비교
+    return _strip_weak(etag) in {_strip_weak(tag) for tag in header.split(",")}
+
+def serve_payload(request: Request, payload: Payload) -> Response:
+    """
+    요청 헤더(If-None-Match, Accept-Encoding)에 맞춰 미리 직렬화된 응답을 반환합니다.
+    """
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if _etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    accepted = _accepted_encodings(request.headers.get("accept-encoding"))
+    if payload.br is not None and "br" in accepted:
+        headers["Content-Encoding"] = "br"
+        body = payload.br
+    elif payload.gzip is not None and "gzip" in accepted:
+        headers["Content-Encoding"] = "gzip"
+        body = payload.gzip
+    else:
+        body = payload.body
+    return Response(content=body, media_type="application/json", headers=headers)
+
+class PublishedPayloads:
+    """
+    최신 리포트 기준의 응답 묶음을 보관합니다.
+    최신 리포트 ID가 바뀌면(다른 워커가 게시한 경우 포함) 모든 응답을 한 번에 다시 직렬화합니다.
+    """
+    def __init__(self, load_latest, build_views, max_derived: int = 64):
+        """
+        load_latest: 최신 리포트(dict)를 반환하는 함수
+        build_views: 리포트를 받아 {view 이름: 직렬화할 객체}를 반환하는 함수
+        max_derived: 요청 파라미터별 파생 응답(get_derived)을 보관할 최대 개수
+        """
+        self._load_latest = load_latest
+        self._build_views = build_views
+        self._key = object()
+        self._payloads = {}
+        self._derived = OrderedDict()
+        self._max_derived = max_derived
+        self._lock = threading.Lock()
+
+    def refresh(self, report: dict = None):
+        """
+        주어진(또는 최신) 리포트로 모든 응답을 직렬화합니다. 새 리포트를 게시한 직후 호출합니다.
+        """
+        report = report if report is not None else self._load_latest()
+        payloads = {view: build_payload(obj) for view, obj in self._build_views(report).items()}
+        with self._lock:
+            self._key = report.get("id")
+            self._payloads = payloads
+            self._derived.clear()
+
+    def get(self, view: str) -> Payload:
+        report = self._load_latest()
+        with self._lock:
+            if report.get("id") == self._key and view in self._payloads:
+                return self._payloads[view]
+        self.refresh(report)
+        with self._lock:
+            return self._payloads[view]
+
+    def get_derived(self, key, build) -> Payload:
+        """
+        요청 파라미터(key)별로 만든 응답을 최신 리포트 기준으로 캐시합니다. (LRU, 새 리포트가 게시되면 비움)
+        build: 리포트를 받아 직렬화할 객체를 반환하는 함수
+        """
+        report = self._load_latest()
+        with self._lock:
+            current = report.get("id") == self._key
+            payload = self._derived.get(key) if current else None
+            if payload is not None:
+                self._derived.move_to_end(key)
+                return payload
+        if not current:
+            self.refresh(report)
+        payload = build_payload(build(report))
+        with self._lock:
+            if report.get("id") == self._key:
+                self._derived[key] = payload
+                while len(self._derived) > self._max_derived:
+                    self._derived.popitem(last=False)
+        return payload
@@ -0,0 +1,138 @@
+"""
+정적 배포용 데이터를 매니페스트와 내용 해시 파일명의 샤드로 저장하는 모듈입니다.
+리포트, 뉴스, 지표, 자산별 시장 데이터(및 시간 단위별로 미리 집계한 시장 데이터)를 각각 공백 없는 JSON 샤드로 나누고
+(shards/<이름>.<해시>.json), 매니페스트(manifest.json)에는 샤드 경로만 기록합니다.
+내용이 같으면 파일명도 같으므로 이미 있는 샤드는 다시 쓰지 않으며, 브라우저/CDN에서 오래 캐시할 수 있습니다.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+
+from backend.serialized import dumps
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 .gz만 생성
+    brotli = None
+
+MANIFEST_NAME = "manifest.json"
+SHARD_DIR = "shards"
+MANIFEST_VERSION = 1
+
+# 파일명 해시 길이 (16진수 문자)
+HASH_CHARS = 16
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^0-9A-Za-z_-]+", "_", name).strip("_") or "shard"
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def write_shard(output_dir: str, name: str, obj, precompress: bool = False) -> dict:
+    """
+    객체를 샤드 파일로 저장하고 매니페스트 항목({"path", "bytes", "sha256"})을 반환합니다.
+    같은 내용의 샤드가 이미 있으면 쓰지 않습니다. (반환값의 written으로 구분)
+    """
+    body = dumps(obj)
+    digest = hashlib.sha256(body).hexdigest()
+    relative = f"{SHARD_DIR}/{_slug(name)}.{digest[:HASH_CHARS]}.json"
+    path = os.path.join(output_dir, relative)
+
+    written = not os.path.exists(path)
+    if written:
+        _write_atomic(path, body)
+    if precompress:
+        if not os.path.exists(f"{path}.gz"):
+            _write_atomic(f"{path}.gz", gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None and not os.path.exists(f"{path}.br"):
+            _write_atomic(f"{path}.br", brotli.compress(body, quality=11))
+    return {"path": relative, "bytes": len(body), "sha256": digest, "written": written}
+
+def _public(entry: dict) -> dict:
+    return {key: value for key, value in entry.items() if key != "written"}
+
+def _public_tree(entry: dict) -> dict:
+    if "path" in entry:
+        return _public(entry)
+    return {key: _public_tree(item) for key, item in entry.items()}
+
+def _manifest_paths(manifest: dict) -> set:
+    paths = set()
+    pending = list((manifest or {}).get("shards", {}).values())
+    while pending:
+        entry = pending.pop()
+        if "path" in entry:
+            paths.add(entry["path"])
+        else:
+            pending.extend(entry.values())
+    return paths
+
+def _load_manifest(output_dir: str) -> dict:
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _prune(output_dir: str, keep: set):
+    """
+    매니페스트에서 참조하지 않는 샤드(및 압축본)를 삭제합니다.
+    """
+    shard_dir = os.path.join(output_dir, SHARD_DIR)
+    for filename in os.listdir(shard_dir):
+        base = filename
+        for suffix in (".gz", ".br", ".tmp"):
+            if base.endswith(suffix):
+                base = base[:-len(suffix)]
+        if f"{SHARD_DIR}/{base}" not in keep:
+            os.remove(os.path.join(shard_dir, filename))
+
+def write_static_output(output_dir: str, report_data: dict, orient: str = "records", precompress: bool = False) -> dict:
+    """
+    리포트 데이터를 샤드로 나눠 저장하고 매니페스트를 갱신합니다.
+    샤드: reports(타임스탬프+리포트 본문), news, indicators, market/<자산>, market_tiers/<timeframe>/<자산>
+    직전 매니페스트의 샤드는 로딩 중인 클라이언트를 위해 남겨두고, 그보다 오래된 샤드는 삭제합니다.
+    반환값: 새 매니페스트 (각 샤드의 written 포함)
+    """
+    os.makedirs(os.path.join(output_dir, SHARD_DIR), exist_ok=True)
+    previous = _load_manifest(output_dir)
+
+    shards = {
+        "reports": write_shard(output_dir, "reports", {
+            "timestamp": report_data.get("timestamp"),
+            "bullish_report": report_data.get("bullish_report"),
+            "bearish_report": report_data.get("bearish_report"),
+        }, precompress),
+        "news": write_shard(output_dir, "news", report_data.get("news_data") or [], precompress),
+        "indicators": write_shard(output_dir, "indicators", report_data.get("indicators") or {}, precompress),
+        "market": {
+            asset: write_shard(output_dir, f"market-{asset}", data, precompress)
+            for asset, data in (report_data.get("market_data") or {}).items()
+        },
+        "market_tiers": {
+            timeframe: {
+                asset: write_shard(output_dir, f"market-{timeframe}-{asset}", data, precompress)
+                for asset, data in tier.items()
+            }
+            for timeframe, tier in (report_data.get("market_tiers") or {}).items()
+        },
+    }
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "timestamp": report_data.get("timestamp"),
+        "market_orient": orient,
+        "assets": report_data.get("assets") or [{"name": asset} for asset in shards["market"]],
+        "shards": {name: _public_tree(entry) for name, entry in shards.items()},
+    }
+    # 매니페스트는 해시 파일명이 아니므로 항상 새로 씀 (짧은 캐시 대상)
+    _write_atomic(os.path.join(output_dir, MANIFEST_NAME), json.dumps(manifest, ensure_ascii=False).encode("utf-8"))
+    _prune(output_dir, _manifest_paths(manifest) | _manifest_paths(previous))
+
+    manifest["shards"] = shards
+    return manifest
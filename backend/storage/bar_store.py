@@ -0,0 +1,167 @@
+"""
+OHLCV 봉 데이터를 로컬 SQLite 파일에 저장하는 모듈입니다.
+(ticker, interval, timestamp)를 기본 키로 사용하며, 새로 받은 봉은 upsert로 병합합니다.
+"""
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_DATA_DIR = os.getenv("DATA_DIR", os.path.join(PROJECT_ROOT, "data"))
+DEFAULT_DB_PATH = os.getenv("BAR_STORE_PATH", os.path.join(DEFAULT_DATA_DIR, "bars.sqlite3"))
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    ticker   TEXT    NOT NULL,
+    interval TEXT    NOT NULL,
+    ts       INTEGER NOT NULL,
+    open     REAL,
+    high     REAL,
+    low      REAL,
+    close    REAL,
+    volume   REAL,
+    PRIMARY KEY (ticker, interval, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS series (
+    ticker       TEXT NOT NULL,
+    interval     TEXT NOT NULL,
+    tz           TEXT,
+    index_name   TEXT,
+    covered_from INTEGER,
+    PRIMARY KEY (ticker, interval)
+);
+"""
+
+def to_epoch_seconds(index):
+    """
+    DatetimeIndex를 UTC 기준 epoch 초(int64 배열)로 변환합니다.
+    """
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("s").asi8
+
+class BarStore:
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_series_info(self, ticker: str, interval: str):
+        """
+        저장된 시계열의 메타 정보(타임존, 커버 시작 시점, 마지막 봉 시각)를 반환합니다.
+        저장된 데이터가 없으면 None을 반환합니다.
+        """
+        with self._connect() as conn:
+            meta = conn.execute(
+                "SELECT tz, index_name, covered_from FROM series WHERE ticker = ? AND interval = ?",
+                (ticker, interval),
+            ).fetchone()
+            last = conn.execute(
+                "SELECT MAX(ts) FROM bars WHERE ticker = ? AND interval = ?",
+                (ticker, interval),
+            ).fetchone()
+        if meta is None or last is None or last[0] is None:
+            return None
+        tz, index_name, covered_from = meta
+        return {
+            "tz": tz,
+            "index_name": index_name,
+            "covered_from": pd.Timestamp(covered_from, unit="s", tz="UTC") if covered_from is not None else None,
+            "last_ts": pd.Timestamp(last[0], unit="s", tz="UTC"),
+        }
+
+    def upsert(self, ticker: str, interval: str, df: pd.DataFrame, covered_from=None) -> int:
+        """
+        봉 데이터를 저장합니다. 같은 타임스탬프의 기존 봉은 새 값으로 덮어씁니다.
+        covered_from이 주어지면 해당 시점부터 빠짐없이 저장되어 있다고 기록합니다.
+        """
+        if df is None or df.empty:
+            return 0
+        frame = df.reindex(columns=OHLCV_COLUMNS)
+        ts = to_epoch_seconds(pd.DatetimeIndex(frame.index))
+        values = frame.to_numpy(dtype="float64", na_value=float("nan"))
+        rows = [
+            (ticker, interval, int(t), *(None if v != v else float(v) for v in row))
+            for t, row in zip(ts, values)
+        ]
+        tz = str(frame.index.tz) if getattr(frame.index, "tz", None) is not None else None
+        covered = int(covered_from.timestamp()) if covered_from is not None else None
+
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO bars (ticker, interval, ts, open, high, low, close, volume)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (ticker, interval, ts) DO UPDATE SET
+                    open = excluded.open, high = excluded.high, low = excluded.low,
+                    close = excluded.close, volume = excluded.volume
+                """,
+                rows,
+            )
+            conn.execute(
+                """
+                INSERT INTO series (ticker, interval, tz, index_name, covered_from)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (ticker, interval) DO UPDATE SET
+                    tz = excluded.tz,
+                    index_name = excluded.index_name,
+                    covered_from = CASE
+                        WHEN excluded.covered_from IS NULL THEN series.covered_from
+                        WHEN series.covered_from IS NULL THEN excluded.covered_from
+                        ELSE MIN(series.covered_from, excluded.covered_from)
+                    END
+                """,
+                (ticker, interval, tz, frame.index.name or "Datetime", covered),
+            )
+        return len(rows)
+
+    def load(self, ticker: str, interval: str, start=None, end=None) -> pd.DataFrame:
+        """
+        저장된 봉 데이터를 yfinance와 같은 형태(시간 인덱스 + OHLCV 컬럼)의 DataFrame으로 반환합니다.
+        """
+        query = "SELECT ts, open, high, low, close, volume FROM bars WHERE ticker = ? AND interval = ?"
+        params = [ticker, interval]
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(int(pd.Timestamp(start).timestamp()))
+        if end is not None:
+            query += " AND ts <= ?"
+            params.append(int(pd.Timestamp(end).timestamp()))
+        query += " ORDER BY ts"
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+            meta = conn.execute(
+                "SELECT tz, index_name FROM series WHERE ticker = ? AND interval = ?",
+                (ticker, interval),
+            ).fetchone()
+        if not rows:
+            return pd.DataFrame()
+
+        tz, index_name = meta if meta else (None, "Datetime")
+        df = pd.DataFrame(rows, columns=["ts"] + OHLCV_COLUMNS)
+        index = pd.to_datetime(df.pop("ts"), unit="s", utc=True)
+        index = index.dt.tz_convert(tz) if tz else index.dt.tz_localize(None)
+        df.index = pd.DatetimeIndex(index, name=index_name or "Datetime")
+        return df
+
+# 싱글톤 인스턴스 플레이스홀더
+bar_store = None
+
+def get_bar_store():
+    global bar_store
+    if bar_store is None:
+        bar_store = BarStore()
+    return bar_store
@@ -0,0 +1,193 @@
+"""
+생성된 리포트와 당시의 시장/뉴스 스냅샷을 SQLite에 저장하는 모듈입니다.
+리포트 메타데이터와 스냅샷을 분리 저장하여 이력 조회 시 대용량 스냅샷을 읽지 않으며,
+최신 리포트는 프로세스 내 캐시로 반환하며, 장기 연결의 PRAGMA data_version이 바뀐 경우에만
+MAX(id)를 다시 조회합니다. (여러 워커가 같은 파일을 공유)
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from .bar_store import DEFAULT_DATA_DIR
+
+DEFAULT_REPORT_DB_PATH = os.getenv("REPORT_STORE_PATH", os.path.join(DEFAULT_DATA_DIR, "reports.sqlite3"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp      TEXT NOT NULL,
+    ts             REAL NOT NULL,
+    bullish_report TEXT,
+    bearish_report TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reports_ts ON reports (ts);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    report_id      INTEGER PRIMARY KEY REFERENCES reports (id) ON DELETE CASCADE,
+    market_data    TEXT,
+    market_columns TEXT,
+    news_data      TEXT,
+    indicators     TEXT
+);
+"""
+
+def _to_epoch(value) -> float:
+    """
+    ISO 형식 문자열 또는 datetime을 epoch 초로 변환합니다.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+class ReportStore:
+    def __init__(self, path: str = DEFAULT_REPORT_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._latest = None
+        # 최신 리포트 확인용 장기 연결과 마지막으로 확인한 data_version
+        self._reader = None
+        self._data_version = None
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            # 이전 버전 스키마 마이그레이션: 지표 컬럼 추가
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(snapshots)")}
+            if "indicators" not in columns:
+                conn.execute("ALTER TABLE snapshots ADD COLUMN indicators TEXT")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _changed(self) -> bool:
+        """
+        마지막 확인 이후 다른 연결(다른 워커 포함)이 DB에 커밋했는지 확인합니다. self._lock을 잡은 상태에서 호출합니다.
+        """
+        if self._reader is None:
+            self._reader = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        version = self._reader.execute("PRAGMA data_version").fetchone()[0]
+        changed = version != self._data_version
+        self._data_version = version
+        return changed
+
+    def add(self, report: dict) -> dict:
+        """
+        리포트와 스냅샷을 저장하고, id가 포함된 저장 결과를 반환합니다.
+        report: timestamp, bullish_report, bearish_report, market_data, news_data, (선택) market_columns, indicators
+        """
+        timestamp = report.get("timestamp") or datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO reports (timestamp, ts, bullish_report, bearish_report) VALUES (?, ?, ?, ?)",
+                (timestamp, _to_epoch(timestamp), report.get("bullish_report"), report.get("bearish_report")),
+            )
+            report_id = cursor.lastrowid
+            conn.execute(
+                "INSERT INTO snapshots (report_id, market_data, market_columns, news_data, indicators) VALUES (?, ?, ?, ?, ?)",
+                (
+                    report_id,
+                    json.dumps(report.get("market_data", {}), ensure_ascii=False),
+                    json.dumps(report.get("market_columns", {}), ensure_ascii=False),
+                    json.dumps(report.get("news_data", []), ensure_ascii=False),
+                    json.dumps(report.get("indicators", {}), ensure_ascii=False),
+                ),
+            )
+        stored = {
+            "id": report_id,
+            "timestamp": timestamp,
+            "bullish_report": report.get("bullish_report"),
+            "bearish_report": report.get("bearish_report"),
+            "market_data": report.get("market_data", {}),
+            "news_data": report.get("news_data", []),
+            "market_columns": report.get("market_columns", {}),
+            "indicators": report.get("indicators", {}),
+        }
+        with self._lock:
+            self._latest = stored
+        return stored
+
+    def get(self, report_id: int):
+        """
+        id로 리포트와 스냅샷 전체를 조회합니다. 없으면 None을 반환합니다.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT r.id, r.timestamp, r.bullish_report, r.bearish_report,
+                       s.market_data, s.market_columns, s.news_data, s.indicators
+                FROM reports r LEFT JOIN snapshots s ON s.report_id = r.id
+                WHERE r.id = ?
+                """,
+                (report_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "timestamp": row[1],
+            "bullish_report": row[2],
+            "bearish_report": row[3],
+            "market_data": json.loads(row[4]) if row[4] else {},
+            "news_data": json.loads(row[6]) if row[6] else [],
+            "market_columns": json.loads(row[5]) if row[5] else {},
+            "indicators": json.loads(row[7]) if row[7] else {},
+        }
+
+    def latest(self):
+        """
+        가장 최근 리포트를 반환합니다. (없으면 None)
+        DB가 바뀌지 않았으면 캐시를 그대로 반환하고, 다른 워커가 새 리포트를 저장한 경우에만 DB에서 다시 읽습니다.
+        """
+        with self._lock:
+            if not self._changed() and self._latest is not None:
+                return self._latest
+            latest_id = self._reader.execute("SELECT MAX(id) FROM reports").fetchone()[0]
+            cached = self._latest
+        if latest_id is None:
+            return None
+        if cached is not None and cached["id"] == latest_id:
+            return cached
+        report = self.get(latest_id)
+        with self._lock:
+            self._latest = report
+        return report
+
+    def history(self, start=None, end=None, limit: int = 20, cursor: int = None):
+        """
+        리포트 이력을 최신순으로 조회합니다. (스냅샷 제외)
+        start/end: 조회 기간 (ISO 문자열 또는 datetime), cursor: 이전 페이지의 next_cursor
+        반환값: (items, next_cursor) - 더 이상 없으면 next_cursor는 None
+        """
+        query = "SELECT id, timestamp, bullish_report, bearish_report FROM reports WHERE 1 = 1"
+        params = []
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(_to_epoch(start))
+        if end is not None:
+            query += " AND ts <= ?"
+            params.append(_to_epoch(end))
+        if cursor is not None:
+            query += " AND id < ?"
+            params.append(cursor)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        items = [
+            {"id": r[0], "timestamp": r[1], "bullish_report": r[2], "bearish_report": r[3]}
+            for r in rows[:limit]
+        ]
+        next_cursor = items[-1]["id"] if len(rows) > limit else None
+        return items, next_cursor
+
+# 싱글톤 인스턴스 플레이스홀더
+report_store = None
+
+def get_report_store():
+    global report_store
+    if report_store is None:
+        report_store = ReportStore()
+    return report_store
@@ -0,0 +1,135 @@
+"""
+LLM 응답을 입력 내용의 해시로 저장하는 캐시 모듈입니다.
+(프롬프트 템플릿, 리포트 타입, 모델, 정규화된 컨텍스트)의 SHA-256을 키로 사용하며,
+TTL 만료와 최대 개수 기반 LRU 제거를 지원합니다. SQLite 파일에 저장되므로
+여러 워커 프로세스와 CI(generate_static.py) 실행 간에도 재사용됩니다.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .bar_store import DEFAULT_DATA_DIR
+
+DEFAULT_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(DEFAULT_DATA_DIR, "llm_cache.sqlite3"))
+DEFAULT_TTL_SEC = float(os.getenv("LLM_CACHE_TTL_SEC", str(6 * 3600)))
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "256"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    model       TEXT,
+    response    TEXT NOT NULL,
+    latency     REAL,
+    created_at  REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+"""
+
+def make_cache_key(prompt_template: str, report_type: str, model: str, context: dict) -> str:
+    """
+    캐시 키를 생성합니다. 컨텍스트는 키 순서와 무관하게 같은 값이면 같은 키가 되도록 정규화합니다.
+    """
+    payload = json.dumps(
+        {"template": prompt_template, "type": report_type.lower(), "model": model, "context": context},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_sec: float = DEFAULT_TTL_SEC,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_latency_sec = 0.0
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def lookup(self, keys):
+        """
+        주어진 키들을 순서대로 조회하여 처음 발견된 유효한 응답을 (key, model, response)로 반환합니다.
+        모두 없으면 None을 반환합니다. 한 번의 조회는 hit 또는 miss 한 번으로 집계됩니다.
+        """
+        keys = list(keys)
+        now = time.time()
+        found = None
+        with self._lock, self._connect() as conn:
+            for key in keys:
+                row = conn.execute(
+                    "SELECT model, response, latency, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    continue
+                model, response, latency, created_at = row
+                if now - created_at > self.ttl_sec:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    continue
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                found = (key, model, response)
+                self.hits += 1
+                self.saved_latency_sec += latency or 0.0
+                break
+            else:
+                self.misses += 1
+        return found
+
+    def set(self, key: str, response: str, model: str = None, latency: float = None):
+        """
+        응답을 저장하고, 최대 개수를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO responses (key, model, response, latency, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, response, latency, now, now),
+            )
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_sec,))
+            conn.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def stats(self) -> dict:
+        """
+        캐시 적중/미스 횟수와 적중으로 절약한 LLM 호출 시간을 반환합니다. (현재 프로세스 기준)
+        """
+        with self._lock, self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_sec": self.ttl_sec,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "saved_latency_sec": round(self.saved_latency_sec, 3),
+        }
+
+# 싱글톤 인스턴스 플레이스홀더
+response_cache = None
+
+def get_response_cache():
+    global response_cache
+    if response_cache is None:
+        response_cache = ResponseCache()
+    return response_cache
@@ -0,0 +1,87 @@
+"""
+유튜브 자막과 자막 요약을 영상 ID 기준으로 SQLite에 저장하는 모듈입니다.
+공개된 영상의 자막은 바뀌지 않으므로 만료 없이 보관하며, 요약은 (영상 ID, 목표 길이)별로 저장하여
+같은 영상을 다시 수집/요약할 때 네트워크와 LLM 호출 없이 재사용합니다.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from .bar_store import DEFAULT_DATA_DIR
+
+DEFAULT_TRANSCRIPT_DB_PATH = os.getenv("TRANSCRIPT_STORE_PATH", os.path.join(DEFAULT_DATA_DIR, "transcripts.sqlite3"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    video_id   TEXT PRIMARY KEY,
+    text       TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    video_id   TEXT NOT NULL,
+    max_chars  INTEGER NOT NULL,
+    summary    TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (video_id, max_chars)
+);
+"""
+
+class TranscriptStore:
+    def __init__(self, path: str = DEFAULT_TRANSCRIPT_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, video_ids) -> dict:
+        """
+        저장된 자막을 {video_id: text}로 반환합니다. 없는 영상은 포함되지 않습니다.
+        """
+        video_ids = list(dict.fromkeys(video_ids))
+        if not video_ids:
+            return {}
+        placeholders = ",".join("?" * len(video_ids))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT video_id, text FROM transcripts WHERE video_id IN ({placeholders})", video_ids
+            ).fetchall()
+        return dict(rows)
+
+    def put(self, video_id: str, text: str):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO transcripts (video_id, text, fetched_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (video_id) DO UPDATE SET text = excluded.text, fetched_at = excluded.fetched_at",
+                (video_id, text, time.time()),
+            )
+
+    def get_summary(self, video_id: str, max_chars: int):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT summary FROM summaries WHERE video_id = ? AND max_chars = ?", (video_id, max_chars)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_summary(self, video_id: str, max_chars: int, summary: str):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO summaries (video_id, max_chars, summary, created_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (video_id, max_chars) DO UPDATE SET summary = excluded.summary, created_at = excluded.created_at",
+                (video_id, max_chars, summary, time.time()),
+            )
+
+# 싱글톤 인스턴스 플레이스홀더
+transcript_store = None
+
+def get_transcript_store():
+    global transcript_store
+    if transcript_store is None:
+        transcript_store = TranscriptStore()
+    return transcript_store
@@ -0,0 +1,118 @@
+"""
+경량 트레이싱 모듈입니다.
+span() 컨텍스트 매니저로 작업 구간(작업 단계, 수집기 호출, Gemini 시도, 리포트 게시)을 기록하며,
+contextvars로 부모-자식 관계를 추적합니다. 끝난 구간의 소요 시간은 silver_span_duration_seconds 히스토그램에 기록되고,
+최상위 구간(트레이스)은 최근 N개를 메모리에 보관하여 /traces로 조회할 수 있습니다.
+
+주의: loop.run_in_executor로 실행되는 함수에는 컨텍스트가 전달되지 않으므로, 구간은 호출하는 쪽(코루틴)에서 엽니다.
+"""
+import contextvars
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from backend.metrics import SPAN_DURATION
+
+logger = logging.getLogger(__name__)
+
+# 보관할 최근 트레이스 수
+TRACE_HISTORY = int(os.getenv("TRACE_HISTORY", "50"))
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+_traces = deque(maxlen=TRACE_HISTORY)
+_traces_lock = threading.Lock()
+
+class Span:
+    __slots__ = ("name", "attributes", "trace_id", "span_id", "parent", "started_at", "_started",
+                 "duration_sec", "status", "error", "children")
+
+    def __init__(self, name: str, attributes: dict, parent=None):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:8]
+        self.started_at = datetime.now().isoformat()
+        self._started = time.perf_counter()
+        self.duration_sec = None
+        self.status = "ok"
+        self.error = None
+        self.children = []
+
+    def set(self, **attributes):
+        """
+        구간 속성을 추가합니다. (예: 응답 크기, 결과)
+        """
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "started_at": self.started_at,
+            "duration_sec": self.duration_sec,
+            "status": self.status,
+            "error": self.error,
+            "attributes": dict(self.attributes),
+            "children": [child.to_dict() for child in list(self.children)],
+        }
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    구간을 열고 닫습니다. 예외가 발생하면 status=error로 기록한 뒤 예외를 그대로 전달합니다.
+    """
+    parent = _current_span.get()
+    current = Span(name, attributes, parent)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.duration_sec = round(time.perf_counter() - current._started, 6)
+        SPAN_DURATION.observe(current.duration_sec, span=name, status=current.status)
+        if parent is not None:
+            parent.children.append(current)
+        else:
+            with _traces_lock:
+                _traces.append(current)
+        logger.debug(f"span {name} {current.status} {current.duration_sec:.3f}s {current.attributes}")
+
+def record(name: str, duration_sec: float, status: str = "ok", error: str = None, **attributes):
+    """
+    이미 끝난 구간을 현재 구간의 자식으로 기록합니다.
+    yield를 사이에 두는 비동기 제너레이터처럼 컨텍스트 매니저로 감싸기 어려운 구간에 사용합니다.
+    """
+    parent = _current_span.get()
+    finished = Span(name, attributes, parent)
+    finished.duration_sec = round(duration_sec, 6)
+    finished.status = status
+    finished.error = error
+    SPAN_DURATION.observe(finished.duration_sec, span=name, status=status)
+    if parent is not None:
+        parent.children.append(finished)
+    else:
+        with _traces_lock:
+            _traces.append(finished)
+    return finished
+
+def current_span():
+    return _current_span.get()
+
+def recent_traces(limit: int = 20) -> list:
+    """
+    최근 끝난 트레이스(최상위 구간과 하위 구간 트리)를 최신순으로 반환합니다.
+    """
+    with _traces_lock:
+        traces = list(_traces)[-limit:]
+    return [trace.to_dict() for trace in reversed(traces)]
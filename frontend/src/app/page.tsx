@@ -19,18 +19,48 @@ export default function Home() {
   const [report, setReport] = useState<ReportData | null>(null);
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
+  // 차트에 표시할 자산 (선택하지 않으면 첫 번째 핵심 자산)
+  const [selectedAsset, setSelectedAsset] = useState<string | null>(null);
+  // 차트 시간 단위 ("1h"가 아니면 미리 집계된 단계를 "<시간 단위>:<자산>" 키로 보관)
+  const [timeframe, setTimeframe] = useState('1h');
+  const [tierData, setTierData] = useState<Record<string, AssetData[]>>({});
 
   useEffect(() => {
     fetchReport();
   }, []);
 
+  const coreAssets = (report?.assets ?? []).filter((asset) => asset.core).map((asset) => asset.name);
+  const chartAsset = selectedAsset ?? coreAssets[0] ?? 'Silver';
+
+  // 핵심 자산이 아닌 자산은 선택했을 때 내려받음
+  useEffect(() => {
+    if (!report || report.market_data[chartAsset] || coreAssets.includes(chartAsset)) return;
+    if (!report.assets.some((asset) => asset.name === chartAsset)) return;
+    api.getMarketData(chartAsset).then((data) => {
+      setReport((current) => current && { ...current, market_data: { ...current.market_data, [chartAsset]: data } });
+    });
+  }, [report, chartAsset]);
+
+  // 집계 단계는 선택했을 때 내려받음
+  const tierKey = `${timeframe}:${chartAsset}`;
+  useEffect(() => {
+    if (!report || timeframe === '1h' || tierData[tierKey]) return;
+    api.getMarketTier(chartAsset, timeframe).then((data) => {
+      setTierData((current) => ({ ...current, [tierKey]: data }));
+    });
+  }, [report, timeframe, chartAsset, tierKey, tierData]);
+
   /**
    * 최신 리포트 데이터를 API로부터 가져옵니다.
    */
   const fetchReport = async () => {
     try {
       setLoading(true);
-      const data = await api.getLatestReport();
+      // 리포트 본문이 먼저 도착하면 시장 데이터를 기다리지 않고 바로 표시
+      const data = await api.getLatestReport((partial) => {
+        setReport(partial);
+        setLoading(false);
+      });
       setReport(data);
     } catch (error) {
       console.error("Failed to fetch report", error);
@@ -65,11 +95,12 @@ export default function Home() {
   }
 
   // 차트 데이터 처리
-  // 가독성을 위해 필요하다면 최근 50개 포인트로 제한
-  const silverData = report?.market_data?.Silver?.slice(-50) || [];
+  // 가독성을 위해 필요하다면 최근 50개 포인트로 제한 (집계 단계는 생성 시 봉 수가 제한되어 전체 표시)
+  const assetData = report?.market_data?.[chartAsset]?.slice(-50) || [];
+  const chartBars = timeframe === '1h' ? assetData : tierData[tierKey] ?? [];
   
   // 차트 데이터 포맷팅
-  const chartData = silverData.map((item) => ({
+  const chartData = assetData.map((item) => ({
     time: new Date(item.Datetime || item.Date || '').toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' }),
     price: item.Close
   }));
@@ -104,7 +135,33 @@ export default function Home() {
           <div className="lg:col-span-2 bg-white p-6 rounded-2xl shadow-sm border border-gray-100">
             <h2 className="text-xl font-semibold mb-6 flex items-center gap-2">
               <TrendingUp className="w-5 h-5 text-gray-400" />
-              Silver Price Trend (7d)
+              {chartAsset} Price Trend ({timeframe === '1h' ? '7d' : timeframe})
+              {(report?.timeframes?.length ?? 0) > 1 && (
+                <div className="flex gap-1 text-sm font-normal">
+                  {report?.timeframes.map((option) => (
+                    <button
+                      key={option}
+                      onClick={() => setTimeframe(option)}
+                      className={`px-2 py-1 rounded-lg ${option === timeframe ? 'bg-blue-500 text-white' : 'text-gray-600 border border-gray-200'}`}
+                    >
+                      {option}
+                    </button>
+                  ))}
+                </div>
+              )}
+              {(report?.assets?.length ?? 0) > 1 && (
+                <select
+                  value={chartAsset}
+                  onChange={(e) => setSelectedAsset(e.target.value)}
+                  className="ml-auto text-sm font-normal border border-gray-200 rounded-lg px-2 py-1 text-gray-600"
+                >
+                  {report?.assets.map((asset) => (
+                    <option key={asset.name} value={asset.name}>
+                      {asset.group ? `${asset.name} (${asset.group})` : asset.name}
+                    </option>
+                  ))}
+                </select>
+              )}
             </h2>
             <div className="h-[300px] w-full">
               {/* <ResponsiveContainer width="100%" height="100%">
@@ -125,7 +182,7 @@ export default function Home() {
                   />
                 </LineChart>
               </ResponsiveContainer> */}
-              <CandlestickChart data={silverData
+              <CandlestickChart data={chartBars
                 .map((d: AssetData) => {
                   const timeStr = d.Datetime || d.Date;
                   if (!timeStr) return null;
@@ -149,9 +206,9 @@ export default function Home() {
           {/* Stats / Info */}
           <div className="space-y-6">
             <div className="bg-white p-6 rounded-2xl shadow-sm border border-gray-100">
-              <h3 className="text-gray-500 font-medium text-sm uppercase tracking-wider mb-2">Latest Silver Price</h3>
+              <h3 className="text-gray-500 font-medium text-sm uppercase tracking-wider mb-2">Latest {chartAsset} Price</h3>
               <div className="text-4xl font-bold text-gray-900">
-                ${dataLastPrice(silverData)}
+                ${dataLastPrice(assetData)}
               </div>
               <div className="text-sm text-green-500 font-medium mt-1 flex items-center gap-1">
                 <TrendingUp className="w-4 h-4" />
@@ -162,14 +219,12 @@ export default function Home() {
             <div className="bg-white p-6 rounded-2xl shadow-sm border border-gray-100">
               <h3 className="text-gray-500 font-medium text-sm uppercase tracking-wider mb-4">Market Context</h3>
               <div className="space-y-3">
-                 <div className="flex justify-between items-center">
-                    <span className="text-gray-600">Gold</span>
-                    <span className="font-semibold">${dataLastPrice(report?.market_data?.Gold)}</span>
-                 </div>
-                 <div className="flex justify-between items-center">
-                    <span className="text-gray-600">Bitcoin</span>
-                    <span className="font-semibold">${dataLastPrice(report?.market_data?.Bitcoin)}</span>
-                 </div>
+                 {coreAssets.filter((name) => name !== chartAsset).map((name) => (
+                   <div key={name} className="flex justify-between items-center">
+                      <span className="text-gray-600">{name}</span>
+                      <span className="font-semibold">${dataLastPrice(report?.market_data?.[name])}</span>
+                   </div>
+                 ))}
               </div>
             </div>
           </div>
@@ -30,6 +30,31 @@ export interface ChartProps {
   };
 }
 
+// 캔들 하나에 필요한 최소 픽셀 폭 (이보다 봉이 많으면 화면에 구분되지 않으므로 합쳐서 그림)
+const MIN_BAR_PX = 3;
+
+/**
+ * 봉 수가 maxBars를 넘으면 인접한 봉을 구간별로 하나의 봉으로 합칩니다.
+ * (시가는 첫 봉, 종가는 마지막 봉, 고가/저가는 구간의 최댓값/최솟값이므로 가격 범위가 보존됨)
+ */
+const mergeBars = (bars: CandlestickData<Time>[], maxBars: number): CandlestickData<Time>[] => {
+  if (maxBars < 1 || bars.length <= maxBars) return bars;
+  const merged: CandlestickData<Time>[] = [];
+  for (let i = 0; i < maxBars; i++) {
+    const start = Math.floor((i * bars.length) / maxBars);
+    const end = Math.floor(((i + 1) * bars.length) / maxBars);
+    if (end <= start) continue;
+    let high = -Infinity;
+    let low = Infinity;
+    for (let j = start; j < end; j++) {
+      high = Math.max(high, bars[j].high);
+      low = Math.min(low, bars[j].low);
+    }
+    merged.push({ time: bars[start].time, open: bars[start].open, high, low, close: bars[end - 1].close });
+  }
+  return merged;
+};
+
 /**
  * Lightweight Charts를 사용하여 캔들스틱 차트를 렌더링하는 컴포넌트입니다.
  * 
@@ -134,7 +159,9 @@ export const CandlestickChart = (props: ChartProps) => {
     }
 
     try {
-      candlestickSeries.setData(uniqueData);
+      candlestickSeries.setData(
+        mergeBars(uniqueData, Math.floor(chartContainerRef.current.clientWidth / MIN_BAR_PX))
+      );
     } catch (err) {
       console.error('Error setting chart data:', err);
     }
@@ -2,7 +2,8 @@ import axios from "axios";
 
 // GitHub Pages 배포 시 basePath를 고려해야 함
 const BASE_PATH = "/silver_report";
-const DATA_URL = `${BASE_PATH}/data.json`;
+const DATA_DIR = `${BASE_PATH}/data`;
+const MANIFEST_URL = `${DATA_DIR}/manifest.json`;
 
 export interface AssetData {
   Datetime?: string;
@@ -15,15 +16,51 @@ export interface AssetData {
 }
 
 /**
- * 시장 데이터 인터페이스
+ * 컬럼형 자산 데이터 (generate_static.py --orient columns)
+ * t는 UTC epoch 초이며, 나머지는 시가/고가/저가/종가/거래량 배열입니다.
  */
-export interface MarketData {
-  Silver: AssetData[];
-  Gold: AssetData[];
-  Bitcoin: AssetData[];
-  USD_Index: AssetData[];
+export interface ColumnarAssetData {
+  t: number[];
+  o?: (number | null)[];
+  h?: (number | null)[];
+  l?: (number | null)[];
+  c?: (number | null)[];
+  v?: (number | null)[];
 }
 
+/**
+ * 컬럼형 자산 데이터를 레코드 배열로 변환합니다. 이미 레코드 배열이면 그대로 반환합니다.
+ */
+export const toAssetRecords = (data: AssetData[] | ColumnarAssetData | undefined): AssetData[] => {
+  if (!data) return [];
+  if (Array.isArray(data)) return data;
+  return data.t.map((t, i) => ({
+    Datetime: new Date(t * 1000).toISOString(),
+    Open: data.o?.[i] as number,
+    High: data.h?.[i] as number,
+    Low: data.l?.[i] as number,
+    Close: data.c?.[i] as number,
+    Volume: data.v?.[i] ?? undefined,
+  }));
+};
+
+/**
+ * 자산 정보 (backend/config/assets.json)
+ * core 자산은 리포트 분석 대상이며 페이지 로드 시 함께 내려받습니다.
+ */
+export interface AssetInfo {
+  name: string;
+  ticker?: string | null;
+  group?: string | null;
+  core?: boolean;
+}
+
+/**
+ * 시장 데이터 (자산 이름 -> 봉 목록, 자산 목록은 설정에 따라 달라짐)
+ * 핵심 자산 외의 자산은 getMarketData로 필요할 때 내려받습니다.
+ */
+export type MarketData = Record<string, AssetData[]>;
+
 /**
  * 리포트 데이터 인터페이스
  */
@@ -33,16 +70,108 @@ export interface ReportData {
   bearish_report: string;
   market_data: MarketData;
   news_data: any[];
+  assets: AssetInfo[];
+  /** 차트에서 고를 수 있는 시간 단위 ("1h"는 기본 시장 데이터, 나머지는 미리 집계된 단계) */
+  timeframes: string[];
+}
+
+/**
+ * 정적 데이터 매니페스트 (generate_static.py)
+ * 각 샤드의 path는 내용 해시가 포함된 파일명이므로 내용이 바뀌지 않으면 브라우저 캐시를 그대로 사용합니다.
+ */
+interface ShardEntry {
+  path: string;
+  bytes: number;
+  sha256: string;
 }
 
+interface Manifest {
+  version: number;
+  timestamp: string | null;
+  market_orient: "records" | "columns";
+  assets?: AssetInfo[];
+  shards: {
+    reports: ShardEntry;
+    news: ShardEntry;
+    indicators: ShardEntry;
+    market: Record<string, ShardEntry>;
+    /** 시간 단위별로 미리 집계/축소된 시장 데이터 (timeframe -> 자산 -> 샤드, STATIC_MARKET_TIERS) */
+    market_tiers?: Record<string, Record<string, ShardEntry>>;
+  };
+}
+
+const getShard = async <T>(entry: ShardEntry): Promise<T> => {
+  const response = await axios.get<T>(`${DATA_DIR}/${entry.path}`);
+  return response.data;
+};
+
+// 마지막으로 받은 매니페스트 (핵심 자산 외 시장 데이터를 나중에 내려받을 때 사용)
+let latestManifest: Manifest | null = null;
+
+const getMarketShard = async (entry: ShardEntry): Promise<AssetData[]> => {
+  // 컬럼형으로 생성된 경우 기존 레코드 형식으로 정규화
+  return toAssetRecords(await getShard<AssetData[] | ColumnarAssetData>(entry));
+};
+
+/**
+ * 매니페스트의 자산 목록 (이전 형식의 매니페스트는 시장 데이터 샤드 이름으로 구성, 모두 핵심 자산으로 취급)
+ */
+const manifestAssets = (manifest: Manifest): AssetInfo[] =>
+  manifest.assets ?? Object.keys(manifest.shards.market).map((name) => ({ name, core: true }));
+
+const manifestTimeframes = (manifest: Manifest): string[] =>
+  ["1h", ...Object.keys(manifest.shards.market_tiers ?? {}).filter((timeframe) => timeframe !== "1h")];
+
 export const api = {
   /**
    * 최신 리포트를 조회합니다.
+   * 매니페스트를 받은 뒤 샤드들을 병렬로 내려받으며, onReports가 주어지면
+   * 리포트 본문이 도착하는 즉시 (시장 데이터 없이) 먼저 전달합니다.
+   */
+  getLatestReport: async (onReports?: (partial: ReportData) => void): Promise<ReportData> => {
+    // 매니페스트는 매번 새로 확인 (샤드는 해시 파일명이라 캐시 사용)
+    const { data: manifest } = await axios.get<Manifest>(MANIFEST_URL, { headers: { "Cache-Control": "no-cache" } });
+    latestManifest = manifest;
+    const { reports, news, market } = manifest.shards;
+    const assets = manifestAssets(manifest);
+    const timeframes = manifestTimeframes(manifest);
+
+    const reportsPromise = getShard<Pick<ReportData, "timestamp" | "bullish_report" | "bearish_report">>(reports);
+    const newsPromise = getShard<any[]>(news);
+    // 핵심 자산만 먼저 내려받음 (자산이 수백 개여도 첫 로딩 크기가 일정)
+    const marketPromise = Promise.all(
+      assets
+        .filter((asset) => asset.core && market[asset.name])
+        .map(async (asset) => [asset.name, await getMarketShard(market[asset.name])] as const)
+    );
+
+    const reportText = await reportsPromise;
+    onReports?.({ ...reportText, market_data: {}, news_data: [], assets, timeframes });
+
+    const [newsData, marketEntries] = await Promise.all([newsPromise, marketPromise]);
+    return {
+      ...reportText,
+      market_data: Object.fromEntries(marketEntries),
+      news_data: newsData,
+      assets,
+      timeframes,
+    };
+  },
+
+  /**
+   * 자산 하나의 시장 데이터를 조회합니다. (getLatestReport가 받은 매니페스트 기준)
+   */
+  getMarketData: async (asset: string): Promise<AssetData[]> => {
+    const entry = latestManifest?.shards.market[asset];
+    return entry ? getMarketShard(entry) : [];
+  },
+
+  /**
+   * 자산 하나의 시간 단위별 집계 데이터를 조회합니다. (전체 기간을 집계해 봉 수가 일정하게 제한된 샤드)
    */
-  getLatestReport: async (): Promise<ReportData> => {
-    // 정적 JSON 파일에서 데이터를 가져옵니다.
-    const response = await axios.get(DATA_URL);
-    return response.data;
+  getMarketTier: async (asset: string, timeframe: string): Promise<AssetData[]> => {
+    const entry = latestManifest?.shards.market_tiers?.[timeframe]?.[asset];
+    return entry ? getMarketShard(entry) : [];
   },
 
   /**